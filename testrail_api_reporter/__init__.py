@@ -3,6 +3,7 @@
 
 # Engines
 from .engines.at_coverage_reporter import ATCoverageReporter
+from .engines.live_reporter import LiveResultsReporter
 from .engines.plotly_reporter import PlotlyReporter
 from .engines.results_reporter import TestRailResultsReporter
 
@@ -15,3 +16,5 @@ from .publishers.gdrive_uploader import GoogleDriveUploader
 # Utils
 from .utils.reporter_utils import upload_image, delete_file, zip_file
 from .utils.logger_config import setup_logger
+from .utils.history_store import HistoryStore, CSVHistoryStore, SQLiteHistoryStore
+from .utils.request_scheduler import RequestScheduler, create_api
@@ -3,5 +3,6 @@
 
 from .at_coverage_reporter import ATCoverageReporter
 from .case_backup import TCBackup
+from .live_reporter import LiveResultsReporter
 from .plotly_reporter import PlotlyReporter
 from .results_reporter import TestRailResultsReporter
@@ -1,13 +1,20 @@
 # -*- coding: utf-8 -*-
 """ Engine to generate obtain TestRail data and prepare reports """
 
-from requests.exceptions import ReadTimeout
-from testrail_api import TestRailAPI  # type: ignore
+import time
 
+from ..utils.case_snapshot import CaseSnapshotStore, CaseTable, RECONCILE_INTERVAL, SNAPSHOT_TIME_SKEW, SNAPSHOT_TTL
 from ..utils.case_stat import CaseStat
-from ..utils.csv_parser import CSVParser
+from ..utils.history_store import CSVHistoryStore, get_series_name
 from ..utils.logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
-from ..utils.reporter_utils import format_error, init_get_cases_process
+from ..utils.paginator import get_all_pages, iter_pages, DEFAULT_PAGE_WORKERS
+from ..utils.reporter_utils import format_error, run_concurrently
+from ..utils.request_scheduler import RequestScheduler, create_api
+from ..utils.section_tree import drop_section_tree, get_section_tree
+
+DEFAULT_TARGET_WORKERS = 4
+
+_priorities_cache: dict = {}  # url of TestRail -> list of priorities, see ATCoverageReporter.get_priorities()
 
 
 class ATCoverageReporter:
@@ -25,6 +32,13 @@ class ATCoverageReporter:
         suite_id=None,
         logger=None,
         log_level=DEFAULT_LOGGING_LEVEL,
+        max_workers=DEFAULT_PAGE_WORKERS,
+        scheduler=None,
+        snapshot_path=None,
+        snapshot_ttl=SNAPSHOT_TTL,
+        snapshot_reconcile_interval=RECONCILE_INTERVAL,
+        api=None,
+        history_store=None,
     ):
         """
         General init
@@ -45,39 +59,160 @@ class ATCoverageReporter:
         :param suite_id: suite id, integer, optional, if no suite-management is activated
         :param logger: logger object, optional
         :param log_level: logging level, optional, by default is logging.DEBUG
+        :param max_workers: number of concurrent requests of paginated data, integer, by default is 4
+        :param scheduler: RequestScheduler object, rate limiter and retry policy for all requests, optional,
+                          may be shared between several reporters
+        :param snapshot_path: directory, where crawled cases are stored as columnar snapshots, optional, if not set,
+                              snapshots are kept only in memory
+        :param snapshot_ttl: freshness window of snapshots in seconds, by default is 1 hour, outdated snapshot is
+                             refreshed only with cases changed since last update
+        :param snapshot_reconcile_interval: how often ids of cases are reconciled to find deleted cases in
+                                            outdated snapshot, in seconds, by default is 1 week
+        :param api: TestRailAPI object, created by create_api(), optional, may be shared between several reporters,
+                    if passed, email, password and scheduler are not used
+        :param history_store: storage of history data (i.e. SQLiteHistoryStore), optional, by default history is
+                              saved to CSV files
         """
         if not logger:
             self.___logger = setup_logger(name="ATCoverageReporter", log_file="ATCoverageReporter.log", level=log_level)
         else:
             self.___logger = logger
         self.___logger.debug("Initializing AT Coverage Reporter")
-        if url is None or email is None or password is None:
+        if url is None or (api is None and (email is None or password is None)):
             raise ValueError("No TestRails credentials are provided!")
         self.__automation_platforms = automation_platforms  # should be passed with specific TestRails sections
         self.__type_platforms = type_platforms  # should be passed with specific TestRails sections
         self.__project = project
         self.__priority = priority
-        self.__api = TestRailAPI(url=url, email=email, password=password)
+        self.__url = url
+        if not api:
+            scheduler = scheduler if scheduler else RequestScheduler(logger=self.___logger)
+            api = create_api(url, email, password, scheduler=scheduler)
+        self.__api = api
+        self.__history_store = history_store if history_store else CSVHistoryStore(log_level=self.___logger.level)
         self.__suite_id = suite_id
+        self.__max_workers = max_workers
+        self.__snapshots: dict = {}  # (project, suite) -> snapshot, see __get_snapshot()
+        self.__snapshot_ttl = snapshot_ttl
+        self.__snapshot_reconcile_interval = snapshot_reconcile_interval
+        self.__snapshot_store = (
+            CaseSnapshotStore(path=snapshot_path, ttl=None, logger=self.___logger) if snapshot_path else None
+        )
 
-    def __get_sections(self, parent_list: list, project=None, suite_id=None):
+    def __get_snapshot(self, project=None, suite_id=None, fields=()):
         """
-        Wrapper to get all sections ids of TestRails project/suite
+        Returns snapshot of project/suite: tree of sections and columnar table of all cases.
+        Only id, section_id, priority_id and requested fields of cases are kept. Snapshot is crawled once and
+        reused by all reports of this reporter (and stored to snapshot_path, if set) until more fields are
+        requested, outdated snapshot is refreshed incrementally, see refresh_snapshot() and clear_snapshot()
 
-        :param parent_list: list for all sections, initially a top section should be passed
         :param project: project id, integer, required
-        :param suite_id: suite id, integer, optional, an if no suite-management is activated
-        :return: list with ids all the sections
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        :param fields: list of additional fields of cases, which are needed for report, i.e. ['custom_firefox']
+        :return: dict like {'tree': SectionTree, 'table': CaseTable}
         """
         project = project if project else self.__project
         suite_id = suite_id if suite_id else self.__suite_id
+        snapshot = self.__snapshots.get((project, suite_id))
+        if snapshot is None and self.__snapshot_store:
+            table = self.__snapshot_store.load(project_id=project, suite_id=suite_id)
+            snapshot = {"table": table} if table else None
+        if snapshot is None or not snapshot["table"].get_fields().issuperset(fields):
+            fields = {"section_id", "priority_id"}.union(fields, snapshot["table"].get_fields() if snapshot else ())
+            now = int(time.time())
+            table = CaseTable.from_cases(
+                self.__iter_cases(project_id=project, suite_id=suite_id, fields=fields | {"id"}),
+                fields=fields,
+                meta={"project_id": project, "suite_id": suite_id, "updated_on": now, "reconciled_on": now},
+            )
+            if self.__snapshot_store:
+                self.__snapshot_store.save(table, project_id=project, suite_id=suite_id)
+            snapshot = {"table": table}
+        elif self.__snapshot_ttl and snapshot["table"].get_age() > self.__snapshot_ttl:
+            self.__refresh_table(snapshot["table"], project=project, suite_id=suite_id)
+        if "tree" not in snapshot:
+            snapshot["tree"] = get_section_tree(
+                (self.__url, project, suite_id),
+                lambda: self.__get_all_sections(project_id=project, suite_id=suite_id),
+            )
+        self.__snapshots[(project, suite_id)] = snapshot
+        return snapshot
+
+    def __refresh_table(self, table, project, suite_id=None, reconcile=False):
+        """
+        Merges cases changed since last update into table, deleted cases are removed by reconciliation of ids,
+        which is performed once per snapshot_reconcile_interval
+
+        :param table: CaseTable object
+        :param project: project id, integer, required
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        :param reconcile: force reconciliation of ids, True or False
+        """
+        now = int(time.time())
+        changed = table.update(
+            self.__iter_cases(
+                project_id=project,
+                suite_id=suite_id,
+                fields=table.get_fields() | {"id"},
+                updated_after=int(table.meta.get("updated_on", 0)) - SNAPSHOT_TIME_SKEW,
+            )
+        )
+        removed = 0
+        if reconcile or now - table.meta.get("reconciled_on", 0) > self.__snapshot_reconcile_interval:
+            removed = table.retain(
+                case["id"] for case in self.__iter_cases(project_id=project, suite_id=suite_id, fields=("id",))
+            )
+            table.meta["reconciled_on"] = now
+        table.meta["updated_on"] = now
+        if self.__snapshot_store:
+            self.__snapshot_store.save(table, project_id=project, suite_id=suite_id)
+        self.___logger.debug(
+            "Snapshot of project %s, suite %s is refreshed: %s cases changed, %s removed",
+            project,
+            suite_id,
+            changed,
+            removed,
+        )
+
+    def refresh_snapshot(self, project=None, suite=None, reconcile=False):
+        """
+        Refreshes snapshot of project/suite with cases changed since last update, instead of full crawl
+
+        :param project: project id, integer, required
+        :param suite: suite id, integer, optional, if no suite-management is activated
+        :param reconcile: find deleted cases by reconciliation of ids, True or False, by default it's performed
+                          once per snapshot_reconcile_interval
+        """
+        project = project if project else self.__project
+        suite = suite if suite else self.__suite_id
         if not project:
-            raise ValueError("No project specified, report aborted!")
-        all_sections = self.__get_all_sections(project_id=project, suite_id=suite_id)
-        for section in all_sections:
-            if section["parent_id"] in parent_list:
-                parent_list.append(section["id"])
-        return parent_list
+            raise ValueError("No project specified, refresh aborted!")
+        snapshot = self.__snapshots.get((project, suite))
+        if snapshot is None:
+            snapshot = self.__get_snapshot(project=project, suite_id=suite)
+            if not reconcile:
+                return
+        self.__refresh_table(snapshot["table"], project=project, suite_id=suite, reconcile=reconcile)
+
+    def clear_snapshot(self):
+        """Drops downloaded (and stored) snapshots, next report will download actual data from TestRails"""
+        for project, suite_id in set(self.__snapshots) | {(self.__project, self.__suite_id)}:
+            drop_section_tree((self.__url, project, suite_id))
+            if self.__snapshot_store:
+                self.__snapshot_store.remove(project_id=project, suite_id=suite_id)
+        self.__snapshots = {}
+
+    @staticmethod
+    def __get_priority_ids(priority):
+        """
+        Converts priority filter to set of priority ids
+
+        :param priority: priority, integer, string like '3,4' or list of integers
+        :return: set of integers
+        """
+        if isinstance(priority, (list, tuple, set)):
+            return {int(item) for item in priority}
+        return {int(item) for item in str(priority).split(",")}
 
     def __get_all_sections(self, project_id=None, suite_id=None):
         """
@@ -89,120 +224,147 @@ class ATCoverageReporter:
         """
         project = project_id if project_id else self.__project
         suite_id = suite_id if suite_id else self.__suite_id
-        sections = []
         if not project:
             raise ValueError("No project specified, report aborted!")
-        first_run = True
-        criteria = None
-        response = None
-        while criteria is not None or first_run:
-            if first_run:
-                try:
-                    response = self.__api.sections.get_sections(project_id=project, suite_id=suite_id)
-                except Exception as error:  # pylint: disable=broad-except
-                    self.___logger.error(
-                        "Get sections failed. Please validate your settings!\nError%s", format_error(error)
-                    )
-                    return None
-                first_run = False
-            elif response["_links"]["next"] is not None:  # pylint: disable=unsubscriptable-object
-                offset = int(
-                    response["_links"]["next"]  # pylint: disable=unsubscriptable-object
-                    .partition("offset=")[2]
-                    .partition("&")[0]
-                )
-                response = self.__api.sections.get_sections(project_id=project, suite_id=suite_id, offset=offset)
-            sections = sections + response["sections"]  # pylint: disable=unsubscriptable-object
-            criteria = response["_links"]["next"]  # pylint: disable=unsubscriptable-object
+        try:
+            sections = get_all_pages(
+                lambda offset: self.__api.sections.get_sections(project_id=project, suite_id=suite_id, offset=offset),
+                key="sections",
+                max_workers=self.__max_workers,
+                logger=self.___logger,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            raise ValueError(
+                f"Get sections failed. Please validate your settings!\nError{format_error(error)}"
+            ) from error
         self.___logger.debug(
             "Found %s existing sections in TestRails for project %s, suite %s", len(sections), project, suite_id
         )
         return sections
 
-    def __get_all_cases(
-        self,
-        project_id=None,
-        suite_id=None,
-        section_id=None,
-        priority_id=None,
-        retries=3,
-    ):
+    def __iter_cases(self, project_id=None, suite_id=None, fields=None, **filters):
         """
-        Wrapper to get all test cases for selected project, suite, section and priority
+        Yields test cases for selected project and suite page by page, only one page is kept in memory
 
         :param project_id: project id, integer, required
         :param suite_id: suite id, integer, optional, if no suite-management is activated
-        :param section_id: section id, integer, section where testcases should be found, optional
-        :param priority_id: priority, list of integers, id of priority for test case to search
-        :param retries: number of retries, integer, optional
-        :return: list with all cases
+        :param fields: list of fields of case to keep, i.e. ['section_id', 'priority_id'], optional, by default
+                       cases are yielded as is
+        :param filters: filters of get_cases, i.e. section_id=42, priority_id='3,4'
+        :return: generator of dicts with cases
         """
         project_id = project_id if project_id else self.__project
         suite_id = suite_id if suite_id else self.__suite_id
-        cases_list, first_run, criteria, response, retry = init_get_cases_process()
-        while criteria is not None or first_run:
-            if first_run:
-                try:
-                    response = self.__api.cases.get_cases(
-                        project_id=project_id,
-                        suite_id=suite_id,
-                        section_id=section_id,
-                        priority_id=priority_id,
-                    )
-                except ReadTimeout as error:
-                    if retry < retries:
-                        retry += 1
-                        self.___logger.debug("Timeout error, retrying %s/%s...", retry, retries)
-                        continue
-                    raise ValueError(
-                        f"Get cases failed. Please validate your settings!\nError{format_error(error)}"
-                    ) from error
-                except Exception as error:  # pylint: disable=broad-except
-                    raise ValueError(
-                        f"Get cases failed. Please validate your settings!\nError{format_error(error)}"
-                    ) from error
-                first_run = False
-                retry = 0
-            elif response["_links"]["next"] is not None:  # pylint: disable=unsubscriptable-object
-                offset = int(
-                    response["_links"]["next"]  # pylint: disable=unsubscriptable-object
-                    .partition("offset=")[2]
-                    .partition("&")[0]
-                )
-                try:
-                    response = self.__api.cases.get_cases(
-                        project_id=project_id,
-                        suite_id=suite_id,
-                        section_id=section_id,
-                        priority_id=priority_id,
-                        offset=offset,
-                    )
-                except ReadTimeout as error:
-                    if retry < retries:
-                        retry += 1
-                        self.___logger.debug("Timeout error, retrying %s/%s...", retry, retries)
-                        continue
-                    raise ValueError(
-                        f"Get cases failed. Please validate your settings!\nError{format_error(error)}"
-                    ) from error
-                except Exception as error:
-                    raise ValueError(
-                        f"Get cases failed. Please validate your settings!\nError{format_error(error)}"
-                    ) from error
-                retry = 0
-
-            cases_list = cases_list + response["cases"]  # pylint: disable=unsubscriptable-object
-            criteria = response["_links"]["next"]  # pylint: disable=unsubscriptable-object
-
+        pages = iter_pages(
+            lambda offset: self.__api.cases.get_cases(
+                project_id=project_id, suite_id=suite_id, offset=offset, **filters
+            ),
+            key="cases",
+            max_workers=self.__max_workers,
+            logger=self.___logger,
+        )
+        count = 0
+        try:
+            for page in pages:
+                count += len(page)
+                for case in page:
+                    yield {field: case.get(field) for field in fields} if fields else case
+        except Exception as error:  # pylint: disable=broad-except
+            raise ValueError(f"Get cases failed. Please validate your settings!\nError{format_error(error)}") from error
         self.___logger.debug(
-            "Found %s existing tests in TestRails for project %s, suite %s, section %s, priority %s",
-            len(cases_list),
+            "Found %s existing tests in TestRails for project %s, suite %s, filters %s",
+            count,
             project_id,
             suite_id,
-            section_id,
-            priority_id,
+            filters,
+        )
+
+    @staticmethod
+    def __get_distribution(table, fields, mask=None, group=None, automation=None):
+        """
+        Calculates cross-tab of cases by values of fields in one vectorized pass
+
+        :param table: CaseTable object
+        :param fields: list of case fields, i.e. ['priority_id', 'type_id'], may be empty
+        :param mask: boolean array to filter cases, optional
+        :param group: name of group of cases (i.e. platform), it's used as prefix of names of results, optional
+        :param automation: dict with automation field, optional, dict = {'internal_name': 'type_id',
+                                                                         'auto_code': 3,
+                                                                         'na_code': 4}
+        :return: list of results in CaseStat format, one per combination of values of fields
+        """
+        state = [automation["internal_name"]] if automation else []
+        results: dict = {}
+        if not fields:
+            results[()] = CaseStat(str(group))
+        for values, count in table.crosstab(list(fields) + state, mask=mask).items():
+            key = values[: len(fields)]
+            if key not in results:
+                results[key] = CaseStat(", ".join(str(value) for value in ([group] if group else []) + list(key)))
+            if automation and values[-1] == automation["auto_code"]:
+                results[key].add(total=count, automated=count)
+            elif automation and values[-1] == automation["na_code"]:
+                results[key].add(total=count, not_applicable=count)
+            else:
+                results[key].add(total=count, not_automated=count)
+        return list(results.values())
+
+    def distribution_report(
+        self,
+        fields=None,
+        type_platforms=None,
+        automation=None,
+        priority=None,
+        project=None,
+        suite=None,
+    ):
+        """
+        Generates data of distribution of test cases by any combination of case fields and platforms (guided by
+        top section). All the combinations are calculated from one snapshot of cases, so many dashboards may be
+        generated from one crawl.
+
+        :param fields: list of case fields, i.e. ['priority_id', 'type_id', 'custom_automation_type']
+        :param type_platforms: list of dicts, with sections ids, optional, where dict = {'name': 'UI',
+                                                                                         'sections': [16276]}
+        :param automation: dict with automation field, optional, if passed, values "Automated", "Not automated",
+                           "N/A" are calculated for every combination, dict = {'internal_name': 'type_id',
+                                                                              'auto_code': 3,
+                                                                              'na_code': 4}
+        :param priority: priority, list of integers, id of priority for test case to search, optional
+        :param project: project id, integer, required
+        :param suite: suite id, integer, optional, if no suite-management is activated
+        :return: list of results in CaseStat format, name of result is combination of platform name and values
+                 of fields, i.e. "UI, 4, 1"
+        """
+        project = project if project else self.__project
+        suite = suite if suite else self.__suite_id
+        fields = list(fields) if fields else []
+        if not project:
+            raise ValueError("No project specified, report aborted!")
+        if not fields and not type_platforms:
+            raise ValueError("No fields or platform types are provided, report aborted!")
+        self.___logger.debug("=== Starting generation of report for distribution by %s ===", fields)
+        snapshot = self.__get_snapshot(
+            project=project, suite_id=suite, fields=fields + ([automation["internal_name"]] if automation else [])
         )
-        return cases_list
+        table = snapshot["table"]
+        mask = table.isin("priority_id", self.__get_priority_ids(priority)) if priority else None
+        if not type_platforms:
+            return self.__get_distribution(table, fields=fields, mask=mask, automation=automation)
+        results = []
+        for platform in type_platforms:
+            self.___logger.debug("Processing platform %s", platform["name"])
+            platform_mask = table.isin("section_id", snapshot["tree"].get_subtree(platform["sections"]))
+            results.extend(
+                self.__get_distribution(
+                    table,
+                    fields=fields,
+                    mask=platform_mask if mask is None else mask & platform_mask,
+                    group=platform["name"],
+                    automation=automation,
+                )
+            )
+        return results
 
     def automation_state_report(
         self,
@@ -239,54 +401,52 @@ class ATCoverageReporter:
         if not automation_platforms:
             raise ValueError("No automation platforms specified, report aborted!")
         self.___logger.debug("=== Starting generation of report for current automation state ===")
-        index = 0
+        fields = [platform["internal_name"] for platform in automation_platforms]
+        snapshot = self.__get_snapshot(project=project, suite_id=suite, fields=fields)
+        table = snapshot["table"]
+        in_priority = table.isin("priority_id", self.__get_priority_ids(priority))
         results = []
         for platform in automation_platforms:
             self.___logger.debug("Processing platform %s", platform["name"])
-            results.append(CaseStat(platform["name"]))
-            sections = self.__get_sections(platform["sections"])
-            for section in sections:
-                self.___logger.debug(" Passing section %s", section)
-                cases = self.__get_all_cases(
-                    project_id=project,
-                    suite_id=suite,
-                    section_id=section,
-                    priority_id=priority,
-                )
-                results[index].set_total(results[index].get_total() + len(cases))
-                for case in cases:
-                    if case[platform["internal_name"]] == platform["auto_code"]:
-                        results[index].set_automated(results[index].get_automated() + 1)
-                    else:
-                        if case[platform["internal_name"]] == platform["na_code"]:
-                            results[index].set_not_applicable(results[index].get_not_applicable() + 1)
-            results[index].set_not_automated(
-                results[index].get_total() - results[index].get_automated() - results[index].get_not_applicable()
-            )
-            # save history data
-            filename = f"{filename_pattern}_{results[index].get_name().replace(' ', '_')}.csv"
-            CSVParser(log_level=self.___logger.level, filename=filename).save_history_data(report=results[index])
-            index += 1
+            mask = in_priority & table.isin("section_id", snapshot["tree"].get_subtree(platform["sections"]))
+            result = self.__get_distribution(table, [], mask=mask, group=platform["name"], automation=platform)[0]
+            results.append(result)
+        # save history data
+        self.__history_store.save_many({get_series_name(filename_pattern, item.get_name()): item for item in results})
         return results
 
+    def get_priorities(self):
+        """
+        Returns priorities of test cases configured on TestRail server, they are cached per server
+
+        :return: list of dicts like {'id': 4, 'name': '4 - Critical', 'short_name': '4 - Critical', 'priority': 4},
+                 sorted by priority level
+        """
+        if self.__url not in _priorities_cache:
+            try:
+                priorities = self.__api.priorities.get_priorities()
+            except Exception as error:  # pylint: disable=broad-except
+                raise ValueError(
+                    f"Get priorities failed. Please validate your settings!\nError{format_error(error)}"
+                ) from error
+            _priorities_cache[self.__url] = sorted(priorities, key=lambda item: item.get("priority", item["id"]))
+        return _priorities_cache[self.__url]
+
     def test_case_by_priority(self, project=None, suite=None):
         """
         Generates data for pie/line chart with priority distribution
 
         :param project: project id, integer, required
         :param suite: suite id, integer, optional, if no suite-management is activated
-        :return: list with values (int) for bar chart
+        :return: list with values (int) for bar chart, one value per priority from get_priorities()
         """
         project = project if project else self.__project
         suite = suite if suite else self.__suite_id
         if not project:
             raise ValueError("No project specified, report aborted!")
         self.___logger.debug("=== Starting generation of report for test case priority distribution ===")
-        results = []
-        for i in range(1, 5):
-            self.___logger.debug("Processing priority %s", str(i))
-            results.append(len(self.__get_all_cases(project_id=project, suite_id=suite, priority_id=str(i))))
-        return results
+        counter = self.__get_snapshot(project=project, suite_id=suite)["table"].count("priority_id")
+        return [counter.get(priority["id"], 0) for priority in self.get_priorities()]
 
     def test_case_by_type(
         self,
@@ -314,18 +474,59 @@ class ATCoverageReporter:
             raise ValueError("No platform types are provided, report aborted!")
         project = project if project else self.__project
         self.___logger.debug("=== Starting generation of report for test case type distribution ===")
-        index = 0
+        snapshot = self.__get_snapshot(project=project, suite_id=suite)
         results = []
         for platform in type_platforms:
             self.___logger.debug("Processing platform %s", platform["name"])
-            results.append(CaseStat(platform["name"]))
-            sections = self.__get_sections(platform["sections"])
-            for section in sections:
-                self.___logger.debug(" Passing section %s", section)
-                cases = self.__get_all_cases(project_id=project, suite_id=suite, section_id=section)
-                results[index].set_total(results[index].get_total() + len(cases))
-            # save history data
-            filename = f"{filename_pattern}_{results[index].get_name().replace(' ', '_')}.csv"
-            CSVParser(log_level=self.___logger.level, filename=filename).save_history_data(report=results[index])
-            index += 1
+            mask = snapshot["table"].isin("section_id", snapshot["tree"].get_subtree(platform["sections"]))
+            result = self.__get_distribution(snapshot["table"], fields=[], mask=mask, group=platform["name"])[0]
+            results.append(result)
+        # save history data
+        self.__history_store.save_many({get_series_name(filename_pattern, item.get_name()): item for item in results})
         return results
+
+    def automation_state_fan_out(self, targets: list, max_workers=DEFAULT_TARGET_WORKERS):
+        """
+        Generates data of automation coverage for several projects/suites concurrently, all requests are sent by
+        the same rate-limited client of this reporter
+
+        :param targets: list of dicts, where dict = {'project': 42,
+                                                     'suite': 66,  # optional
+                                                     'automation_platforms': [...],  # optional, see init
+                                                     'priority': 4,  # optional
+                                                     'filename_pattern': 'current_automation_42'}  # optional
+        :param max_workers: number of targets processed concurrently, integer, by default is 4
+        :return: dict like {'results': [list of CaseStat per target, None for failed target],
+                            'total': [CaseStat per platform name, merged for all targets],
+                            'errors': {index of target: exception}}
+        """
+        if not targets:
+            raise ValueError("No targets are provided, report aborted!")
+        if not all(target.get("project") for target in targets):
+            raise ValueError("No project specified for some targets, report aborted!")
+        self.___logger.debug("=== Starting generation of report for %s targets ===", len(targets))
+
+        def report(index):
+            target = targets[index]
+            return self.automation_state_report(
+                priority=target.get("priority"),
+                project=target["project"],
+                automation_platforms=target.get("automation_platforms"),
+                filename_pattern=target.get(
+                    "filename_pattern", f"current_automation_{target['project']}_{target.get('suite') or 0}"
+                ),
+                suite=target.get("suite"),
+            )
+
+        results, errors = run_concurrently(report, range(len(targets)), max_workers=max_workers)
+        for index, error in errors.items():
+            self.___logger.error("Report for target %s failed.\nError%s", targets[index], format_error(error))
+        total: dict = {}
+        for index in sorted(results):
+            for result in results[index]:
+                total.setdefault(result.get_name(), CaseStat(result.get_name())).merge(result)
+        return {
+            "results": [results.get(index) for index in range(len(targets))],
+            "total": list(total.values()),
+            "errors": errors,
+        }
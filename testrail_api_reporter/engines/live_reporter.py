@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+""" Live reporter, which streams results to TestRails while test session is still running """
+
+from threading import Event, Lock, Thread
+
+from ..utils.logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
+
+
+class LiveResultsReporter:
+    """Buffers test results and flushes them to test run by batches from background thread"""
+
+    def __init__(
+        self,
+        reporter,
+        title=None,
+        environment=None,
+        flush_interval=30.0,
+        batch_size=100,
+        close_run=True,
+        logger=None,
+        log_level=DEFAULT_LOGGING_LEVEL,
+    ):
+        """
+        General init
+
+        :param reporter: TestRailResultsReporter object
+        :param title: custom title of test run, optional
+        :param environment: custom name pattern for run name, optional
+        :param flush_interval: max time in seconds between flushes of buffered results, float
+        :param batch_size: number of buffered results, which triggers flush, integer
+        :param close_run: close or not run at the end of session, True or False
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        if not logger:
+            self.___logger = setup_logger(
+                name="LiveResultsReporter", log_file="LiveResultsReporter.log", level=log_level
+            )
+        else:
+            self.___logger = logger
+        self.___logger.debug("Initializing Live Results Reporter")
+        if not reporter:
+            raise ValueError("No TestRail results reporter is provided, live reporter can't be initialized!")
+        self.__reporter = reporter
+        self.__title = title
+        self.__environment = environment
+        self.__flush_interval = flush_interval
+        self.__batch_size = batch_size
+        self.__close_run = close_run
+        self.__buffer: list = []
+        self.__failed_batch = None  # (batch id, results), pushed again as is, so its added chunks are skipped
+        self.__batch_id = 0
+        self.__lock = Lock()
+        self.__wakeup = Event()
+        self.__stopped = Event()
+        self.__thread = None
+        self.__run_id = None
+
+    def get_run_id(self):
+        """
+        Returns id of test run, where results are streamed
+
+        :return: run id, integer, or None if run isn't started
+        """
+        return self.__run_id
+
+    def start(self):
+        """
+        Creates test run and starts background flushing
+
+        :return: run id or None in case of error
+        """
+        self.__run_id = self.__reporter.start_run(title=self.__title, environment=self.__environment)
+        if not self.__run_id:
+            self.___logger.error("Test run wasn't created, live reporting is disabled")
+            return None
+        self.__stopped.clear()
+        self.__thread = Thread(target=self.__worker, name="LiveResultsReporter", daemon=True)
+        self.__thread.start()
+        self.___logger.debug("Streaming results to test run %s", self.__run_id)
+        return self.__run_id
+
+    def add_result(self, result):
+        """
+        Adds result to buffer
+
+        :param result: dict like {'automation_id': 'path.to.test_file.TestClass.test_name',
+                                  'time': '0.42', 'status': 1, 'comment': ''}
+        """
+        with self.__lock:
+            self.__buffer.append(result)
+            if len(self.__buffer) >= self.__batch_size:
+                self.__wakeup.set()
+
+    def flush(self):
+        """
+        Sends buffered results to test run. Failed batch is kept and sent again unchanged before new results,
+        so its chunks, which were already added, aren't added twice.
+
+        :return: True or False
+        """
+        if not self.__run_id:
+            return True
+        while True:
+            with self.__lock:
+                if self.__failed_batch:
+                    (batch_id, batch), self.__failed_batch = self.__failed_batch, None
+                elif self.__buffer:
+                    self.__batch_id += 1
+                    batch_id, batch, self.__buffer = self.__batch_id, self.__buffer, []
+                else:
+                    return True
+            if not self.__reporter.push_results(run_id=self.__run_id, results=batch, batch_id=batch_id):
+                with self.__lock:
+                    self.__failed_batch = (batch_id, batch)
+                return False
+            self.___logger.debug("%s results were streamed to test run %s", len(batch), self.__run_id)
+
+    def __worker(self):
+        """Background thread, flushes results by time or by size of buffer"""
+        while not self.__stopped.is_set():
+            self.__wakeup.wait(self.__flush_interval)
+            self.__wakeup.clear()
+            self.flush()
+
+    def stop(self):
+        """
+        Stops background flushing, sends rest of results and closes test run
+
+        :return: True if all results were sent, False otherwise
+        """
+        if self.__thread:
+            self.__stopped.set()
+            self.__wakeup.set()
+            self.__thread.join()
+            self.__thread = None
+        retval = self.flush()
+        if not retval:
+            unsent = len(self.__buffer) + (len(self.__failed_batch[1]) if self.__failed_batch else 0)
+            self.___logger.error("%s results weren't sent to test run %s", unsent, self.__run_id)
+        if self.__run_id and self.__close_run:
+            self.__reporter.finish_run(run_id=self.__run_id)
+        return retval
@@ -3,9 +3,11 @@
 
 from typing import Optional
 
+import numpy as np
 import plotly
 
-from ..utils.csv_parser import CSVParser
+from ..utils.history_sampling import downsample_history, rollup_history
+from ..utils.history_store import CSVHistoryStore, get_series_name
 from ..utils.logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
 
 # Set path to orca for plotly
@@ -24,6 +26,7 @@ class PlotlyReporter:
         type_platforms=None,
         logger=None,
         log_level=DEFAULT_LOGGING_LEVEL,
+        history_store=None,
     ):
         """
         General init
@@ -36,6 +39,8 @@ class PlotlyReporter:
                                                                                'sections': [16276]}, optional
         :param logger: logger object, optional
         :param log_level: logging level, optional, by default is 'logging.DEBUG'
+        :param history_store: storage of history data (i.e. SQLiteHistoryStore), optional, by default history is
+                              loaded from CSV files
         """
         if not logger:
             self.___logger = setup_logger(name="PlotlyReporter", log_file="PlotlyReporter.log", level=log_level)
@@ -62,6 +67,7 @@ class PlotlyReporter:
         )
         self.__lines = lines if lines else ({"color": "rgb(0,0,51)", "width": 1.5})
         self.__type_platforms = type_platforms
+        self.__history_store = history_store if history_store else CSVHistoryStore(log_level=self.___logger.level)
 
     def draw_automation_state_report(self, filename=None, reports=None, state_markers=None):
         """
@@ -231,6 +237,24 @@ class PlotlyReporter:
         self.___logger.debug("Drawing chart to file %s", filename)
         plotly.io.write_image(fig, filename)
 
+    def __reduce_history(self, history_data, max_points=None, rollup=None, method="lttb", columns=(1, 2)):
+        """
+        Rolls history up and downsamples it before drawing, so time of drawing doesn't grow with history
+
+        :param history_data: history data in format of CSVParser.load_history_data()
+        :param max_points: target number of points, optional
+        :param rollup: period to aggregate history, 'week' or 'month', optional
+        :param method: downsampling method, 'lttb' or 'minmax'
+        :param columns: indices of columns, which shape is kept on downsampling
+        :return: history data in format of CSVParser.load_history_data()
+        """
+        points = len(history_data[0])
+        history_data = rollup_history(history_data, period=rollup)
+        history_data = downsample_history(history_data, max_points=max_points, method=method, columns=columns)
+        if len(history_data[0]) != points:
+            self.___logger.debug("History is reduced from %s to %s points", points, len(history_data[0]))
+        return history_data
+
     def draw_history_state_chart(
         self,
         chart_name: Optional[str] = None,
@@ -240,12 +264,17 @@ class PlotlyReporter:
         trace2_decor=None,
         filename_pattern="current_automation",
         reverse_traces=False,
+        start=None,
+        end=None,
+        max_points=None,
+        rollup=None,
+        downsampling="lttb",
     ):
         """
         Generates image file (png) with state distribution (staked line chart)
 
         :param chart_name: chart name, string, required
-        :param history_data: history data, previously stored in CSV, by default it is CSVParser().load_history_data()
+        :param history_data: history data, previously stored, by default it's loaded from history store
         :param filename: output filename for image, png expected, optional
         :param trace1_decor: decoration for distribution stack (1), dict like {"fill": "tonexty",
                                                                                "line": {"width": 0.5,
@@ -257,11 +286,16 @@ class PlotlyReporter:
                                                                                 "mode": "none"}
         :param filename_pattern: pattern, what is prefix will be for filename, string, optional
         :param reverse_traces: reverse traces order
+        :param start: first date of history window, date, datetime or ISO string, optional
+        :param end: last date of history window, date, datetime or ISO string, optional
+        :param max_points: target number of points of chart, optional, by default all points are drawn
+        :param rollup: period to aggregate history before drawing, 'week' or 'month', optional
+        :param downsampling: downsampling method, 'lttb' or 'minmax', used if max_points is set
         :return: none
         """
         if chart_name is None:
             raise ValueError("No chart name is provided, report aborted!")
-        filename = filename if filename else f"{filename_pattern}_{chart_name.replace(' ', '_')}.csv"
+        filename = filename if filename else f"{get_series_name(filename_pattern, chart_name)}.csv"
         trace1_decor = (
             trace1_decor
             if trace1_decor
@@ -273,11 +307,8 @@ class PlotlyReporter:
             else {"fill": "tozeroy", "line": {"width": 0.5, "color": "rgb(34,139,34)"}, "mode": "none"}
         )
 
-        history_data = (
-            history_data
-            if history_data
-            else CSVParser(log_level=self.___logger.level, filename=filename).load_history_data()
-        )
+        history_data = history_data if history_data else self.__history_store.load(filename[:-4], start=start, end=end)
+        history_data = self.__reduce_history(history_data, max_points=max_points, rollup=rollup, method=downsampling)
         trace1 = plotly.graph_objs.Scatter(
             x=history_data[0],
             y=history_data[1],
@@ -300,8 +331,8 @@ class PlotlyReporter:
         else:
             fig.add_trace(trace1)
             fig.add_trace(trace2)
-        fig.update_layout(yaxis={"nticks": 30}, autotypenumbers="convert types")
-        fig.update_yaxes(range=[0, max((eval(i) for i in history_data[1]))])  # pylint: disable=eval-used
+        fig.update_layout(yaxis={"nticks": 30})
+        fig.update_yaxes(range=[0, int(np.max(history_data[1], initial=0))])
 
         filename = f"{filename[:-3]}png"
         self.___logger.debug("Drawing chart to file %s", filename)
@@ -315,6 +346,11 @@ class PlotlyReporter:
         history_filename_pattern="current_area_distribution",
         ar_colors=None,
         lines=None,
+        start=None,
+        end=None,
+        max_points=None,
+        rollup=None,
+        downsampling="lttb",
     ):
         """
         Generates an image file (png) with state distribution (staked line chart)
@@ -325,6 +361,11 @@ class PlotlyReporter:
         :param history_filename_pattern: pattern, what is prefix will be for filename, string, optional
         :param ar_colors: default colors for different sections (platforms), list  with rgb, optional
         :param lines: default settings for lines, dict like {'color': 'rgb(0,0,51)', 'width': 1.5}, optional
+        :param start: first date of history window, date, datetime or ISO string, optional
+        :param end: last date of history window, date, datetime or ISO string, optional
+        :param max_points: target number of points of chart, optional, by default all points are drawn
+        :param rollup: period to aggregate history before drawing, 'week' or 'month', optional
+        :param downsampling: downsampling method, 'lttb' or 'minmax', used if max_points is set
         :return: none
         """
         if not filename:
@@ -336,8 +377,12 @@ class PlotlyReporter:
         index = 0
         for platform in type_platforms:
             type_name = platform["name"]
-            history_filename = f"{history_filename_pattern}_{type_name.replace(' ', '_')}.csv"
-            history_data = CSVParser(log_level=self.___logger.level, filename=history_filename).load_history_data()
+            history_data = self.__history_store.load(
+                get_series_name(history_filename_pattern, type_name), start=start, end=end
+            )
+            history_data = self.__reduce_history(
+                history_data, max_points=max_points, rollup=rollup, method=downsampling, columns=(1,)
+            )
             data.append(
                 plotly.graph_objs.Scatter(
                     x=history_data[0],
@@ -2,14 +2,27 @@
 """ Module for reporting results to TestRails from xml report results, obtained by pytest """
 
 import datetime
-from os.path import exists
+import time
+from collections import defaultdict
+from os.path import exists, getmtime
+from threading import Lock
 
-from requests.exceptions import ReadTimeout
-from testrail_api import TestRailAPI, StatusCodeError
-from xmltodict import parse
+from testrail_api import StatusCodeError  # type: ignore
 
+from ..utils.case_map_cache import CaseMapCache
+from ..utils.junit_parser import get_report_files, parse_reports
 from ..utils.logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
-from ..utils.reporter_utils import format_error, init_get_cases_process
+from ..utils.paginator import get_all_pages, iter_pages, DEFAULT_PAGE_WORKERS
+from ..utils.reporter_utils import format_error, run_concurrently
+from ..utils.request_scheduler import RequestScheduler, create_api
+from ..utils.section_tree import drop_section_tree, get_section_tree
+from ..utils.upload_checkpoint import UploadCheckpoint
+
+CACHE_TIME_SKEW = 300  # seconds, overlap of incremental cache refresh to compensate clock difference with server
+VALIDATION_TTL = 600  # seconds
+
+_validation_cache: dict = {}  # (url, project_id, suite_id, section title) -> (validated at, section id)
+_validation_lock = Lock()
 
 
 class TestRailResultsReporter:
@@ -25,6 +38,15 @@ class TestRailResultsReporter:
         suite_id=None,
         logger=None,
         log_level=DEFAULT_LOGGING_LEVEL,
+        include_output=False,
+        case_cache=None,
+        case_cache_ttl=604800,
+        max_workers=DEFAULT_PAGE_WORKERS,
+        chunk_size=250,
+        upload_checkpoint=None,
+        scheduler=None,
+        validation_ttl=VALIDATION_TTL,
+        report_workers=None,
     ):
         """
         Default init
@@ -33,10 +55,25 @@ class TestRailResultsReporter:
         :param email: email of TestRail user with proper access rights, string, required
         :param password: password of TestRail user with proper access rights, string, required
         :param project_id: project id, integer, required
-        :param xml_report: filename (maybe with path) of xml test report
+        :param xml_report: filename (maybe with path) of xml test report, glob pattern (i.e. 'reports/junit-*.xml')
+                           or list of filenames, several reports are merged into one test run
         :param suite_id: suite id, integer, optional, if no suite-management is activated
         :param logger: logger object, optional
         :param log_level: logging level, optional, by default is 'logging.DEBUG'
+        :param include_output: keep or not system-out/system-err of testcases while parsing, by default is False
+        :param case_cache: filename of local SQLite cache of automation_id -> case id map, optional, if passed,
+                           only cases changed since previous run are downloaded
+        :param case_cache_ttl: max age of cache in seconds, after that whole suite is downloaded again, integer,
+                               by default is one week
+        :param max_workers: number of concurrent requests of paginated data, integer, by default is 4
+        :param chunk_size: number of results sent in one request, integer, by default is 250
+        :param upload_checkpoint: filename of local checkpoint of uploaded chunks, optional, if passed, retried
+                                  send_results uploads only missed results to the same test run
+        :param scheduler: RequestScheduler object, rate limiter and retry policy for all requests, optional,
+                          may be shared between several reporters
+        :param validation_ttl: time in seconds, during which successful validation of project, suite and section
+                               is reused by all reporters with the same settings, integer, by default is 10 minutes
+        :param report_workers: number of processes to parse several xml reports, integer, by default is number of CPUs
         """
         if not logger:
             self.___logger = setup_logger(
@@ -47,71 +84,70 @@ class TestRailResultsReporter:
         self.___logger.debug("Initializing TestRail Results Reporter")
         if url is None or email is None or password is None:
             raise ValueError("No TestRails credentials are provided!")
-        self.__api = TestRailAPI(url, email, password)
-        self.__xml_report = xml_report if self.__check_report_exists(xml_report=xml_report) else None
-        self.__project_id = project_id if self.__check_project(project_id=project_id) else None
-        self.__suite_id = suite_id if self.__check_suite(suite_id=suite_id) else None
-        self.__at_section = self.__ensure_automation_section() if self.__project_id else None
-        self.__check_section(section_id=self.__at_section)
-        self.__timestamp = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        scheduler = scheduler if scheduler else RequestScheduler(logger=self.___logger)
+        self.__api = create_api(url, email, password, scheduler=scheduler)
+        self.__include_output = include_output
+        self.__report_workers = report_workers
+        self.__max_workers = max_workers
+        self.__chunk_size = chunk_size
+        self.__checkpoint = (
+            UploadCheckpoint(filename=upload_checkpoint, logger=self.___logger) if upload_checkpoint else None
+        )
+        self.__case_cache = CaseMapCache(filename=case_cache, logger=self.___logger) if case_cache else None
+        self.__case_cache_ttl = case_cache_ttl
+        self.__url = url
+        self.__validation_ttl = validation_ttl
+        self.__valid = None  # project, suite and section are validated lazily until success, see validate()
+        self.__xml_report = None
+        if xml_report:
+            self.__xml_report = xml_report if self.__check_report_exists(xml_report=xml_report) else None
+        self.__project_id = project_id
+        self.__suite_id = suite_id
+        self.__at_section_title = "pytest"
+        self.__at_section = None
+        self.__case_index = None
+        self.__run_cases: dict = {}  # run id -> set of case ids included into run, used by push_results
+        self.__pushed_chunks: dict = {}  # (run id, batch id) -> set of added chunks of batch, used by push_results
+        self.__timestamp = None  # set explicitly or obtained from xml report, see __get_timestamp()
+        self.__created = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
 
     def __xml_to_dict(self, filename="junit-report.xml"):
         """
-        Converts xml file to python dict
-        :param filename: filename, string, maybe with path
-        :return: dict with a list of cases
+        Converts xml file(s) to a list of compact result records, testcases are parsed one by one,
+        several reports are parsed in parallel processes and merged by automation_id
+
+        :param filename: filename, string, maybe with path, glob pattern or list of filenames
+        :return: list of dicts with test results
         """
         if not self.__check_report_exists(xml_report=self.__xml_report):
             return None
-        with open(filename, "r", encoding="utf-8") as file:
-            xml = file.read()
-
-        list_of_cases = []
-
-        parsed_xml = parse(xml)
-        self.__timestamp = parsed_xml["testsuites"]["testsuite"]["@timestamp"].split(".")[0]
-
-        cases = parsed_xml["testsuites"]["testsuite"]["testcase"]
-        cases = cases if isinstance(cases, list) else [cases]
-        for item in cases:
-            status = 1
-            if "failure" in item.keys():
-                status = 5
-            if "skipped" in item.keys():
-                if item["skipped"]["@type"] == "pytest.xfail":
-                    status = 5
-                else:
-                    status = 7
-            list_of_cases.append(
-                {
-                    "automation_id": f'{item["@classname"]}.{item["@name"]}',
-                    "time": item["@time"],
-                    "status": status,
-                    "comment": (
-                        f'{item["failure"]["@message"]} : ' f'{item["failure"]["#text"]}'
-                        if "failure" in item.keys()
-                        else ""
-                    ),
-                }
-            )
-        self.___logger.debug("Found test run at %s, found %s test results", self.__timestamp, len(list_of_cases))
+        files = get_report_files(filename)
+        list_of_cases, timestamp = parse_reports(
+            files, include_output=self.__include_output, max_workers=self.__report_workers
+        )
+        if timestamp:
+            self.__timestamp = timestamp
+        self.___logger.debug(
+            "Found test run at %s, found %s test results in %s report(s)",
+            self.__get_timestamp(),
+            len(list_of_cases),
+            len(files),
+        )
         return list_of_cases
 
     @staticmethod
-    def __search_for_item(searched_value, list_to_seek, field):
+    def __build_case_index(tc_dict_list):
         """
-        Item seeker by value within a list of dicts
+        Builds multi-map index of test cases by automation_id
 
-        :param searched_value: value what we're looking for
-        :param list_to_seek: a list where we perform the search
-        :param field: field of a list dict
-        :return: element
+        :param tc_dict_list: list of dict, with test cases, obtained from TestRails
+        :return: dict like {'custom_automation_id': [case_id, ...]}
         """
-        for item in list_to_seek:
-            if item[field] == searched_value:
-                return item
-
-        return [element for element in list_to_seek if element[field] == searched_value]
+        index = defaultdict(list)
+        for case in tc_dict_list or []:
+            if case["custom_automation_id"]:
+                index[case["custom_automation_id"]].append(case["id"])
+        return index
 
     def __ensure_automation_section(self, title="pytest"):
         """
@@ -120,81 +156,73 @@ class TestRailResultsReporter:
         :param title: title for default folder, string
         :return: id of a section
         """
-        first_run = True
-        item_id = None
-        criteria = None
-        response = None
-        while criteria is not None or first_run:
-            if first_run:
-                try:
-                    response = self.__api.sections.get_sections(project_id=self.__project_id, suite_id=self.__suite_id)
-                except Exception as error:
-                    self.___logger.error(
-                        "Get sections failed. Please validate your settings!\nError%s", format_error(error)
-                    )
-                    self.__self_check()
-                    return None
-                first_run = False
-            elif response["_links"]["next"] is not None:  # pylint: disable=E1136
-                offset = int(response["_links"]["next"].split("&offset=")[1].split("&")[0])  # pylint: disable=E1136
-                response = self.__api.sections.get_sections(
-                    project_id=self.__project_id, suite_id=self.__suite_id, offset=offset
-                )
-            sections = response["sections"]
-            for item in sections:
-                if item["name"] == title:
-                    item_id = item["id"]
-            criteria = response["_links"]["next"]
+        try:
+            tree = get_section_tree(
+                (self.__url, self.__project_id, self.__suite_id),
+                lambda: get_all_pages(
+                    lambda offset: self.__api.sections.get_sections(
+                        project_id=self.__project_id, suite_id=self.__suite_id, offset=offset
+                    ),
+                    key="sections",
+                    max_workers=self.__max_workers,
+                    logger=self.___logger,
+                ),
+            )
+        except Exception as error:
+            self.___logger.error("Get sections failed. Please validate your settings!\nError%s", format_error(error))
+            self.__self_check()
+            return None
+        item_id = tree.find(title)
         if not item_id:
             try:
-                item_id = self.__api.sections.add_section(
+                section = self.__api.sections.add_section(
                     project_id=self.__project_id, suite_id=self.__suite_id, name=title
-                )["id"]
+                )
             except Exception as error:
                 self.___logger.error("Can't add section. Something nasty happened.\nError%s", format_error(error))
                 self.__self_check()
                 return None
+            tree.add(section)
+            item_id = section["id"]
             self.___logger.debug("No default automation folder is found, created new one with name '%s'", title)
         return item_id
 
-    def __enrich_with_tc_num(self, xml_dict_list, tc_dict_list):
+    def __enrich_with_tc_num(self, xml_dict_list, case_index):
         """
-        Add a test case id to case result
+        Add a test case id to case result, missed test cases are created and added to index
 
         :param xml_dict_list: list of dict, with test cases, obtained from xml report
-        :param tc_dict_list: list of dict, with test cases, obtained from TestRails
+        :param case_index: dict like {'custom_automation_id': [case_id, ...]}, obtained from TestRails
         :return: enriched list of dict with test cases
         """
         enriched_list = []
-        missed_tests_counter = 0
-        for item in xml_dict_list:
-            cases = self.__search_for_item(
-                searched_value=item["automation_id"], list_to_seek=tc_dict_list, field="custom_automation_id"
+        missed_tests = list(
+            dict.fromkeys(item["automation_id"] for item in xml_dict_list if item["automation_id"] not in case_index)
+        )
+        created_cases, errors = run_concurrently(
+            lambda automation_id: self.__api.cases.add_case(
+                section_id=self.__at_section, title=automation_id, custom_automation_id=automation_id
+            )["id"],
+            missed_tests,
+            max_workers=self.__max_workers,
+        )
+        for automation_id, case_id in created_cases.items():
+            case_index[automation_id] = [case_id]
+        for automation_id, error in errors.items():
+            self.___logger.error(
+                "Add case '%s' failed. Please validate your settings!\nError: %s", automation_id, format_error(error)
             )
-            if not cases:
-                try:
-                    cases = [
-                        self.__api.cases.add_case(
-                            section_id=self.__at_section,
-                            title=item["automation_id"],
-                            custom_automation_id=item["automation_id"],
-                        )
-                    ]
-                except Exception as error:
-                    self.___logger.error(
-                        "Add case failed. Please validate your settings!\nError: %s", format_error(error)
-                    )
-                    self.__self_check()
-                    return None
-                missed_tests_counter = missed_tests_counter + 1
-            cases = cases if isinstance(cases, list) else [cases]
-            for case in cases:
-                comment = item["message"] if "failure" in item.keys() else ""
+        if errors:
+            self.__self_check()
+        missed_tests_counter = len(created_cases)
+        for item in xml_dict_list:
+            for case_id in case_index.get(item["automation_id"], []):
+                comment = item["comment"]
                 elapsed = item["time"].split(".")[0]
                 elapsed = 1 if elapsed == 0 else elapsed
                 enriched_list.append(
                     {
-                        "case_id": case["id"],  # type: ignore
+                        "case_id": case_id,
                         "status_id": item["status"],
                         "comment": comment,
                         "elapsed": elapsed,
@@ -203,70 +231,59 @@ class TestRailResultsReporter:
                 )
         if missed_tests_counter:
             self.___logger.debug("Missed %s test cases, they was automatically created", missed_tests_counter)
+        if errors:
+            self.___logger.error("%s test cases weren't created, their results are skipped", len(errors))
         self.___logger.debug("Found %s test cases in TestRails", len(enriched_list))
         return enriched_list
 
-    def ___handle_read_timeout(self, retry, retries, error):
-        if retry < retries:
-            retry += 1
-            self.___logger.debug("Timeout error, retrying %s/%s...", retry, retries)
-            return retry, True
-        raise ValueError(f"Get cases failed. Please validate your settings!nError{format_error(error)}") from error
-
-    # pylint: disable=R0912
-    def __get_all_auto_cases(self, retries=3):
+    def __get_all_auto_cases(self, updated_after=None):
         """
         Collects all test cases from TestRails with non-empty automation_id
 
-        :param retries: number of retries, integer
+        :param updated_after: unix timestamp, if passed, only cases updated after it are collected (including cases
+                              with empty automation_id), integer, optional
         :return: list of dict with cases
         """
-        cases_list, first_run, criteria, response, retry = init_get_cases_process()
-        while criteria is not None or first_run:
-            if first_run:
-                try:
-                    response = self.__api.cases.get_cases(project_id=self.__project_id, suite_id=self.__suite_id)
-                except (ReadTimeout, StatusCodeError) as error:
-                    if (
-                        isinstance(error, StatusCodeError)
-                        and error.status_code == 504  # type: ignore  # pylint: disable=no-member
-                        or isinstance(error, ReadTimeout)
-                    ):
-                        retry, should_continue = self.___handle_read_timeout(retry, retries, error)
-                        if should_continue:
-                            continue
-                except Exception as error:
-                    self.___logger.error(
-                        "Get cases failed. Please validate your settings!\nError%s", format_error(error)
-                    )
-                    self.__self_check()
-                    return None
-                first_run = False
-                retry = 0
-            elif response["_links"]["next"] is not None:  # pylint: disable=E1136
-                offset = int(response["_links"]["next"].split("&offset=")[1].split("&")[0])  # pylint: disable=E1136
-                try:
-                    response = self.__api.cases.get_cases(
-                        project_id=self.__project_id, suite_id=self.__suite_id, offset=offset
-                    )
-                except (ReadTimeout, StatusCodeError) as error:
-                    if (
-                        isinstance(error, StatusCodeError)
-                        and error.status_code == 504  # type: ignore  # pylint: disable=no-member
-                        or isinstance(error, ReadTimeout)
-                    ):
-                        retry, should_continue = self.___handle_read_timeout(retry, retries, error)
-                        if should_continue:
-                            continue
-                retry = 0
-            cases = response["cases"]
-            for item in cases:
-                if item["custom_automation_id"] is not None:
-                    cases_list.append({"id": item["id"], "custom_automation_id": item["custom_automation_id"]})
-            criteria = response["_links"]["next"]
+        filters = {"updated_after": updated_after} if updated_after else {}
+        cases_list = []
+        try:
+            for cases in iter_pages(
+                lambda offset: self.__api.cases.get_cases(
+                    project_id=self.__project_id, suite_id=self.__suite_id, offset=offset, **filters
+                ),
+                key="cases",
+                max_workers=self.__max_workers,
+                logger=self.___logger,
+            ):
+                for item in cases:
+                    if item.get("custom_automation_id") is not None or updated_after:
+                        cases_list.append({"id": item["id"], "custom_automation_id": item.get("custom_automation_id")})
+        except Exception as error:
+            self.___logger.error("Get cases failed. Please validate your settings!\nError%s", format_error(error))
+            self.__self_check()
+            return None
         self.___logger.debug("Found %s test cases in TestRails with automation_id", len(cases_list))
         return cases_list
 
+    def __get_case_map(self):
+        """
+        Collects test cases with automation_id, from local cache (refreshed by changed cases) if it's enabled
+
+        :return: list of dict with cases
+        """
+        if not self.__case_cache:
+            return self.__get_all_auto_cases()
+        state = self.__case_cache.get_state(project_id=self.__project_id, suite_id=self.__suite_id)
+        timestamp = int(time.time())
+        full = not state or timestamp - state[1] > self.__case_cache_ttl
+        cases = self.__get_all_auto_cases(updated_after=None if full else state[0] - CACHE_TIME_SKEW)
+        if cases is None:
+            return None
+        self.__case_cache.update(
+            project_id=self.__project_id, suite_id=self.__suite_id, cases=cases, timestamp=timestamp, full=full
+        )
+        return self.__case_cache.get_cases(project_id=self.__project_id, suite_id=self.__suite_id)
+
     def __prepare_payload(self):
         """
         Prepares payload from xml report for sending to TestRails
@@ -274,13 +291,36 @@ class TestRailResultsReporter:
         :return: payload in proper format (list of dicts)
         """
         parsed_xml = self.__xml_to_dict(filename=self.__xml_report)
-        parsed_cases = self.__get_all_auto_cases()
-        if not parsed_xml:
+        if not parsed_xml or self.__get_case_index() is None:
             self.___logger.error("Preparation of payload failed, aborted")
             return None
-        payload = self.__enrich_with_tc_num(xml_dict_list=parsed_xml, tc_dict_list=parsed_cases)
+        payload = self.__enrich_with_tc_num(xml_dict_list=parsed_xml, case_index=self.__case_index)
         return payload
 
+    def __get_case_index(self):
+        """
+        Returns index of test cases by automation_id, it's collected once and reused by following calls
+
+        :return: dict like {'custom_automation_id': [case_id, ...]} or None in case of error
+        """
+        if self.__case_index is None:
+            parsed_cases = self.__get_case_map()
+            if parsed_cases is not None:
+                self.__case_index = self.__build_case_index(parsed_cases)
+        return self.__case_index
+
+    def __drop_case_map(self, error):
+        """
+        Drops cached test cases, if request with them was rejected by TestRail. Incremental refresh doesn't return
+        deleted cases, so their ids stay in cache, next payload is prepared from whole suite.
+
+        :param error: exception of failed request
+        """
+        if self.__case_cache and isinstance(error, StatusCodeError) and error.args[:1] == (400,):
+            self.___logger.debug("Request with cached test cases was rejected, cache is dropped")
+            self.__case_cache.clear(project_id=self.__project_id, suite_id=self.__suite_id)
+            self.__case_index = None
+
     def __prepare_title(self, environment=None, timestamp=None):
         """
         Format test run name based on input string (most probably environment) and timestamp
@@ -290,12 +330,28 @@ class TestRailResultsReporter:
         :return: string of prepared string for AT run name
         """
         if timestamp is None:
-            timestamp = self.__timestamp
+            timestamp = self.__get_timestamp()
         title = f"AT run {timestamp}"
         if environment:
             title = f"{title} on {environment}"
         return title
 
+    def __get_timestamp(self):
+        """
+        Returns timestamp of test run: custom one, obtained from xml report or, if report has no timestamp,
+        modification time of report, so retried upload of the same report gets the same title of test run.
+        Without report, time of reporter creation is used.
+
+        :return: timestamp, string like '2022-09-01T20:25:51'
+        """
+        if self.__timestamp:
+            return self.__timestamp
+        files = get_report_files(self.__xml_report)
+        if files and all(exists(file) for file in files):
+            modified = max(getmtime(file) for file in files)
+            return datetime.datetime.fromtimestamp(modified).strftime("%Y-%m-%dT%H:%M:%S")
+        return self.__created
+
     def send_results(
         self,
         run_id=None,
@@ -318,33 +374,154 @@ class TestRailResultsReporter:
         :param delete_old_run: delete or not previous run if old one exists with the same name
         :return: run id where results were submitted
         """
-        if (
-            not self.__project_id
-            or not self.__at_section
-            or not self.__check_report_exists(xml_report=self.__xml_report)
-        ):
+        if not self.__ensure_valid() or not self.__check_report_exists(xml_report=self.__xml_report):
             self.___logger.error("Error! Please specify all required params!")
             self.__self_check()
             return True
+        # report is parsed before title is prepared, because default title contains timestamp of report
+        payload = self.__prepare_payload()
+        if payload is None:
+            return False
         title = self.__prepare_title(environment, timestamp) if not title else title
         title = run_name if run_name else title
-        payload = self.__prepare_payload()
+        if not run_id and not delete_old_run and self.__checkpoint:
+            run_id = self.__checkpoint.get_run_id(title=title)
+            if run_id and not self.__check_run_exists(run_id=run_id):
+                run_id = None
+            if run_id:
+                self.___logger.debug("Resuming upload of results to test run '%s'", title)
+                run_name = None
         run_id = self.__prepare_runs(
             cases=payload, title=title, run_id=run_id, run_name=run_name, delete_run=delete_old_run
         )
-        retval = self.__add_results(run_id=run_id, results=payload)
-        if close_run:
+        if not run_id and self.__case_index is None:
+            # test cases were rejected and cache was dropped, so payload is prepared once again from whole suite
+            payload = self.__prepare_payload()
+            if payload is None:
+                return False
+            run_id = self.__prepare_runs(cases=payload, title=title, run_name=run_name, delete_run=delete_old_run)
+        retval = self.__add_results(run_id=run_id, results=payload, title=title)
+        if not retval and self.__checkpoint:
+            self.___logger.error("Upload is incomplete, test run '%s' is left open to resume upload", title)
+        elif close_run:
             self.__close_run(run_id=run_id, title=title)
         self.___logger.debug("%s results were added to test run '%s', cases updated. Done", len(payload), title)
         return retval
 
+    def start_run(self, title=None, environment=None):
+        """
+        Creates empty test run, results may be pushed to it later by push_results
+
+        :param title: custom title, optional
+        :param environment: custom name pattern for run name, optional
+        :return: run id or None in case of error
+        """
+        if not self.__ensure_valid():
+            self.___logger.error("Error! Please specify all required params!")
+            self.__self_check()
+            return None
+        title = title if title else self.__prepare_title(environment)
+        run_id = self.__add_run(title=title, cases_list=[], include_all=False)
+        if run_id:
+            self.__run_cases[run_id] = set()
+        return run_id
+
+    def push_results(self, run_id, results, batch_id=None):
+        """
+        Adds results to test run, which is still in progress. Test cases are resolved by automation_id
+        (missed test cases are created) and included into test run before results are added.
+
+        :param run_id: run id, integer
+        :param results: list of dicts like {'automation_id': 'path.to.test_file.TestClass.test_name',
+                                            'time': '0.42', 'status': 1, 'comment': ''}
+        :param batch_id: id of batch of results, optional, if passed, added chunks of failed batch are remembered
+                         and skipped when the same batch is pushed again
+        :return: run id or False in case of error
+        """
+        if not results:
+            return run_id
+        if not self.__ensure_valid() or self.__get_case_index() is None:
+            self.___logger.error("Preparation of payload failed, aborted")
+            return False
+        payload = self.__enrich_with_tc_num(xml_dict_list=results, case_index=self.__case_index)
+        run_cases = self.__run_cases.setdefault(run_id, set())
+        new_cases = {item["case_id"] for item in payload} - run_cases
+        if new_cases:
+            try:
+                self.__api.runs.update_run(run_id=run_id, case_ids=sorted(run_cases | new_cases))
+            except Exception as error:
+                self.___logger.error("Can't update run. Something nasty happened.\nError%s", format_error(error))
+                self.__drop_case_map(error)
+                return False
+            run_cases.update(new_cases)
+        done = None if batch_id is None else self.__pushed_chunks.setdefault((run_id, batch_id), set())
+        retval = self.__add_results(run_id=run_id, results=payload, done=done)
+        if retval and batch_id is not None:
+            self.__pushed_chunks.pop((run_id, batch_id), None)
+        return retval
+
+    def finish_run(self, run_id, title=None):
+        """
+        Closes test run, started by start_run
+
+        :param run_id: run id, integer
+        :param title: title of test run, used for logging only, optional
+        :return: True or False
+        """
+        self.__run_cases.pop(run_id, None)
+        self.__pushed_chunks = {key: value for key, value in self.__pushed_chunks.items() if key[0] != run_id}
+        return self.__close_run(run_id=run_id, title=title if title else run_id)
+
+    def validate(self, force=False):
+        """
+        Checks that project, suite and section for automation tests exist (section is created if needed).
+        Called automatically on first use, you may call it explicitly to fail fast. Successful result is reused
+        during validation_ttl by all reporters with the same url, project, suite and section.
+
+        :param force: ignore cached result of previous validation, True or False
+        :return: True or False
+        """
+        key = (self.__url, self.__project_id, self.__suite_id, self.__at_section_title)
+        with _validation_lock:
+            cached = _validation_cache.get(key)
+        if cached and not force and time.monotonic() - cached[0] < self.__validation_ttl:
+            self.__at_section = cached[1]
+            self.__valid = True
+            return True
+        self.__at_section = None
+        if force:
+            drop_section_tree((self.__url, self.__project_id, self.__suite_id))
+        self.__valid = bool(
+            self.__project_id
+            and self.__check_project(project_id=self.__project_id)
+            and (self.__suite_id is None or self.__check_suite(suite_id=self.__suite_id))
+        )
+        if self.__valid:
+            self.__at_section = self.__ensure_automation_section(title=self.__at_section_title)
+            self.__valid = bool(self.__at_section)
+        if self.__valid:
+            with _validation_lock:
+                _validation_cache[key] = (time.monotonic(), self.__at_section)
+        return self.__valid
+
+    def __ensure_valid(self):
+        """
+        Validates settings if they weren't validated successfully yet, failed validation (i.e. because of transient
+        API error) is repeated on next use
+
+        :return: True or False
+        """
+        return True if self.__valid else self.validate()
+
     def set_project_id(self, project_id):
         """
         Set project id
 
         :param project_id: project id, integer
         """
-        self.__project_id = project_id if self.__check_project(project_id=project_id) else None
+        self.__project_id = project_id
+        self.__valid = None
+        self.__case_index = None
 
     def set_suite_id(self, suite_id):
         """
@@ -352,14 +529,15 @@ class TestRailResultsReporter:
 
         :param suite_id: suite id, integer
         """
-        if self.__check_project():
-            self.__suite_id = suite_id if self.__check_suite(suite_id=suite_id) else None
+        self.__suite_id = suite_id
+        self.__valid = None
+        self.__case_index = None
 
     def set_xml_filename(self, xml_filename):
         """
         Set xml filename
 
-        :param xml_filename: filename of xml report, string
+        :param xml_filename: filename of xml report, string, glob pattern or list of filenames
         """
         self.__xml_report = xml_filename if self.__check_report_exists(xml_report=xml_filename) else None
 
@@ -369,8 +547,8 @@ class TestRailResultsReporter:
 
         :param section_name: name of a section, string
         """
-        if self.__check_project() and self.__check_suite():
-            self.__at_section = self.__ensure_automation_section(title=section_name)
+        self.__at_section_title = section_name
+        self.__valid = None
 
     def set_timestamp(self, new_timestamp):
         """
@@ -429,15 +607,13 @@ class TestRailResultsReporter:
         """
         Check that the xml report exists
 
-        :param xml_report: filename of the xml report, maybe with path
+        :param xml_report: filename of the xml report, maybe with path, glob pattern or list of filenames
         :return: True or False
         """
-        retval = False
         if not xml_report:
             xml_report = self.__xml_report
-        if xml_report:
-            if exists(xml_report):
-                retval = True
+        files = get_report_files(xml_report)
+        retval = bool(files) and all(exists(file) for file in files)
         if not retval:
             self.___logger.error("Please specify correct path.\nError 404: No XML file found")
         return retval
@@ -459,11 +635,15 @@ class TestRailResultsReporter:
 
     def __self_check(self):
         """
-        Health checker, calls checks
+        Health checker, calls checks, cached result of validation is dropped
         """
+        with _validation_lock:
+            _validation_cache.pop((self.__url, self.__project_id, self.__suite_id, self.__at_section_title), None)
+        drop_section_tree((self.__url, self.__project_id, self.__suite_id))
         self.__check_project(project_id=self.__project_id)
         self.__check_suite(suite_id=self.__suite_id)
-        self.__check_section(section_id=self.__at_section)
+        if self.__at_section:
+            self.__check_section(section_id=self.__at_section)
         self.__check_report_exists(xml_report=self.__xml_report)
 
     def __search_for_run_by_name(self, title=None):
@@ -473,28 +653,21 @@ class TestRailResultsReporter:
         :param title: name of the run
         :return:  id, integer
         """
-        retval = None
-        first_run = True
-        criteria = None
-        while criteria is not None or first_run:
-            response = None
-            if first_run:
-                try:
-                    response = self.__api.runs.get_runs(project_id=self.__project_id, suite_id=self.__suite_id)
-                except Exception as error:
-                    self.___logger.error("Can't get run list. Something nasty happened.\nError%s", format_error(error))
-                    break
-                first_run = False
-            elif response["_links"]["next"] is not None:  # pylint: disable=E1136
-                offset = int(response["_links"]["next"].split("&offset=")[1].split("&")[0])  # pylint: disable=E1136
-                response = self.__api.runs.get_runs(
+        try:
+            for runs in iter_pages(
+                lambda offset: self.__api.runs.get_runs(
                     project_id=self.__project_id, suite_id=self.__suite_id, offset=offset
-                )
-            if response["runs"]["name"] == title:
-                retval = response["runs"]["id"]
-                break
-            criteria = response["_links"]["next"]
-        return retval
+                ),
+                key="runs",
+                max_workers=self.__max_workers,
+                logger=self.___logger,
+            ):
+                for run in runs:
+                    if run["name"] == title:
+                        return run["id"]
+        except Exception as error:
+            self.___logger.error("Can't get run list. Something nasty happened.\nError%s", format_error(error))
+        return None
 
     def __delete_run(self, run_id=None):
         """
@@ -532,26 +705,60 @@ class TestRailResultsReporter:
             )["id"]
         except Exception as error:
             self.___logger.error("Can't add run. Something nasty happened.\nError%s", format_error(error))
+            self.__drop_case_map(error)
             self.__self_check()
         return retval
 
-    def __add_results(self, run_id=None, results=None):
+    def __add_results(self, run_id=None, results=None, title=None, done=None):
         """
-        Add results for test cases to TestRail
+        Add results for test cases to TestRail, results are sent by chunks, already uploaded chunks are skipped
 
         :param run_id: run id
         :param results: payload (list of dicts)
+        :param title: title of test run, used as key of upload checkpoint, optional
+        :param done: set of (index, key) of chunks, which are already added, it's updated with added chunks, optional
         :return: run id or False in case of error
         """
-        retval = False
-        try:
-            self.__api.results.add_results_for_cases(run_id=run_id, results=results)
-            return run_id
-        except Exception as error:
-            self.___logger.error("Add results failed. Please validate your settings!\nError%s", format_error(error))
+        chunks = [results[index : index + self.__chunk_size] for index in range(0, len(results), self.__chunk_size)]
+        chunk_keys = [UploadCheckpoint.get_chunk_key(chunk) for chunk in chunks]
+        checkpoint = self.__checkpoint if title else None
+        if checkpoint:
+            checkpoint.start(title=title, run_id=run_id)
+        pending = [
+            index
+            for index, key in enumerate(chunk_keys)
+            if (not checkpoint or not checkpoint.is_done(title=title, chunk_key=key))
+            and (done is None or (index, key) not in done)
+        ]
+        if len(pending) < len(chunks):
+            self.___logger.debug(
+                "%s of %s chunks are already uploaded, skipping", len(chunks) - len(pending), len(chunks)
+            )
+
+        def upload_chunk(index):
+            # throttled chunk is repeated by scheduler, other errors aren't, because results may be already added
+            self.__api.results.add_results_for_cases(run_id=run_id, results=chunks[index])
+            if checkpoint:
+                checkpoint.mark_done(title=title, chunk_key=chunk_keys[index])
+            if done is not None:
+                done.add((index, chunk_keys[index]))
+
+        _, errors = run_concurrently(upload_chunk, pending, max_workers=self.__max_workers)
+        if errors:
+            for index, error in errors.items():
+                self.___logger.error(
+                    "Add results (chunk %s of %s) failed. Please validate your settings!\nError%s",
+                    index + 1,
+                    len(chunks),
+                    format_error(error),
+                )
+                self.__drop_case_map(error)
             self.__self_check()
             self.__check_run_exists(run_id=run_id)
-        return retval
+            return False
+        if checkpoint:
+            checkpoint.finish(title=title)
+        return run_id
 
     def __prepare_runs(self, cases=None, title=None, run_id=None, run_name=None, delete_run=False):
         """
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+""" Plugins for testrail_api_reporter package, activated explicitly, i.e. 'pytest -p <module>' """
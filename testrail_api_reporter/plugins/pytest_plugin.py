@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Pytest plugin, which streams results to TestRails while test session is still running.
+
+Activate it by 'pytest -p testrail_api_reporter.plugins.pytest_plugin --testrail-live ...'
+or by 'pytest_plugins = ["testrail_api_reporter.plugins.pytest_plugin"]' in conftest.py
+"""
+
+import re
+from os import environ, sep
+
+from ..engines.live_reporter import LiveResultsReporter
+from ..engines.results_reporter import TestRailResultsReporter
+from ..utils.junit_parser import FAILED_STATUS, PASSED_STATUS, SKIPPED_STATUS
+
+
+def get_automation_id(nodeid: str) -> str:
+    """
+    Converts pytest node id to automation_id in the same format as junitxml report uses (classname.name)
+
+    :param nodeid: pytest node id, i.e. 'tests/test_file.py::TestClass::test_name[param]'
+    :return: automation_id, i.e. 'tests.test_file.TestClass.test_name[param]'
+    """
+    path, bracket, params = nodeid.partition("[")
+    names = path.split("::")
+    names[0] = re.sub(r"\.py$", "", names[0].replace(sep, ".").replace("/", "."))
+    return f"{'.'.join(names)}{bracket}{params}"
+
+
+def get_result(report) -> dict:
+    """
+    Converts pytest test report to result record
+
+    :param report: pytest TestReport object
+    :return: dict like {'automation_id': 'path.to.test_file.TestClass.test_name',
+                        'time': '0.42', 'status': 1, 'comment': ''}
+    """
+    status = PASSED_STATUS
+    if report.skipped:
+        status = FAILED_STATUS if hasattr(report, "wasxfail") else SKIPPED_STATUS
+    elif report.failed:
+        status = FAILED_STATUS
+    return {
+        "automation_id": get_automation_id(report.nodeid),
+        "time": f"{report.duration:.3f}",
+        "status": status,
+        "comment": report.longreprtext if report.failed else "",
+    }
+
+
+class LiveReportingPlugin:
+    """Pytest hooks of live reporting"""
+
+    def __init__(self, live_reporter: LiveResultsReporter):
+        """
+        General init
+
+        :param live_reporter: LiveResultsReporter object
+        """
+        self.__live_reporter = live_reporter
+
+    def pytest_sessionstart(self, session):  # pylint: disable=unused-argument
+        """
+        Creates test run at start of session
+
+        :param session: pytest session
+        """
+        self.__live_reporter.start()
+
+    def pytest_runtest_logreport(self, report):
+        """
+        Buffers result of test, result of setup is used only if test wasn't called
+
+        :param report: pytest TestReport object
+        """
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            self.__live_reporter.add_result(get_result(report))
+
+    def pytest_sessionfinish(self, session, exitstatus):  # pylint: disable=unused-argument
+        """
+        Sends rest of results and closes test run at end of session
+
+        :param session: pytest session
+        :param exitstatus: exit status of session
+        """
+        self.__live_reporter.stop()
+
+
+def pytest_addoption(parser):
+    """
+    Registers options of live reporting
+
+    :param parser: pytest options parser
+    """
+    group = parser.getgroup("testrail", "stream results to TestRail")
+    group.addoption("--testrail-live", action="store_true", default=False, help="stream results to TestRail")
+    group.addoption("--testrail-url", default=environ.get("TESTRAIL_URL"), help="url of TestRail")
+    group.addoption("--testrail-email", default=environ.get("TESTRAIL_EMAIL"), help="email of TestRail user")
+    group.addoption("--testrail-password", default=environ.get("TESTRAIL_PASSWORD"), help="password of TestRail user")
+    group.addoption("--testrail-project-id", type=int, help="project id")
+    group.addoption("--testrail-suite-id", type=int, default=None, help="suite id")
+    group.addoption("--testrail-run-title", default=None, help="custom title of test run")
+    group.addoption("--testrail-environment", default=None, help="custom name pattern for run name")
+    group.addoption("--testrail-flush-interval", type=float, default=30.0, help="max seconds between uploads")
+    group.addoption("--testrail-batch-size", type=int, default=100, help="number of results, which triggers upload")
+    group.addoption("--testrail-keep-run-open", action="store_true", default=False, help="don't close test run")
+
+
+def pytest_configure(config):
+    """
+    Registers live reporting plugin if it's enabled, xdist workers don't report
+
+    :param config: pytest config
+    """
+    if not config.getoption("testrail_live") or hasattr(config, "workerinput"):
+        return
+    reporter = TestRailResultsReporter(
+        url=config.getoption("testrail_url"),
+        email=config.getoption("testrail_email"),
+        password=config.getoption("testrail_password"),
+        project_id=config.getoption("testrail_project_id"),
+        suite_id=config.getoption("testrail_suite_id"),
+        xml_report=None,
+    )
+    live_reporter = LiveResultsReporter(
+        reporter=reporter,
+        title=config.getoption("testrail_run_title"),
+        environment=config.getoption("testrail_environment"),
+        flush_interval=config.getoption("testrail_flush_interval"),
+        batch_size=config.getoption("testrail_batch_size"),
+        close_run=not config.getoption("testrail_keep_run_open"),
+    )
+    config.pluginmanager.register(LiveReportingPlugin(live_reporter), "testrail_live_reporting")
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 """ Utils for testrail_api_reporter package """
 
+from .history_store import HistoryStore, CSVHistoryStore, SQLiteHistoryStore
 from .logger_config import setup_logger
 from .reporter_utils import upload_image, delete_file, zip_file
+from .request_scheduler import RequestScheduler, create_api
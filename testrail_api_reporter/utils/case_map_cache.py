@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+""" Persistent cache of automation_id -> case id map for TestRail API Reporter """
+
+import sqlite3
+from contextlib import closing
+from typing import List, Optional
+
+from .logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
+
+
+class CaseMapCache:
+    """SQLite cache of test cases with automation_id, keyed by project and suite"""
+
+    def __init__(self, filename="case_map_cache.db", logger=None, log_level=DEFAULT_LOGGING_LEVEL):
+        """
+        Default init
+
+        :param filename: filename (maybe with path) of SQLite database, string
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        if not logger:
+            self.___logger = setup_logger(name="CaseMapCache", log_file="CaseMapCache.log", level=log_level)
+        else:
+            self.___logger = logger
+        self.___logger.debug("Initializing Case Map Cache")
+        if not filename:
+            raise ValueError("Filename for case map cache is not provided, cache can't be initialized!")
+        self.__filename = filename
+        with closing(self.__connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS case_map ("
+                "project_id INTEGER NOT NULL, suite_id INTEGER NOT NULL, case_id INTEGER NOT NULL, "
+                "automation_id TEXT NOT NULL, PRIMARY KEY (project_id, suite_id, case_id))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS case_map_automation_id ON case_map (project_id, suite_id, automation_id)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS case_map_state ("
+                "project_id INTEGER NOT NULL, suite_id INTEGER NOT NULL, updated_on INTEGER NOT NULL, "
+                "full_updated_on INTEGER NOT NULL, PRIMARY KEY (project_id, suite_id))"
+            )
+
+    def __connect(self):
+        """
+        Opens connection to cache database
+
+        :return: connection object
+        """
+        return sqlite3.connect(self.__filename, timeout=30)
+
+    def get_state(self, project_id: int, suite_id=None) -> Optional[tuple]:
+        """
+        Returns timestamps of last refresh of the cache
+
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        :return: tuple (updated_on, full_updated_on) with unix timestamps, or None if nothing is cached yet
+        """
+        with closing(self.__connect()) as connection:
+            return connection.execute(
+                "SELECT updated_on, full_updated_on FROM case_map_state WHERE project_id = ? AND suite_id = ?",
+                (project_id, suite_id or 0),
+            ).fetchone()
+
+    def get_cases(self, project_id: int, suite_id=None) -> List[dict]:
+        """
+        Returns cached test cases with automation_id
+
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        :return: list of dicts like {'id': 42, 'custom_automation_id': 'path.to.test'}
+        """
+        with closing(self.__connect()) as connection:
+            rows = connection.execute(
+                "SELECT case_id, automation_id FROM case_map WHERE project_id = ? AND suite_id = ?",
+                (project_id, suite_id or 0),
+            ).fetchall()
+        return [{"id": case_id, "custom_automation_id": automation_id} for case_id, automation_id in rows]
+
+    def update(self, project_id: int, suite_id=None, cases=None, timestamp=0, full=False):
+        """
+        Stores fetched test cases in cache within one transaction
+
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        :param cases: list of dicts like {'id': 42, 'custom_automation_id': 'path.to.test'}, cases with empty
+                      automation_id are removed from cache
+        :param timestamp: unix timestamp when cases were requested, integer
+        :param full: cases contain whole suite (True) or only updated cases (False)
+        """
+        suite_id = suite_id or 0
+        cases = cases or []
+        with closing(self.__connect()) as connection, connection:
+            if full:
+                connection.execute("DELETE FROM case_map WHERE project_id = ? AND suite_id = ?", (project_id, suite_id))
+            connection.executemany(
+                "DELETE FROM case_map WHERE project_id = ? AND suite_id = ? AND case_id = ?",
+                ((project_id, suite_id, case["id"]) for case in cases if not case["custom_automation_id"]),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO case_map (project_id, suite_id, case_id, automation_id) VALUES (?, ?, ?, ?)",
+                (
+                    (project_id, suite_id, case["id"], case["custom_automation_id"])
+                    for case in cases
+                    if case["custom_automation_id"]
+                ),
+            )
+            state = connection.execute(
+                "SELECT full_updated_on FROM case_map_state WHERE project_id = ? AND suite_id = ?",
+                (project_id, suite_id),
+            ).fetchone()
+            full_updated_on = timestamp if full or not state else state[0]
+            connection.execute(
+                "INSERT OR REPLACE INTO case_map_state (project_id, suite_id, updated_on, full_updated_on) "
+                "VALUES (?, ?, ?, ?)",
+                (project_id, suite_id, timestamp, full_updated_on),
+            )
+        self.___logger.debug(
+            "Case map cache for project %s, suite %s updated with %s cases (full refresh: %s)",
+            project_id,
+            suite_id,
+            len(cases),
+            full,
+        )
+
+    def clear(self, project_id: int, suite_id=None):
+        """
+        Removes cached test cases and state of project/suite, so whole suite is downloaded on next refresh
+
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        """
+        suite_id = suite_id or 0
+        with closing(self.__connect()) as connection, connection:
+            connection.execute("DELETE FROM case_map WHERE project_id = ? AND suite_id = ?", (project_id, suite_id))
+            connection.execute(
+                "DELETE FROM case_map_state WHERE project_id = ? AND suite_id = ?", (project_id, suite_id)
+            )
+        self.___logger.debug("Case map cache for project %s, suite %s is cleared", project_id, suite_id)
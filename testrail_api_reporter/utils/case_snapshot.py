@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+""" Columnar snapshot of test cases of TestRail project/suite """
+
+import json
+import time
+from array import array
+from os import makedirs, remove, replace
+from os.path import exists, join
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from .logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
+
+SNAPSHOT_TTL = 3600  # seconds
+SNAPSHOT_TIME_SKEW = 300  # seconds, overlap of incremental refresh to compensate clock difference with server
+RECONCILE_INTERVAL = 604800  # seconds, how often ids of cases are reconciled to find deleted cases
+
+
+def _get_key(value) -> str:
+    """
+    Returns hashable key of value of case field, values may be integers, strings, lists or None
+
+    :param value: value of case field
+    :return: key, string
+    """
+    return json.dumps(value, sort_keys=True)
+
+
+def _get_hashable(value):
+    """
+    Returns hashable value of case field, i.e. to use it as key of dict
+
+    :param value: value of case field
+    :return: value, lists are converted to tuples
+    """
+    return tuple(_get_hashable(item) for item in value) if isinstance(value, list) else value
+
+
+class CaseTable:
+    """Columnar table of test cases, where every field is stored as integer codes plus list of distinct values"""
+
+    def __init__(self, ids: np.ndarray, codes: dict, keys: dict, meta: Optional[dict] = None):
+        """
+        Default init, use CaseTable.from_cases() to build table from test cases
+
+        :param ids: array of case ids
+        :param codes: dict like {field: array of codes}, arrays have the same length as ids
+        :param keys: dict like {field: list of keys of distinct values}, code is index of key in list
+        :param meta: dict with metadata, i.e. {'project_id': 1, 'suite_id': None, 'updated_on': 1660000000}
+        """
+        self.__ids = ids
+        self.__codes = codes
+        self.__keys = keys
+        self.__lookup = {field: {key: code for code, key in enumerate(items)} for field, items in keys.items()}
+        self.meta = meta if meta else {}
+
+    @classmethod
+    def from_cases(cls, cases: Iterable[dict], fields: Iterable[str], meta: Optional[dict] = None):
+        """
+        Builds table from test cases in one pass, cases are not kept in memory
+
+        :param cases: iterable of dicts with test cases, obtained from TestRails
+        :param fields: list of fields of case to store, i.e. ['section_id', 'priority_id', 'type_id']
+        :param meta: dict with metadata, optional
+        :return: CaseTable object
+        """
+        fields = sorted(set(fields))
+        table = cls(
+            ids=np.zeros(0, dtype=np.int64),
+            codes={field: np.zeros(0, dtype=np.int32) for field in fields},
+            keys={field: [] for field in fields},
+            meta=meta,
+        )
+        table.update(cases)
+        return table
+
+    def update(self, cases: Iterable[dict]) -> int:
+        """
+        Inserts new and replaces changed cases, i.e. delta obtained with updated_after filter
+
+        :param cases: iterable of dicts with test cases, obtained from TestRails
+        :return: number of inserted or replaced cases
+        """
+        ids = array("q")
+        codes = {field: array("l") for field in self.__codes}
+        for case in cases:
+            ids.append(case["id"])
+            for field, column in codes.items():
+                key = _get_key(case.get(field))
+                if key not in self.__lookup[field]:
+                    self.__lookup[field][key] = len(self.__keys[field])
+                    self.__keys[field].append(key)
+                column.append(self.__lookup[field][key])
+        if not ids:
+            return 0
+        new_ids = np.frombuffer(ids, dtype=np.int64)
+        # same case may be received twice while it's changed during crawl, the last version is kept
+        _, last = np.unique(new_ids[::-1], return_index=True)
+        rows = np.sort(len(new_ids) - 1 - last)
+        keep = ~np.isin(self.__ids, new_ids)
+        self.__ids = np.concatenate([self.__ids[keep], new_ids[rows]])
+        for field, column in codes.items():
+            new_codes = np.asarray(column, dtype=np.int32)[rows]
+            self.__codes[field] = np.concatenate([self.__codes[field][keep], new_codes])
+        return len(rows)
+
+    def retain(self, ids: Iterable[int]) -> int:
+        """
+        Removes cases, which ids are not in given list, i.e. deleted cases
+
+        :param ids: iterable of ids of all existing cases
+        :return: number of removed cases
+        """
+        keep = np.isin(self.__ids, np.fromiter(ids, dtype=np.int64))
+        removed = int(len(keep) - keep.sum())
+        if removed:
+            self.__ids = self.__ids[keep]
+            self.__codes = {field: codes[keep] for field, codes in self.__codes.items()}
+        return removed
+
+    def get_age(self) -> float:
+        """
+        Returns time since last update of table
+
+        :return: age in seconds, float
+        """
+        return time.time() - self.meta.get("updated_on", 0)
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def get_fields(self) -> set:
+        """
+        Returns stored fields of cases
+
+        :return: set of field names
+        """
+        return set(self.__codes)
+
+    def get_ids(self) -> np.ndarray:
+        """
+        Returns ids of cases
+
+        :return: array of case ids
+        """
+        return self.__ids
+
+    def get_codes(self, field: str) -> np.ndarray:
+        """
+        Returns column of field as integer codes
+
+        :param field: name of field, string
+        :return: array of codes
+        """
+        return self.__codes[field]
+
+    def get_values(self, field: str) -> list:
+        """
+        Returns distinct values of field, code of value is its index
+
+        :param field: name of field, string
+        :return: list of values
+        """
+        return [json.loads(key) for key in self.__keys[field]]
+
+    def isin(self, field: str, values: Iterable) -> np.ndarray:
+        """
+        Returns mask of cases, where field has one of given values
+
+        :param field: name of field, string
+        :param values: list of values, i.e. [3, 4]
+        :return: boolean array
+        """
+        lookup = self.__lookup[field]
+        codes = [lookup[key] for key in map(_get_key, values) if key in lookup]
+        return np.isin(self.__codes[field], codes)
+
+    def count(self, field: str, mask: Optional[np.ndarray] = None) -> dict:
+        """
+        Counts cases by values of field
+
+        :param field: name of field, string
+        :param mask: boolean array to filter cases, optional
+        :return: dict like {value: number of cases}, list values are converted to tuples
+        """
+        codes = self.__codes[field] if mask is None else self.__codes[field][mask]
+        counts = np.bincount(codes, minlength=len(self.__keys[field]))
+        return {_get_hashable(json.loads(key)): int(counts[code]) for code, key in enumerate(self.__keys[field])}
+
+    def crosstab(self, fields: list, mask: Optional[np.ndarray] = None) -> dict:
+        """
+        Counts cases by all combinations of values of fields in one vectorized pass
+
+        :param fields: list of names of fields, i.e. ['priority_id', 'type_id']
+        :param mask: boolean array to filter cases, optional
+        :return: dict like {(value of first field, value of second field, ...): number of cases}, only combinations
+                 with at least one case are returned, list values are converted to tuples
+        """
+        if not fields:
+            count = len(self) if mask is None else int(mask.sum())
+            return {(): count} if count else {}
+        columns = [self.__codes[field] if mask is None else self.__codes[field][mask] for field in fields]
+        if not len(columns[0]):
+            return {}
+        dims = [len(self.__keys[field]) for field in fields]
+        combinations, counts = np.unique(np.ravel_multi_index(columns, dims=dims), return_counts=True)
+        values = [[_get_hashable(value) for value in self.get_values(field)] for field in fields]
+        return {
+            tuple(values[i][code] for i, code in enumerate(codes)): int(count)
+            for *codes, count in zip(*np.unravel_index(combinations, dims), counts)
+        }
+
+    def save(self, filename: str):
+        """
+        Writes table to compressed .npz file atomically
+
+        :param filename: filename (maybe with path), string
+        """
+        arrays: Dict[str, Any] = {"ids": self.__ids, "meta": np.array(json.dumps(self.meta))}
+        for field, codes in self.__codes.items():
+            arrays[f"codes.{field}"] = codes
+            arrays[f"keys.{field}"] = np.array(self.__keys[field], dtype=str)
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "wb") as file:
+            np.savez_compressed(file, **arrays)
+        replace(temp_filename, filename)
+
+    @classmethod
+    def load(cls, filename: str):
+        """
+        Reads table from .npz file
+
+        :param filename: filename (maybe with path), string
+        :return: CaseTable object
+        """
+        with np.load(filename, allow_pickle=False) as data:
+            fields = [name.split(".", 1)[1] for name in data.files if name.startswith("codes.")]
+            return cls(
+                ids=data["ids"],
+                codes={field: data[f"codes.{field}"] for field in fields},
+                keys={field: data[f"keys.{field}"].tolist() for field in fields},
+                meta=json.loads(str(data["meta"])),
+            )
+
+
+class CaseSnapshotStore:
+    """Directory with columnar snapshots of test cases, one .npz file per project/suite"""
+
+    def __init__(self, path=".", ttl=SNAPSHOT_TTL, logger=None, log_level=DEFAULT_LOGGING_LEVEL):
+        """
+        Default init
+
+        :param path: directory for snapshot files, string, created if not exists
+        :param ttl: freshness window in seconds, older snapshots are not loaded, if 0 or None, age is not checked
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        if not logger:
+            self.___logger = setup_logger(name="CaseSnapshotStore", log_file="CaseSnapshotStore.log", level=log_level)
+        else:
+            self.___logger = logger
+        self.___logger.debug("Initializing Case Snapshot Store")
+        if not path:
+            raise ValueError("Path for case snapshots is not provided, store can't be initialized!")
+        makedirs(path, exist_ok=True)
+        self.__path = path
+        self.__ttl = ttl
+
+    def get_filename(self, project_id: int, suite_id=None) -> str:
+        """
+        Returns filename of snapshot of project/suite
+
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        :return: filename, string
+        """
+        return join(self.__path, f"cases_{project_id}_{suite_id if suite_id else 0}.npz")
+
+    def load(self, project_id: int, suite_id=None) -> Optional[CaseTable]:
+        """
+        Loads snapshot of project/suite if it exists and is fresh
+
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        :return: CaseTable object or None
+        """
+        filename = self.get_filename(project_id, suite_id)
+        if not exists(filename):
+            return None
+        try:
+            table = CaseTable.load(filename)
+        except (OSError, ValueError, KeyError) as error:
+            self.___logger.error("Snapshot %s can't be loaded, it will be replaced: %s", filename, error)
+            return None
+        age = table.get_age()
+        if self.__ttl and age > self.__ttl:
+            self.___logger.debug("Snapshot %s is outdated (%.0fs old)", filename, age)
+            return None
+        self.___logger.debug("Loaded snapshot %s with %s cases", filename, len(table))
+        return table
+
+    def save(self, table: CaseTable, project_id: int, suite_id=None):
+        """
+        Saves snapshot of project/suite
+
+        :param table: CaseTable object
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        """
+        filename = self.get_filename(project_id, suite_id)
+        table.save(filename)
+        self.___logger.debug("Saved snapshot %s with %s cases", filename, len(table))
+
+    def remove(self, project_id: int, suite_id=None):
+        """
+        Removes snapshot of project/suite
+
+        :param project_id: project id, integer
+        :param suite_id: suite id, integer, optional, if no suite-management is activated
+        """
+        filename = self.get_filename(project_id, suite_id)
+        if exists(filename):
+            remove(filename)
+            self.___logger.debug("Removed snapshot %s", filename)
@@ -5,6 +5,8 @@
 class CaseStat:
     """Placeholder class for automation statistics"""
 
+    __slots__ = ("name", "total", "automated", "not_automated", "not_applicable")
+
     def __init__(self, name: str):
         """
         Constructor
@@ -106,3 +108,51 @@ class CaseStat:
         if not_applicable < 0:
             raise ValueError("State value 'not_applicable' can't be less than 0")
         self.not_applicable = not_applicable
+
+    # aggregation
+    def add(self, total: int = 0, automated: int = 0, not_automated: int = 0, not_applicable: int = 0) -> "CaseStat":
+        """
+        Increments numbers of test cases at once
+
+        :param total: increment of total number of test cases
+        :param automated: increment of number of automated test cases
+        :param not_automated: increment of number of not automated test cases
+        :param not_applicable: increment of number of not applicable test cases
+        :return: self
+        """
+        totals = (
+            self.total + total,
+            self.automated + automated,
+            self.not_automated + not_automated,
+            self.not_applicable + not_applicable,
+        )
+        if min(totals) < 0:
+            raise ValueError("State values can't be less than 0")
+        self.total, self.automated, self.not_automated, self.not_applicable = totals
+        return self
+
+    def merge(self, other: "CaseStat") -> "CaseStat":
+        """
+        Adds numbers of other statistics to this one, i.e. to reduce statistics of shards
+
+        :param other: CaseStat object
+        :return: self
+        """
+        return self.add(other.total, other.automated, other.not_automated, other.not_applicable)
+
+    def __add__(self, other: "CaseStat") -> "CaseStat":
+        """
+        Returns new statistics with sum of numbers, name is taken from the left operand
+
+        :param other: CaseStat object
+        :return: CaseStat object
+        """
+        if not isinstance(other, CaseStat):
+            return NotImplemented
+        return CaseStat(self.name).merge(self).merge(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"CaseStat(name={self.name!r}, total={self.total}, automated={self.automated}, "
+            f"not_automated={self.not_automated}, not_applicable={self.not_applicable})"
+        )
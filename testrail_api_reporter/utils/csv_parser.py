@@ -2,10 +2,21 @@
 """ CSV parser for TestRail API Reporter """
 
 import csv
+from array import array
+from contextlib import contextmanager
 from datetime import datetime
+from os import SEEK_END, fstat, replace, stat
 from os.path import exists
 from typing import List
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows, history files are written without locking
+    fcntl = None  # type: ignore
+
+import numpy as np
+
+from .history_sampling import compact_history, DAILY_RETENTION_DAYS, RAW_RETENTION_DAYS
 from .logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
 
 
@@ -27,12 +38,13 @@ class CSVParser:
         self.___logger.debug("Initializing CSV Parser")
         self.__filename = filename
 
-    def save_history_data(self, filename=None, report=None):
+    def save_history_data(self, filename=None, report=None, intraday=False):
         """
         Save history data to CSV
 
         :param filename: file name of output file, required
         :param report: report with distribution in CaseStat format
+        :param intraday: if True, every report is saved with time of day, otherwise only first report per day is saved
         :return:
         """
         filename = filename if filename else self.__filename
@@ -40,57 +52,208 @@ class CSVParser:
             raise ValueError("Filename for save report data is not provided, save history data aborted!")
         if not report:
             raise ValueError("Report couldn't be found, save history data aborted!")
-        date = datetime.today().strftime("%Y-%m-%d")
-        last_date = ""
-        mode = "r" if exists(filename) else "w"
-        with open(filename, mode, encoding="utf-8") as csvfile:
-            if mode == "r":
-                for row in reversed(list(csv.reader(csvfile))):
-                    last_date = f"{row[0]}-{row[1]}-{row[2]}"
-                    break
-        if last_date != date:
-            self.___logger.debug("Last date in file: %s for %s", filename, last_date)
-            with open(filename, "a+", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL)
+        today = datetime.today().replace(microsecond=0)
+        timestamp = today.strftime("%Y-%m-%d %H:%M:%S" if intraday else "%Y-%m-%d")
+        # check of last row and append are done under lock, so parallel jobs don't store the same day twice
+        with _open_locked(filename) as csvfile:
+            last_line, ends_with_newline = self.__read_last_line(filename)
+            last_timestamp = ""
+            for row in csv.reader([last_line] if last_line else []):
+                # last row may be partially written by crashed job, such row is skipped like in load_history_data
+                if len(row) >= 7:
+                    last_timestamp = " ".join([f"{row[0]}-{row[1]}-{row[2]}", *row[7:8]])
+            if last_timestamp == timestamp or (not intraday and last_timestamp[:10] == timestamp):
+                self.___logger.debug("Data already stored for %s, skipping save", timestamp)
+                return
+            self.___logger.debug("Last date in file: %s for %s", filename, last_timestamp)
+            if not ends_with_newline:
+                csvfile.write("\n")
+            writer = csv.writer(csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(
+                _get_row(
+                    today if intraday else today.date(),
+                    report.get_total(),
+                    report.get_automated(),
+                    report.get_not_automated(),
+                    report.get_not_applicable(),
+                    intraday=intraday,
+                )
+            )
 
-                writer.writerow(
-                    [
-                        datetime.today().strftime("%Y"),
-                        datetime.today().strftime("%m"),
-                        datetime.today().strftime("%d"),
-                        report.get_total(),
-                        report.get_automated(),
-                        report.get_not_automated(),
-                        report.get_not_applicable(),
-                    ]
+    def compact_history_data(
+        self, filename=None, raw_days=RAW_RETENTION_DAYS, daily_days=DAILY_RETENTION_DAYS, now=None
+    ) -> int:
+        """
+        Applies retention policy to history file: snapshots of last raw_days are kept as is, older ones are rolled up
+        to the last snapshot of day, and snapshots older than daily_days are rolled up to the last snapshot of week.
+        File is replaced atomically.
+
+        :param filename: file name of history file, required
+        :param raw_days: number of days, when all snapshots are kept
+        :param daily_days: number of days, when daily snapshots are kept
+        :param now: current time, datetime, optional, by default is now
+        :return: number of removed rows
+        """
+        filename = filename if filename else self.__filename
+        if not filename:
+            raise ValueError("Filename for compact report data is not provided, compact history data aborted!")
+        if not exists(filename):
+            raise ValueError(f"Can't open report file '{filename}', compact history data aborted!")
+        with _open_locked(filename):
+            history, intraday = self.__load_history(filename)
+            # flags of intraday snapshots are compacted as extra column, so time of day is kept as is
+            compacted = compact_history([*history, intraday], raw_days=raw_days, daily_days=daily_days, now=now)
+            removed = len(history[0]) - len(compacted[0])
+            if not removed:
+                self.___logger.debug("History %s is already compact", filename)
+                return 0
+            temp_filename = f"{filename}.tmp"
+            with open(temp_filename, "w", newline="", encoding="utf-8") as csvfile:
+                writer = csv.writer(csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL)
+                writer.writerows(
+                    _get_row(timestamp, total, automated, not_automated, not_applicable, intraday=with_time)
+                    for timestamp, total, automated, not_automated, not_applicable, with_time in zip(*compacted)
                 )
-        else:
-            self.___logger.debug("Data already stored for today, skipping save")
+            replace(temp_filename, filename)
+        self.___logger.debug("Compacted history %s from %s to %s rows", filename, len(history[0]), len(compacted[0]))
+        return removed
+
+    @staticmethod
+    def __read_last_line(filename: str, block_size=4096) -> tuple:
+        """
+        Reads last non-empty line of file by seeking backwards from the end, so time doesn't depend on file size
+
+        :param filename: file name, required
+        :param block_size: size of block read at once, in bytes
+        :return: tuple (last line or empty string, True if file is empty or ends with newline)
+        """
+        if not exists(filename):
+            return "", True
+        with open(filename, "rb") as file:
+            position = file.seek(0, SEEK_END)
+            tail = b""
+            while position > 0:
+                step = min(block_size, position)
+                position -= step
+                file.seek(position)
+                tail = file.read(step) + tail
+                if tail.strip(b"\r\n").count(b"\n"):
+                    break
+        lines = tail.strip(b"\r\n").splitlines()
+        return (lines[-1].decode("utf-8") if lines else ""), (not tail or tail.endswith(b"\n"))
 
     def load_history_data(self, filename=None) -> List:
         """
         Load history data to CSV
 
         :param filename: file name of output file, required
-        :return: list with results
+        :return: list with typed columns: dates (numpy datetime64[D] array, or datetime64[s] if history contains
+                 intraday snapshots) and numbers of total, automated, not automated and not applicable test cases
+                 (numpy int64 arrays)
         """
         filename = filename if filename else self.__filename
         if not filename:
             raise ValueError("Filename for load report data is not provided, save history data aborted!")
-        timestamps = []
-        totals = []
-        automated = []
-        not_automated = []
-        nas = []
+        return self.__load_history(filename)[0]
+
+    def __load_history(self, filename: str) -> tuple:
+        """
+        Loads history data and flags of rows, which are stored with time of day
+
+        :param filename: file name of history file, required
+        :return: tuple (list with typed columns in format of load_history_data(), numpy bool array of intraday flags)
+        """
+        columns = [array("q") for _ in range(9)]
         self.___logger.debug("Loading history data from %s", filename)
         try:
             with open(filename, "r", encoding="utf-8") as csvfile:
-                for row in csv.reader(csvfile):
-                    timestamps.append(datetime(year=int(row[0]), month=int(row[1]), day=int(row[2])))
-                    totals.append(row[3])
-                    automated.append(row[4])
-                    not_automated.append(row[5])
-                    nas.append(row[6])
+                # readers are not locked, so the last line may be partially written by parallel job
+                for row in csv.reader(line for line in csvfile if line.endswith("\n")):
+                    if len(row) < 7:
+                        continue
+                    try:
+                        values = [int(value) for value in row[:7]]
+                        values.extend((_get_seconds(row[7]), 1) if len(row) > 7 else (0, 0))
+                    except ValueError:
+                        self.___logger.debug("Malformed row %s is skipped in %s", row, filename)
+                        continue
+                    for column, value in zip(columns, values):
+                        column.append(value)
         except FileNotFoundError:
             raise ValueError(f"Can't open report file '{filename}', load history data aborted!") from FileNotFoundError
-        return [timestamps, totals, automated, not_automated, nas]
+        years, months, days, *counts, seconds, intraday = (np.array(column, dtype=np.int64) for column in columns)
+        dates = get_dates(years, months, days)
+        if intraday.any():
+            dates = dates.astype("datetime64[s]") + seconds
+        return [dates, *counts], intraday.astype(bool)
+
+
+@contextmanager
+def _open_locked(filename: str):
+    """
+    Opens file for appending and holds exclusive advisory lock until file is closed. If file is replaced by
+    compaction while waiting for lock, new file is opened and locked instead.
+
+    :param filename: file name, file is created if not exists
+    :return: file object (generator)
+    """
+    while True:
+        file = open(filename, "a", newline="", encoding="utf-8")  # pylint: disable=consider-using-with
+        if not fcntl:
+            break
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            if fstat(file.fileno()).st_ino == stat(filename).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            file.close()
+            raise
+        file.close()
+    with file:
+        yield file
+
+
+def _get_seconds(value: str) -> int:
+    """
+    Converts time of day to number of seconds since midnight
+
+    :param value: time of day, string like '14:30:00'
+    :return: number of seconds, integer
+    """
+    hours, minutes, seconds = value.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _get_row(timestamp, total, automated, not_automated, not_applicable, intraday=False) -> list:
+    """
+    Returns row of history file, time of day is added only for intraday snapshot, even if it's midnight
+
+    :param timestamp: date or datetime of report, datetime-like or numpy datetime64
+    :param total: total number of test cases
+    :param automated: number of automated test cases
+    :param not_automated: number of not automated test cases
+    :param not_applicable: number of not applicable test cases
+    :param intraday: if True, time of day is added
+    :return: list of values
+    """
+    timestamp = np.datetime64(timestamp, "s").item()
+    row = [timestamp.strftime("%Y"), timestamp.strftime("%m"), timestamp.strftime("%d")]
+    row.extend(int(value) for value in (total, automated, not_automated, not_applicable))
+    if intraday:
+        row.append(timestamp.strftime("%H:%M:%S"))
+    return row
+
+
+def get_dates(years, months, days) -> np.ndarray:
+    """
+    Converts columns of years, months and days to dates in vectorized form
+
+    :param years: array of years
+    :param months: array of months (1-12)
+    :param days: array of days of month (1-31)
+    :return: numpy datetime64[D] array
+    """
+    first_days = (np.asarray(years) - 1970).astype("datetime64[Y]").astype("datetime64[M]") + np.asarray(months) - 1
+    return first_days.astype("datetime64[D]") + np.asarray(days) - 1
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+""" Reduction of history data (in format of CSVParser.load_history_data()) for charts and storage """
+
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+ROLLUP_PERIODS = ("week", "month")
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+RAW_RETENTION_DAYS = 7  # intraday snapshots are kept as is
+DAILY_RETENTION_DAYS = 365  # last snapshot of day is kept, older history is kept weekly
+
+
+def _get_periods(dates: np.ndarray, period: str) -> np.ndarray:
+    """
+    Returns first days of periods (weeks starts on Monday) for given dates
+
+    :param dates: numpy datetime64[D] array
+    :param period: 'week' or 'month'
+    :return: numpy datetime64[D] array
+    """
+    if period == "month":
+        return dates.astype("datetime64[M]").astype("datetime64[D]")
+    # 1970-01-01 is Thursday, so Monday-based week number is shifted by 3 days
+    days = dates.astype("datetime64[D]").astype(np.int64)
+    return ((days + 3) // 7 * 7 - 3).astype("datetime64[D]")
+
+
+def _get_last_indices(periods: np.ndarray) -> np.ndarray:
+    """
+    Returns indices of last rows of every period
+
+    :param periods: array of periods of rows, history is ordered by date, so periods are ascending
+    :return: array of indices
+    """
+    return np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+
+
+def rollup_history(history: List, period: Optional[str] = None) -> List:
+    """
+    Rolls daily history up to weekly or monthly aggregates, the last snapshot of every period is kept and is placed
+    at the first day of period
+
+    :param history: list with typed columns in format of CSVParser.load_history_data()
+    :param period: 'week' or 'month', optional, if not set, history is returned as is
+    :return: list with typed columns in format of CSVParser.load_history_data()
+    """
+    if not period:
+        return history
+    if period not in ROLLUP_PERIODS:
+        raise ValueError(f"Unknown rollup period '{period}', expected one of {ROLLUP_PERIODS}, rollup aborted!")
+    if not len(history[0]):
+        return history
+    periods = _get_periods(np.asarray(history[0], dtype="datetime64[D]"), period)
+    last = _get_last_indices(periods)
+    return [periods[last], *(np.asarray(column)[last] for column in history[1:])]
+
+
+def compact_history(
+    history: List, raw_days=RAW_RETENTION_DAYS, daily_days=DAILY_RETENTION_DAYS, now: Optional[datetime] = None
+) -> List:
+    """
+    Applies retention policy to history: snapshots of last raw_days are kept as is, older ones are reduced to the last
+    snapshot of day, and snapshots older than daily_days are reduced to the last snapshot of week. Timestamps of kept
+    snapshots are not changed, so compaction may be repeated.
+
+    :param history: list with typed columns in format of CSVParser.load_history_data()
+    :param raw_days: number of days, when all snapshots are kept
+    :param daily_days: number of days, when daily snapshots are kept
+    :param now: current time, optional, by default is now
+    :return: list with typed columns in format of CSVParser.load_history_data()
+    """
+    if not len(history[0]):
+        return history
+    timestamps = np.asarray(history[0], dtype="datetime64[s]")
+    age = np.datetime64(now if now else datetime.now(), "s") - timestamps
+    periods = timestamps.copy()
+    daily = age >= np.timedelta64(raw_days, "D")
+    periods[daily] = timestamps[daily].astype("datetime64[D]")
+    weekly = age >= np.timedelta64(daily_days, "D")
+    periods[weekly] = _get_periods(timestamps[weekly], "week")
+    last = _get_last_indices(periods)
+    return [np.asarray(column)[last] for column in history]
+
+
+def _get_lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Selects points with Largest-Triangle-Three-Buckets algorithm
+
+    :param x: float array of x values, ascending
+    :param y: float array of shape (points, series), areas of triangles are summed over series
+    :param max_points: number of points to select, at least 3
+    :return: array of indices of selected points
+    """
+    edges = np.linspace(1, len(x) - 1, max_points - 1).astype(np.int64)
+    indices = np.zeros(max_points, dtype=np.int64)
+    indices[-1] = len(x) - 1
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        next_x, next_y = x[stop:next_stop].mean(), y[stop:next_stop].mean(axis=0)
+        prev_x, prev_y = x[indices[bucket]], y[indices[bucket]]
+        areas = np.abs(
+            (prev_x - next_x) * (y[start:stop] - prev_y) - (prev_x - x[start:stop, None]) * (next_y - prev_y)
+        ).sum(axis=1)
+        indices[bucket + 1] = start + int(np.argmax(areas))
+    return indices
+
+
+def _get_minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Selects first and last points plus minimum and maximum of every bucket
+
+    :param y: float array of shape (points, series), extremes are selected by the first series
+    :param max_points: maximum number of points to select, at least 4
+    :return: array of indices of selected points
+    """
+    edges = np.linspace(1, len(y) - 1, (max_points - 2) // 2 + 1).astype(np.int64)
+    selected = [0, len(y) - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            selected.extend((start + int(np.argmin(y[start:stop, 0])), start + int(np.argmax(y[start:stop, 0]))))
+    return np.unique(selected)
+
+
+def downsample_history(history: List, max_points: Optional[int] = None, method="lttb", columns=(1, 2)) -> List:
+    """
+    Reduces number of points of history to keep shape of series, so charts are drawn in constant time
+
+    :param history: list with typed columns in format of CSVParser.load_history_data()
+    :param max_points: target number of points, optional, if not set or history is shorter, it's returned as is
+    :param method: 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax' (extremes of buckets), string
+    :param columns: indices of columns, which shape is kept, by default total and automated
+    :return: list with typed columns in format of CSVParser.load_history_data()
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}', expected one of {DOWNSAMPLING_METHODS}, aborted!")
+    if not max_points or len(history[0]) <= max_points:
+        return history
+    if max_points < 4:
+        raise ValueError("At least 4 points are required for downsampling, downsampling aborted!")
+    x = np.asarray(history[0], dtype="datetime64[s]").astype(np.float64)
+    y = np.column_stack([np.asarray(history[column], dtype=np.float64) for column in columns])
+    indices = _get_lttb_indices(x, y, max_points) if method == "lttb" else _get_minmax_indices(y, max_points)
+    return [np.asarray(column)[indices] for column in history]
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+""" Storages of history data (distributions in CaseStat format) for TestRail API Reporter """
+
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import closing
+from datetime import date, datetime
+from glob import glob
+from os.path import basename, join, splitext
+from typing import List, Optional
+
+import numpy as np
+
+from .csv_parser import CSVParser
+from .history_sampling import compact_history, DAILY_RETENTION_DAYS, RAW_RETENTION_DAYS
+from .logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
+
+
+def get_series_name(pattern: str, name: str) -> str:
+    """
+    Returns name of history series, i.e. 'current_automation_Desktop_Chrome'
+
+    :param pattern: prefix of series, i.e. 'current_automation'
+    :param name: name of report (platform), i.e. 'Desktop Chrome'
+    :return: name of series, string
+    """
+    return f"{pattern}_{name.replace(' ', '_')}"
+
+
+def _get_date(value) -> Optional[str]:
+    """
+    Converts date to ISO format string
+
+    :param value: date, datetime or ISO string, optional
+    :return: string like '2022-09-01' or None
+    """
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10] if value else None
+
+
+class HistoryStore(ABC):
+    """Base class of history storages, history is kept as series of daily records of CaseStat reports"""
+
+    @abstractmethod
+    def save_many(self, reports: dict, timestamp=None):
+        """
+        Saves reports to history, only first report per series per day is kept
+
+        :param reports: dict like {series name: report in CaseStat format}
+        :param timestamp: date of reports, optional, by default is today
+        """
+
+    def save(self, series: str, report, timestamp=None):
+        """
+        Saves report to history, only first report per series per day is kept
+
+        :param series: name of series, string, i.e. 'current_automation_Desktop_Chrome'
+        :param report: report with distribution in CaseStat format
+        :param timestamp: date of report, optional, by default is today
+        """
+        self.save_many({series: report}, timestamp=timestamp)
+
+    @abstractmethod
+    def load(self, series: str, start=None, end=None) -> List:
+        """
+        Loads history of series within date window
+
+        :param series: name of series, string, i.e. 'current_automation_Desktop_Chrome'
+        :param start: first date of window (inclusive), date, datetime or ISO string, optional
+        :param end: last date of window (inclusive), date, datetime or ISO string, optional
+        :return: list with results in format of CSVParser.load_history_data()
+        """
+
+    @abstractmethod
+    def compact(self, series: str, raw_days=RAW_RETENTION_DAYS, daily_days=DAILY_RETENTION_DAYS, now=None) -> int:
+        """
+        Applies retention policy to history of series, see history_sampling.compact_history()
+
+        :param series: name of series, string, i.e. 'current_automation_Desktop_Chrome'
+        :param raw_days: number of days, when all snapshots are kept
+        :param daily_days: number of days, when daily snapshots are kept, older history is kept weekly
+        :param now: current time, datetime, optional, by default is now
+        :return: number of removed records
+        """
+
+
+class CSVHistoryStore(HistoryStore):
+    """History storage, which keeps every series in separate CSV file, i.e. 'current_automation_Desktop_Chrome.csv'"""
+
+    def __init__(self, path=None, intraday=False, logger=None, log_level=DEFAULT_LOGGING_LEVEL):
+        """
+        Default init
+
+        :param path: directory with CSV files, string, optional, by default is current working directory
+        :param intraday: if True, every report is saved with time of day, otherwise only first report per day is kept
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        self.__path = path
+        self.__intraday = intraday
+        self.__parser = CSVParser(logger=logger, log_level=log_level)
+
+    def get_filename(self, series: str) -> str:
+        """
+        Returns filename of CSV file of series
+
+        :param series: name of series, string
+        :return: filename, string
+        """
+        return join(self.__path, f"{series}.csv") if self.__path else f"{series}.csv"
+
+    def save_many(self, reports: dict, timestamp=None):
+        """
+        Appends reports to CSV files of series, only first report per series per day is kept, unless store is intraday
+
+        :param reports: dict like {series name: report in CaseStat format}
+        :param timestamp: not supported by CSV files, reports are always appended for now, so it must not be passed
+        """
+        if timestamp:
+            raise ValueError("Custom timestamp is not supported by CSV history store, save history data aborted!")
+        for series, report in reports.items():
+            self.__parser.save_history_data(filename=self.get_filename(series), report=report, intraday=self.__intraday)
+
+    def load(self, series: str, start=None, end=None) -> List:
+        """
+        Loads history of series from CSV file, whole file is parsed and filtered by date window
+
+        :param series: name of series, string, i.e. 'current_automation_Desktop_Chrome'
+        :param start: first date of window (inclusive), date, datetime or ISO string, optional
+        :param end: last date of window (inclusive), date, datetime or ISO string, optional
+        :return: list with results in format of CSVParser.load_history_data()
+        """
+        history = self.__parser.load_history_data(filename=self.get_filename(series))
+        dates = history[0].astype("datetime64[D]")
+        mask = np.ones(len(dates), dtype=bool)
+        if start:
+            mask &= dates >= np.datetime64(_get_date(start))
+        if end:
+            mask &= dates <= np.datetime64(_get_date(end))
+        return [column[mask] for column in history]
+
+    def compact(self, series: str, raw_days=RAW_RETENTION_DAYS, daily_days=DAILY_RETENTION_DAYS, now=None) -> int:
+        """
+        Applies retention policy to CSV file of series, file is replaced atomically
+
+        :param series: name of series, string, i.e. 'current_automation_Desktop_Chrome'
+        :param raw_days: number of days, when all snapshots are kept
+        :param daily_days: number of days, when daily snapshots are kept, older history is kept weekly
+        :param now: current time, datetime, optional, by default is now
+        :return: number of removed records
+        """
+        return self.__parser.compact_history_data(
+            filename=self.get_filename(series), raw_days=raw_days, daily_days=daily_days, now=now
+        )
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """History storage in SQLite database, records are indexed by series and date"""
+
+    def __init__(self, filename="history.db", logger=None, log_level=DEFAULT_LOGGING_LEVEL):
+        """
+        Default init
+
+        :param filename: filename (maybe with path) of SQLite database, string
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        if not logger:
+            self.___logger = setup_logger(name="HistoryStore", log_file="HistoryStore.log", level=log_level)
+        else:
+            self.___logger = logger
+        self.___logger.debug("Initializing SQLite History Store")
+        if not filename:
+            raise ValueError("Filename for history database is not provided, history store can't be initialized!")
+        self.__filename = filename
+        with closing(self.__connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "series TEXT NOT NULL, date TEXT NOT NULL, total INTEGER NOT NULL, automated INTEGER NOT NULL, "
+                "not_automated INTEGER NOT NULL, not_applicable INTEGER NOT NULL, PRIMARY KEY (series, date))"
+            )
+
+    def __connect(self):
+        """
+        Opens connection to history database
+
+        :return: connection object
+        """
+        return sqlite3.connect(self.__filename, timeout=30)
+
+    def __insert(self, rows: list) -> int:
+        """
+        Inserts rows in one transaction, existing records for the same series and date are kept
+
+        :param rows: list of tuples (series, date, total, automated, not_automated, not_applicable)
+        :return: number of inserted rows
+        """
+        with closing(self.__connect()) as connection, connection:
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO history VALUES (?, ?, ?, ?, ?, ?)", rows)
+            return connection.total_changes - before
+
+    def save_many(self, reports: dict, timestamp=None):
+        """
+        Saves reports to history in one transaction, only first report per series per day is kept
+
+        :param reports: dict like {series name: report in CaseStat format}
+        :param timestamp: date of reports, optional, by default is today
+        """
+        day = _get_date(timestamp if timestamp else datetime.today())
+        rows = [
+            (
+                series,
+                day,
+                report.get_total(),
+                report.get_automated(),
+                report.get_not_automated(),
+                report.get_not_applicable(),
+            )
+            for series, report in reports.items()
+        ]
+        inserted = self.__insert(rows)
+        self.___logger.debug("Saved %s of %s reports to history for %s", inserted, len(rows), day)
+
+    def load(self, series: str, start=None, end=None) -> List:
+        """
+        Loads history of series within date window, only records of window are read from database
+
+        :param series: name of series, string, i.e. 'current_automation_Desktop_Chrome'
+        :param start: first date of window (inclusive), date, datetime or ISO string, optional
+        :param end: last date of window (inclusive), date, datetime or ISO string, optional
+        :return: list with results in format of CSVParser.load_history_data()
+        """
+        query = "SELECT date, total, automated, not_automated, not_applicable FROM history WHERE series = ?"
+        params: list = [series]
+        if start:
+            query += " AND date >= ?"
+            params.append(_get_date(start))
+        if end:
+            query += " AND date <= ?"
+            params.append(_get_date(end))
+        with closing(self.__connect()) as connection:
+            rows = connection.execute(f"{query} ORDER BY date", params).fetchall()
+        if not rows and not start and not end:
+            raise ValueError(f"No history is found for '{series}', load history data aborted!")
+        counts = np.array([row[1:] for row in rows], dtype=np.int64).reshape(-1, 4)
+        return [np.array([row[0] for row in rows], dtype="datetime64[D]"), *counts.T]
+
+    def compact(self, series: str, raw_days=RAW_RETENTION_DAYS, daily_days=DAILY_RETENTION_DAYS, now=None) -> int:
+        """
+        Applies retention policy to history of series, database keeps one record per day, so only history older than
+        daily_days is reduced to weekly records
+
+        :param series: name of series, string, i.e. 'current_automation_Desktop_Chrome'
+        :param raw_days: number of days, when all snapshots are kept
+        :param daily_days: number of days, when daily snapshots are kept, older history is kept weekly
+        :param now: current time, datetime, optional, by default is now
+        :return: number of removed records
+        """
+        try:
+            history = self.load(series)
+        except ValueError:
+            return 0
+        kept = compact_history(history, raw_days=raw_days, daily_days=daily_days, now=now)[0]
+        dates = [(series, str(day)) for day in history[0][~np.isin(history[0], kept)]]
+        with closing(self.__connect()) as connection, connection:
+            connection.executemany("DELETE FROM history WHERE series = ? AND date = ?", dates)
+        self.___logger.debug("Compacted history of '%s', removed %s records", series, len(dates))
+        return len(dates)
+
+    def import_csv(self, pattern="*.csv") -> int:
+        """
+        One-shot import of history from CSV files, series is named by filename, i.e. 'current_automation_UI.csv'
+        is imported as 'current_automation_UI'. Already stored records are kept.
+
+        :param pattern: glob pattern of CSV files or list of filenames
+        :return: number of imported records
+        """
+        filenames = pattern if isinstance(pattern, (list, tuple)) else sorted(glob(pattern))
+        parser = CSVParser(logger=self.___logger)
+        rows: list = []
+        for filename in filenames:
+            series = splitext(basename(filename))[0]
+            history = parser.load_history_data(filename=filename)
+            # database keeps one record per day, so the first snapshot of day is imported from intraday history
+            days = history[0].astype("datetime64[D]")
+            rows.extend((series, str(day), *map(int, counts)) for day, *counts in zip(days, *history[1:]))
+        inserted = self.__insert(rows)
+        self.___logger.debug("Imported %s records of %s CSV files to history", inserted, len(filenames))
+        return inserted
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+""" Streaming JUnit XML parser for TestRail API Reporter """
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from logging import getLogger
+from typing import Iterable, Iterator, List, Optional, Union
+from xml.etree.ElementTree import XMLParser  # nosec
+
+from .logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
+
+PASSED_STATUS = 1
+FAILED_STATUS = 5
+SKIPPED_STATUS = 7
+STATUS_PRECEDENCE = {FAILED_STATUS: 2, SKIPPED_STATUS: 1, PASSED_STATUS: 0}  # for duplicated results the worst wins
+
+
+class _JUnitTarget:
+    """Parser target, converts SAX-like events of JUnit XML to compact result records"""
+
+    def __init__(self, include_output=False):
+        """
+        Default init
+
+        :param include_output: keep or not bodies of system-out/system-err, bool, by default is False
+        """
+        self.records: deque = deque()
+        self.timestamp: Optional[str] = None
+        self.__include_output = include_output
+        self.__case: Optional[dict] = None
+        self.__message = ""
+        self.__capture: Optional[list] = None
+
+    def start(self, tag, attrib):
+        """
+        Element opened
+
+        :param tag: element tag
+        :param attrib: dict with element attributes
+        """
+        if tag == "testsuite":
+            if self.timestamp is None and attrib.get("timestamp"):
+                self.timestamp = attrib["timestamp"].split(".")[0]
+        elif tag == "testcase":
+            self.__case = {
+                "automation_id": f'{attrib.get("classname", "")}.{attrib.get("name", "")}',
+                "time": attrib.get("time", "0"),
+                "status": PASSED_STATUS,
+                "comment": "",
+            }
+        elif self.__case is not None:
+            if tag == "failure":
+                self.__case["status"] = FAILED_STATUS
+                self.__message = attrib.get("message", "")
+                self.__capture = []
+            elif tag == "skipped":
+                self.__case["status"] = FAILED_STATUS if attrib.get("type") == "pytest.xfail" else SKIPPED_STATUS
+            elif tag in ("system-out", "system-err") and self.__include_output:
+                self.__capture = []
+
+    def data(self, data):
+        """
+        Text chunk received, stored only when element body is requested
+
+        :param data: text chunk
+        """
+        if self.__capture is not None:
+            self.__capture.append(data)
+
+    def end(self, tag):
+        """
+        Element closed
+
+        :param tag: element tag
+        """
+        if self.__case is None:
+            return
+        if tag == "testcase":
+            self.records.append(self.__case)
+            self.__case = None
+        elif self.__capture is not None:
+            if tag == "failure":
+                self.__case["comment"] = f'{self.__message} : {"".join(self.__capture)}'
+            elif tag in ("system-out", "system-err"):
+                self.__case[tag.replace("-", "_")] = "".join(self.__capture)
+            self.__capture = None
+
+    def close(self):
+        """Parsing finished"""
+        return None
+
+
+class JUnitParser:
+    """Incremental parser for JUnit XML reports, memory usage doesn't depend on report size"""
+
+    def __init__(
+        self, filename=None, include_output=False, chunk_size=65536, logger=None, log_level=DEFAULT_LOGGING_LEVEL
+    ):
+        """
+        Default init
+
+        :param filename: filename (maybe with path) of xml test report
+        :param include_output: keep or not bodies of system-out/system-err in records, bool, by default is False
+        :param chunk_size: size of chunk (in bytes) read from file at once, integer
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        if not logger:
+            self.___logger = setup_logger(name="JUnitParser", log_file="JUnitParser.log", level=log_level)
+        else:
+            self.___logger = logger
+        self.___logger.debug("Initializing JUnit Parser")
+        self.__filename = filename
+        self.__include_output = include_output
+        self.__chunk_size = chunk_size
+        self.__timestamp = None
+
+    def iter_results(self, filename=None) -> Iterator[dict]:
+        """
+        Yields result records one testcase at a time
+
+        :param filename: filename (maybe with path) of xml test report, optional
+        :return: generator of dicts like {'automation_id': 'path.to.test_file.TestClass.test_name',
+                                          'time': '0.42', 'status': 1, 'comment': ''}
+        """
+        filename = filename if filename else self.__filename
+        if not filename:
+            raise ValueError("Filename for JUnit report is not provided, parsing aborted!")
+        target = _JUnitTarget(include_output=self.__include_output)
+        parser = XMLParser(target=target)  # nosec
+        counter = 0
+        with open(filename, "rb") as file:
+            while True:
+                chunk = file.read(self.__chunk_size)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                self.__timestamp = target.timestamp
+                while target.records:
+                    counter += 1
+                    yield target.records.popleft()
+        parser.close()
+        self.__timestamp = target.timestamp
+        while target.records:
+            counter += 1
+            yield target.records.popleft()
+        self.___logger.debug("Found test run at %s, found %s test results", self.__timestamp, counter)
+
+    def get_timestamp(self) -> Optional[str]:
+        """
+        Returns timestamp of the first test suite of the last parsed report
+
+        :return: timestamp, string, like '2022-09-01T20:25:51'
+        """
+        return self.__timestamp
+
+
+def get_report_files(xml_report: Union[str, Iterable[str], None]) -> List[str]:
+    """
+    Service function to get list of JUnit report files
+
+    :param xml_report: filename, glob pattern (i.e. 'reports/junit-*.xml') or list of filenames
+    :return: list of filenames
+    """
+    if not xml_report:
+        return []
+    if isinstance(xml_report, str):
+        return sorted(glob(xml_report)) if any(char in xml_report for char in "*?[") else [xml_report]
+    return list(xml_report)
+
+
+def _parse_report(filename: str, include_output: bool = False) -> tuple:
+    """
+    Parses single report, used by worker processes
+
+    :param filename: filename (maybe with path) of xml test report
+    :param include_output: keep or not bodies of system-out/system-err in records, bool
+    :return: tuple (list of result records, timestamp)
+    """
+    parser = JUnitParser(filename=filename, include_output=include_output, logger=getLogger(__name__))
+    return list(parser.iter_results()), parser.get_timestamp()
+
+
+def merge_results(results: Iterable[Iterable[dict]]) -> List[dict]:
+    """
+    Merges result records of several reports, records with the same automation_id are deduplicated,
+    failed result wins over skipped and skipped wins over passed
+
+    :param results: iterable with lists of result records
+    :return: list of result records
+    """
+    merged: dict = {}
+    for records in results:
+        for record in records:
+            existing = merged.get(record["automation_id"])
+            if existing is None or STATUS_PRECEDENCE.get(record["status"], 0) > STATUS_PRECEDENCE.get(
+                existing["status"], 0
+            ):
+                merged[record["automation_id"]] = record
+    return list(merged.values())
+
+
+def parse_reports(filenames: List[str], include_output: bool = False, max_workers: Optional[int] = None) -> tuple:
+    """
+    Parses several reports in parallel processes and merges results
+
+    :param filenames: list of filenames (maybe with path) of xml test reports
+    :param include_output: keep or not bodies of system-out/system-err in records, bool
+    :param max_workers: number of processes, integer, optional, by default is number of CPUs
+    :return: tuple (list of merged result records, the earliest timestamp of reports)
+    """
+    if len(filenames) == 1:
+        parsed = [_parse_report(filenames[0], include_output)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = list(executor.map(_parse_report, filenames, [include_output] * len(filenames)))
+    timestamps = [timestamp for _, timestamp in parsed if timestamp]
+    return merge_results(records for records, _ in parsed), min(timestamps) if timestamps else None
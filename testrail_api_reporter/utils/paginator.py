@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+""" Pagination engine for bulk TestRail API endpoints """
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import Logger
+from typing import Callable, Iterator, Optional
+
+DEFAULT_PAGE_WORKERS = 4
+
+
+def iter_pages(
+    fetch: Callable[[int], dict],
+    key: str,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    logger: Optional[Logger] = None,
+) -> Iterator[list]:
+    """
+    Yields pages of paginated TestRail response in order. Page size is taken from the first response, then
+    following offsets are requested concurrently until short (or last) page is received.
+
+    :param fetch: function, which accepts offset and returns TestRail response (dict with '_links' and key)
+    :param key: key of response with items, i.e. 'cases', 'sections', 'runs'
+    :param max_workers: number of concurrent requests, integer
+    :param logger: logger object, optional
+    :return: generator of lists with items
+    """
+    response = fetch(0)
+    page = response[key]
+    yield page
+    limit = response.get("limit") or len(page)
+    if response["_links"]["next"] is None or not limit or len(page) < limit:
+        return
+    offset = response.get("offset", 0) + limit
+    if logger:
+        logger.debug("Page size is %s, prefetching next pages with %s workers", limit, max_workers)
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        pending: deque = deque()
+        for _ in range(max(max_workers, 1)):
+            pending.append(executor.submit(fetch, offset))
+            offset += limit
+        try:
+            while pending:
+                response = pending.popleft().result()
+                page = response[key]
+                if page:
+                    yield page
+                if response["_links"]["next"] is None or len(page) < limit:
+                    break
+                pending.append(executor.submit(fetch, offset))
+                offset += limit
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def get_all_pages(
+    fetch: Callable[[int], dict],
+    key: str,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    logger: Optional[Logger] = None,
+) -> list:
+    """
+    Collects all items of paginated TestRail response
+
+    :param fetch: function, which accepts offset and returns TestRail response (dict with '_links' and key)
+    :param key: key of response with items, i.e. 'cases', 'sections', 'runs'
+    :param max_workers: number of concurrent requests, integer
+    :param logger: logger object, optional
+    :return: list with all items
+    """
+    items: list = []
+    for page in iter_pages(fetch, key, max_workers=max_workers, logger=logger):
+        items.extend(page)
+    return items
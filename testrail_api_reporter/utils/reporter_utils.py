@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 """ This module contains service functions for reporter """
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from os import popen
-from typing import Optional, Any, Union
+from typing import Callable, Iterable, Optional, Any, Union
 
 import requests
 
@@ -120,3 +121,24 @@ def init_get_cases_process() -> tuple:
     response = None
     retry = 0
     return cases_list, first_run, criteria, response, retry
+
+
+def run_concurrently(func: Callable, items: Iterable, max_workers: int = 4) -> tuple:
+    """
+    Service function to call function for every item with bounded concurrency, errors are collected per item
+
+    :param func: function, which accepts single item
+    :param items: iterable with hashable items
+    :param max_workers: number of concurrent calls, integer
+    :return: tuple of dicts (results, errors), where results = {item: result}, errors = {item: exception}
+    """
+    results: dict = {}
+    errors: dict = {}
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futures = {item: executor.submit(func, item) for item in items}
+        for item, future in futures.items():
+            try:
+                results[item] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                errors[item] = error
+    return results, errors
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+""" Rate-limit-aware request scheduler for TestRail API """
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import Optional
+
+import requests
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from testrail_api import TestRailAPI  # type: ignore
+
+from .logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
+
+THROTTLING_STATUSES = (429, 503)  # request wasn't processed by server, safe to repeat any method
+TRANSIENT_STATUSES = (500, 502, 504)  # request may be processed by server, safe to repeat idempotent methods only
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RequestScheduler:
+    """Token bucket limiter with exponential backoff and jitter, shared by all requests to TestRail"""
+
+    def __init__(
+        self,
+        rate=5.0,
+        burst=10,
+        retries=5,
+        backoff_base=1.0,
+        backoff_max=60.0,
+        logger=None,
+        log_level=DEFAULT_LOGGING_LEVEL,
+    ):
+        """
+        Default init
+
+        :param rate: sustained number of requests per second, float, if 0 or None, requests are not limited
+        :param burst: max number of requests sent at once after idle, integer
+        :param retries: number of retries of throttled or failed request, integer
+        :param backoff_base: base delay of exponential backoff in seconds, float
+        :param backoff_max: max delay of exponential backoff in seconds, float
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        if not logger:
+            self.___logger = setup_logger(name="RequestScheduler", log_file="RequestScheduler.log", level=log_level)
+        else:
+            self.___logger = logger
+        self.___logger.debug("Initializing Request Scheduler")
+        self.__rate = rate
+        self.__burst = max(burst, 1)
+        self.__tokens = float(self.__burst)
+        self.__updated = time.monotonic()
+        self.__resume_at = 0.0
+        self.__lock = Lock()
+        self.retries = retries
+        self.__backoff_base = backoff_base
+        self.__backoff_max = backoff_max
+
+    def acquire(self):
+        """Blocks until request is allowed by rate limit and server throttling"""
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                if now < self.__resume_at:
+                    wait = self.__resume_at - now
+                elif not self.__rate:
+                    return
+                else:
+                    self.__tokens = min(self.__burst, self.__tokens + (now - self.__updated) * self.__rate)
+                    self.__updated = now
+                    if self.__tokens >= 1:
+                        self.__tokens -= 1
+                        return
+                    wait = (1 - self.__tokens) / self.__rate
+            time.sleep(wait)
+
+    def pause(self, delay: float):
+        """
+        Pauses all requests, i.e. when server asked to retry after some time
+
+        :param delay: delay in seconds, float
+        """
+        with self.__lock:
+            self.__resume_at = max(self.__resume_at, time.monotonic() + delay)
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Returns delay before next attempt
+
+        :param attempt: number of failed attempt, starting from 0, integer
+        :param retry_after: value of Retry-After header (seconds or HTTP date), string, optional
+        :return: delay in seconds, float
+        """
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                try:
+                    return max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(self.__backoff_max, self.__backoff_base * 2**attempt))  # nosec
+
+
+class ScheduledSession(requests.Session):
+    """Requests session, which sends every request through RequestScheduler"""
+
+    def __init__(self, scheduler: RequestScheduler):
+        """
+        Default init
+
+        :param scheduler: RequestScheduler object
+        """
+        super().__init__()
+        self.__scheduler = scheduler
+
+    def request(self, method, url, *args, **kwargs):  # pylint: disable=arguments-differ
+        """
+        Sends request when scheduler allows it, retries throttled and failed requests
+
+        :param method: HTTP method, string
+        :param url: url, string
+        :return: response object
+        """
+        idempotent = str(method).upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self.__scheduler.acquire()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (Timeout, RequestsConnectionError):
+                if not idempotent or attempt >= self.__scheduler.retries:
+                    raise
+                time.sleep(self.__scheduler.get_delay(attempt))
+                attempt += 1
+                continue
+            retriable = response.status_code in THROTTLING_STATUSES or (
+                idempotent and response.status_code in TRANSIENT_STATUSES
+            )
+            if not retriable or attempt >= self.__scheduler.retries:
+                return response
+            delay = self.__scheduler.get_delay(attempt, retry_after=response.headers.get("Retry-After"))
+            if response.status_code in THROTTLING_STATUSES:
+                self.__scheduler.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+
+def create_api(url: str, email: str, password: str, scheduler: Optional[RequestScheduler] = None, **kwargs):
+    """
+    Creates TestRailAPI object, which sends all requests through request scheduler
+
+    :param url: url of TestRail, string, required
+    :param email: email of TestRail user with proper access rights, string, required
+    :param password: password of TestRail user with proper access rights, string, required
+    :param scheduler: RequestScheduler object, optional, may be shared between several reporters
+    :return: TestRailAPI object
+    """
+    scheduler = scheduler if scheduler else RequestScheduler()
+    return TestRailAPI(url, email, password, session=ScheduledSession(scheduler), rate_limit=False, **kwargs)
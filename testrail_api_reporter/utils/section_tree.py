@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+""" Index of sections tree of TestRail project/suite """
+
+import time
+from collections import defaultdict
+from threading import Lock, RLock
+from typing import Callable, Iterable, Optional
+
+SECTION_TREE_TTL = 600
+
+_trees: dict = {}  # (url, project_id, suite_id) -> (built at, SectionTree), see get_section_tree()
+_trees_lock = Lock()
+
+
+class SectionTree:
+    """
+    Parent -> children map of sections with depths and descendants, independent of order of sections.
+    Tree is shared by reporters and threads, so it's locked while sections are added or traversed.
+    """
+
+    def __init__(self, sections: Iterable[dict]):
+        """
+        Default init
+
+        :param sections: list of dicts with sections, obtained from TestRails
+        """
+        self.__sections: dict = {}
+        self.__children: dict = defaultdict(list)
+        self.__depths: dict = {}
+        self.__descendants: dict = {}
+        self.__lock = RLock()
+        for section in sections:
+            self.__sections[section["id"]] = section
+            self.__children[section.get("parent_id")].append(section["id"])
+        roots = [section_id for section_id, item in self.__sections.items() if item.get("parent_id") not in self]
+        for root in roots:
+            self.__set_depths(root, 0)
+
+    def __contains__(self, section_id) -> bool:
+        return section_id in self.__sections
+
+    def __len__(self) -> int:
+        return len(self.__sections)
+
+    def __set_depths(self, section_id: int, depth: int):
+        """
+        Sets depth of section and all its descendants
+
+        :param section_id: section id, integer
+        :param depth: depth of section, integer
+        """
+        stack = [(section_id, depth)]
+        while stack:
+            section_id, depth = stack.pop()
+            self.__depths[section_id] = depth
+            stack.extend((child, depth + 1) for child in self.__children.get(section_id, []))
+
+    def add(self, section: dict):
+        """
+        Adds section to tree, i.e. when section is created after tree is built
+
+        :param section: dict with section, must contain 'id' and may contain 'parent_id'
+        """
+        parent_id = section.get("parent_id")
+        with self.__lock:
+            self.__sections[section["id"]] = section
+            self.__children[parent_id].append(section["id"])
+            self.__set_depths(section["id"], self.__depths[parent_id] + 1 if parent_id in self else 0)
+            self.__descendants.clear()
+
+    def get_section(self, section_id: int) -> Optional[dict]:
+        """
+        Returns section by id
+
+        :param section_id: section id, integer
+        :return: dict with section or None
+        """
+        return self.__sections.get(section_id)
+
+    def get_children(self, section_id: Optional[int]) -> list:
+        """
+        Returns ids of direct children of section
+
+        :param section_id: section id, integer, None for top level sections
+        :return: list of section ids
+        """
+        with self.__lock:
+            return list(self.__children.get(section_id, []))
+
+    def get_depth(self, section_id: int) -> Optional[int]:
+        """
+        Returns depth of section, top level sections have depth 0
+
+        :param section_id: section id, integer
+        :return: depth, integer, or None for unknown section
+        """
+        return self.__depths.get(section_id)
+
+    def get_descendants(self, section_id: int) -> frozenset:
+        """
+        Returns ids of section and all its nested sections
+
+        :param section_id: section id, integer
+        :return: frozenset of section ids
+        """
+        with self.__lock:
+            if section_id not in self.__descendants:
+                descendants = set()
+                stack = [section_id]
+                while stack:
+                    current = stack.pop()
+                    if current not in descendants:
+                        descendants.add(current)
+                        stack.extend(self.__children.get(current, []))
+                self.__descendants[section_id] = frozenset(descendants)
+            return self.__descendants[section_id]
+
+    def get_subtree(self, section_ids: Iterable[int]) -> set:
+        """
+        Returns ids of given sections and all their nested sections
+
+        :param section_ids: list of section ids, i.e. top sections of platform
+        :return: set of section ids
+        """
+        subtree: set = set()
+        with self.__lock:
+            for section_id in section_ids:
+                subtree.update(self.get_descendants(section_id))
+        return subtree
+
+    def find(self, name: str) -> Optional[int]:
+        """
+        Returns id of section with given name, the closest to top level is preferred
+
+        :param name: name of section, string
+        :return: section id, integer, or None if not found
+        """
+        with self.__lock:
+            found = [section_id for section_id, item in self.__sections.items() if item.get("name") == name]
+        return min(found, key=lambda section_id: self.__depths.get(section_id, 0)) if found else None
+
+
+def get_section_tree(key: tuple, fetch_sections: Callable[[], list], ttl=SECTION_TREE_TTL) -> SectionTree:
+    """
+    Returns section tree of project/suite, tree is built once and shared by all reporters during ttl
+
+    :param key: unique key of project/suite, i.e. (url, project_id, suite_id)
+    :param fetch_sections: function, which returns list of all sections of project/suite
+    :param ttl: time in seconds, during which tree is reused, if 0 or None, tree is always rebuilt
+    :return: SectionTree object
+    """
+    with _trees_lock:
+        cached = _trees.get(key)
+    if cached and ttl and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    tree = SectionTree(fetch_sections())
+    with _trees_lock:
+        _trees[key] = (time.monotonic(), tree)
+    return tree
+
+
+def drop_section_tree(key: tuple):
+    """
+    Drops cached section tree of project/suite
+
+    :param key: unique key of project/suite, i.e. (url, project_id, suite_id)
+    """
+    with _trees_lock:
+        _trees.pop(key, None)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+""" Checkpoint of chunked results upload for TestRail API Reporter """
+
+import hashlib
+import json
+from os import replace
+from os.path import exists
+from threading import Lock
+from typing import Optional
+
+from .logger_config import setup_logger, DEFAULT_LOGGING_LEVEL
+
+
+class UploadCheckpoint:
+    """Local JSON file, which stores test run and uploaded chunks of results per test run title"""
+
+    def __init__(self, filename="testrail_upload_checkpoint.json", logger=None, log_level=DEFAULT_LOGGING_LEVEL):
+        """
+        Default init
+
+        :param filename: filename (maybe with path) of checkpoint file, string
+        :param logger: logger object, optional
+        :param log_level: logging level, optional, by default is logging.DEBUG
+        """
+        if not logger:
+            self.___logger = setup_logger(name="UploadCheckpoint", log_file="UploadCheckpoint.log", level=log_level)
+        else:
+            self.___logger = logger
+        self.___logger.debug("Initializing Upload Checkpoint")
+        if not filename:
+            raise ValueError("Filename for upload checkpoint is not provided, checkpoint can't be initialized!")
+        self.__filename = filename
+        self.__lock = Lock()
+        self.__data: dict = {}
+        if exists(filename):
+            with open(filename, "r", encoding="utf-8") as file:
+                self.__data = json.load(file)
+
+    @staticmethod
+    def get_chunk_key(chunk: list) -> str:
+        """
+        Returns unique key of chunk of results
+
+        :param chunk: list of dicts with results
+        :return: key, string
+        """
+        return hashlib.sha256(json.dumps(chunk, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def __save(self):
+        """Writes checkpoint to file atomically"""
+        temp_filename = f"{self.__filename}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as file:
+            json.dump(self.__data, file)
+        replace(temp_filename, self.__filename)
+
+    def get_run_id(self, title: str) -> Optional[int]:
+        """
+        Returns id of test run, which upload was started for given title
+
+        :param title: title of test run, string
+        :return: run id, integer, or None if no upload was started
+        """
+        return self.__data.get(title, {}).get("run_id")
+
+    def start(self, title: str, run_id: int):
+        """
+        Starts (or resumes) upload of results to test run
+
+        :param title: title of test run, string
+        :param run_id: run id, integer
+        """
+        with self.__lock:
+            if self.get_run_id(title) != run_id:
+                self.__data[title] = {"run_id": run_id, "chunks": []}
+                self.__save()
+
+    def is_done(self, title: str, chunk_key: str) -> bool:
+        """
+        Checks that chunk of results is already uploaded
+
+        :param title: title of test run, string
+        :param chunk_key: key of chunk, string
+        :return: True or False
+        """
+        return chunk_key in self.__data.get(title, {}).get("chunks", [])
+
+    def mark_done(self, title: str, chunk_key: str):
+        """
+        Stores that chunk of results is uploaded
+
+        :param title: title of test run, string
+        :param chunk_key: key of chunk, string
+        """
+        with self.__lock:
+            self.__data.setdefault(title, {"run_id": None, "chunks": []})["chunks"].append(chunk_key)
+            self.__save()
+
+    def finish(self, title: str):
+        """
+        Removes checkpoint of completed upload
+
+        :param title: title of test run, string
+        """
+        with self.__lock:
+            if self.__data.pop(title, None) is not None:
+                self.__save()
+        self.___logger.debug("Upload of results to test run '%s' is completed", title)
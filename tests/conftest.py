@@ -8,9 +8,14 @@ import pytest
 from faker import Faker
 from PIL import Image, ImageChops
 
+from testrail_api_reporter.engines import (  # pylint: disable=import-error,no-name-in-module
+    at_coverage_reporter,
+    results_reporter,
+)
 from testrail_api_reporter.engines.plotly_reporter import (  # pylint: disable=import-error,no-name-in-module
     PlotlyReporter,
 )
+from testrail_api_reporter.utils import section_tree  # pylint: disable=import-error,no-name-in-module
 from testrail_api_reporter.utils.case_stat import CaseStat  # pylint: disable=import-error,no-name-in-module
 
 
@@ -177,3 +182,14 @@ def random_rgb():
         return f"rgb({randint(0, 255)},{randint(0, 255)},{randint(0, 255)})"
 
     return get_rgb
+
+
+@pytest.fixture
+def reporter_caches(monkeypatch):
+    """
+    Fixture to isolate caches shared by reporters (validations, section trees and priorities), so every test starts
+    with empty caches
+    """
+    monkeypatch.setattr(results_reporter, "_validation_cache", {})
+    monkeypatch.setattr(section_tree, "_trees", {})
+    monkeypatch.setattr(at_coverage_reporter, "_priorities_cache", {})
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""Tests for at_coverage_reporter module, the ATCoverageReporter class"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from testrail_api import StatusCodeError
+
+from testrail_api_reporter.engines.at_coverage_reporter import (  # pylint: disable=import-error,no-name-in-module
+    ATCoverageReporter,
+)
+from testrail_api_reporter.utils.case_snapshot import (  # pylint: disable=import-error,no-name-in-module
+    SNAPSHOT_TIME_SKEW,
+)
+
+FAILING_PROJECT = 3
+SECTIONS = [{"id": 1, "parent_id": None}, {"id": 2, "parent_id": 1}, {"id": 3, "parent_id": None}]
+# UI platform is sections 1 and 2: automated and not automated critical cases, and automated low priority case,
+# API platform is section 3: not applicable critical case
+CASES = [
+    {"id": 1, "section_id": 2, "priority_id": 4, "type_id": 3, "updated_on": 0},
+    {"id": 2, "section_id": 1, "priority_id": 4, "type_id": 1, "updated_on": 0},
+    {"id": 3, "section_id": 3, "priority_id": 4, "type_id": 4, "updated_on": 0},
+    {"id": 4, "section_id": 2, "priority_id": 1, "type_id": 3, "updated_on": 0},
+]
+PRIORITIES = [{"id": 4, "name": "Critical", "priority": 4}, {"id": 1, "name": "Low", "priority": 1}]
+AUTOMATION = {"internal_name": "type_id", "auto_code": 3, "na_code": 4}
+AUTOMATION_PLATFORMS = [{"name": "UI", "sections": [1], **AUTOMATION}, {"name": "API", "sections": [3], **AUTOMATION}]
+TYPE_PLATFORMS = [{"name": "UI", "sections": [1]}, {"name": "API", "sections": [3]}]
+
+
+def get_page(key, items):
+    """
+    Returns single-page TestRail response
+
+    :param key: key of items, i.e. 'cases'
+    :param items: list of items
+    :return: dict with response
+    """
+    return {"offset": 0, "limit": 250, "size": len(items), "_links": {"next": None}, key: items}
+
+
+class FakeTestRailAPI:  # pylint: disable=too-few-public-methods
+    """Replacement of TestRailAPI, keeps sections, cases and priorities in memory"""
+
+    def __init__(self):
+        self.case_list = [dict(case) for case in CASES]
+        self.case_requests = []  # updated_after filters of get_cases requests
+        self.priority_requests = 0
+        self.sections = SimpleNamespace(get_sections=lambda **kwargs: get_page("sections", SECTIONS))
+        self.cases = SimpleNamespace(get_cases=self.__get_cases)
+        self.priorities = SimpleNamespace(get_priorities=self.__get_priorities)
+
+    def __get_cases(self, project_id, updated_after=None, **kwargs):  # pylint: disable=unused-argument
+        """
+        Returns cases updated after given time, the same cases are returned for every project, except failing one
+
+        :param project_id: project id, integer
+        :param updated_after: unix timestamp, optional
+        :return: dict with response
+        """
+        if project_id == FAILING_PROJECT:
+            raise StatusCodeError(403, "Forbidden", "", b"")
+        self.case_requests.append(updated_after)
+        return get_page(
+            "cases", [case for case in self.case_list if updated_after is None or case["updated_on"] > updated_after]
+        )
+
+    def __get_priorities(self):
+        """
+        Returns priorities in order of server
+
+        :return: list of dicts with priorities
+        """
+        self.priority_requests += 1
+        return PRIORITIES
+
+
+@pytest.fixture
+def api(reporter_caches):  # pylint: disable=unused-argument
+    """
+    Fixture to create fake TestRail API
+
+    :return: FakeTestRailAPI object
+    :rtype: FakeTestRailAPI
+    """
+    return FakeTestRailAPI()
+
+
+def get_reporter(api, url="https://testrail.local"):  # pylint: disable=redefined-outer-name
+    """
+    Returns ATCoverageReporter with fake TestRail API and history store, saved reports are kept in history_store.saved
+
+    :param api: FakeTestRailAPI object
+    :param url: url of TestRail, string
+    :return: ATCoverageReporter object
+    """
+    history_store = SimpleNamespace(saved={})
+    history_store.save_many = history_store.saved.update
+    return ATCoverageReporter(
+        url=url,
+        email=None,
+        password=None,
+        project=1,
+        priority=4,
+        automation_platforms=AUTOMATION_PLATFORMS,
+        api=api,
+        history_store=history_store,
+    )
+
+
+@pytest.fixture
+def reporter(api):  # pylint: disable=redefined-outer-name
+    """
+    Fixture to create ATCoverageReporter with fake TestRail API and history store
+
+    :return: ATCoverageReporter object
+    :rtype: ATCoverageReporter
+    """
+    return get_reporter(api)
+
+
+def get_saved(reporter):  # pylint: disable=redefined-outer-name
+    """
+    Returns names of series of history, saved by reporter
+
+    :param reporter: ATCoverageReporter object
+    :return: sorted list of names
+    """
+    return sorted(reporter._ATCoverageReporter__history_store.saved)  # pylint: disable=protected-access
+
+
+def get_stats(results):
+    """
+    Returns values of CaseStat objects by names
+
+    :param results: list of CaseStat objects
+    :return: dict like {name: (total, automated, not automated, not applicable)}
+    """
+    return {
+        item.get_name(): (item.get_total(), item.get_automated(), item.get_not_automated(), item.get_not_applicable())
+        for item in results
+    }
+
+
+def test_automation_state_fan_out(reporter):  # pylint: disable=redefined-outer-name
+    """Reports of all targets are merged by platform, failed target is reported in errors"""
+    coverage = reporter.automation_state_fan_out(
+        [{"project": 1}, {"project": FAILING_PROJECT}, {"project": 2, "suite": 5, "filename_pattern": "suite"}],
+        max_workers=2,
+    )
+
+    assert [get_stats(results) if results else results for results in coverage["results"]] == [
+        {"UI": (2, 1, 1, 0), "API": (1, 0, 0, 1)},
+        None,
+        {"UI": (2, 1, 1, 0), "API": (1, 0, 0, 1)},
+    ]
+    assert get_stats(coverage["total"]) == {"UI": (4, 2, 2, 0), "API": (2, 0, 0, 2)}
+    assert list(coverage["errors"]) == [1]
+    assert isinstance(coverage["errors"][1], ValueError)
+    assert get_saved(reporter) == [
+        "current_automation_1_0_API",
+        "current_automation_1_0_UI",
+        "suite_API",
+        "suite_UI",
+    ]
+
+
+def test_automation_state_fan_out_no_targets(reporter):  # pylint: disable=redefined-outer-name
+    """Targets without project are not processed"""
+    with pytest.raises(ValueError):
+        reporter.automation_state_fan_out([])
+    with pytest.raises(ValueError):
+        reporter.automation_state_fan_out([{"project": 1}, {"suite": 5}])
+
+
+def test_automation_state_report(reporter, api):  # pylint: disable=redefined-outer-name
+    """Automation state of every platform is counted from one snapshot, history is saved per platform"""
+    assert get_stats(reporter.automation_state_report()) == {"UI": (2, 1, 1, 0), "API": (1, 0, 0, 1)}
+    assert get_saved(reporter) == ["current_automation_API", "current_automation_UI"]
+    assert get_stats(reporter.automation_state_report(priority=[1, 4], filename_pattern="all")) == {
+        "UI": (3, 2, 1, 0),
+        "API": (1, 0, 0, 1),
+    }
+    assert api.case_requests == [None]
+
+
+def test_case_by_type(reporter, api):  # pylint: disable=redefined-outer-name
+    """Cases are counted by platforms (top sections with their subsections)"""
+    results = reporter.test_case_by_type(type_platforms=TYPE_PLATFORMS)
+
+    assert [(item.get_name(), item.get_total()) for item in results] == [("UI", 3), ("API", 1)]
+    assert get_saved(reporter) == ["current_area_distribution_API", "current_area_distribution_UI"]
+    assert api.case_requests == [None]
+    with pytest.raises(ValueError):
+        reporter.test_case_by_type()
+
+
+def test_distribution_report(reporter):  # pylint: disable=redefined-outer-name
+    """Cases are distributed by combinations of platforms and fields, priority filter is applied"""
+    assert get_stats(reporter.distribution_report(fields=["priority_id"], automation=AUTOMATION)) == {
+        "4": (3, 1, 1, 1),
+        "1": (1, 1, 0, 0),
+    }
+    assert get_stats(
+        reporter.distribution_report(fields=["priority_id"], type_platforms=TYPE_PLATFORMS, automation=AUTOMATION)
+    ) == {"UI, 4": (2, 1, 1, 0), "UI, 1": (1, 1, 0, 0), "API, 4": (1, 0, 0, 1)}
+    assert get_stats(reporter.distribution_report(type_platforms=TYPE_PLATFORMS, priority=[1])) == {
+        "UI": (1, 0, 1, 0),
+        "API": (0, 0, 0, 0),
+    }
+    with pytest.raises(ValueError):
+        reporter.distribution_report()
+
+
+def test_case_by_priority(reporter, api):  # pylint: disable=redefined-outer-name
+    """Cases are counted per priority in order of priority level, priorities are requested once per server"""
+    assert [item["id"] for item in reporter.get_priorities()] == [1, 4]
+    assert reporter.test_case_by_priority() == [1, 3]
+    assert get_reporter(api).test_case_by_priority() == [1, 3]
+    assert api.priority_requests == 1
+
+    get_reporter(api, url="https://another.testrail.local").get_priorities()
+    assert api.priority_requests == 2
+
+
+def test_refresh_snapshot(reporter, api):  # pylint: disable=redefined-outer-name
+    """Changed cases are merged into snapshot, deleted cases are removed only by reconciliation of ids"""
+    reporter.automation_state_report()
+    now = int(time.time())
+    api.case_list[1].update(type_id=3, updated_on=now)  # UI case is automated
+    api.case_list.append({"id": 5, "section_id": 3, "priority_id": 4, "type_id": 3, "updated_on": now})
+    del api.case_list[0]  # automated UI case is deleted
+
+    reporter.refresh_snapshot()
+
+    # only cases changed since snapshot was crawled are requested
+    assert now - SNAPSHOT_TIME_SKEW - 60 < api.case_requests[1] <= now - SNAPSHOT_TIME_SKEW
+    assert get_stats(reporter.automation_state_report()) == {"UI": (2, 2, 0, 0), "API": (2, 1, 0, 1)}
+    reporter.refresh_snapshot(reconcile=True)
+    assert get_stats(reporter.automation_state_report()) == {"UI": (1, 1, 0, 0), "API": (2, 1, 0, 1)}
+    assert len(api.case_requests) == 4 and api.case_requests[3] is None
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Tests for live_reporter module, the LiveResultsReporter class"""
+
+import time
+from random import randint
+
+import pytest
+from faker import Faker
+
+from testrail_api_reporter.engines.live_reporter import (  # pylint: disable=import-error,no-name-in-module
+    LiveResultsReporter,
+)
+
+fake = Faker()
+
+
+class FakeResultsReporter:
+    """Replacement of TestRailResultsReporter, stores pushed results"""
+
+    def __init__(self, fail_pushes=0):
+        self.run_id = randint(1, 10000)
+        self.batches = []
+        self.pushes = []
+        self.finished = []
+        self.fail_pushes = fail_pushes
+
+    def start_run(self, title=None, environment=None):  # pylint: disable=unused-argument
+        """Returns run id"""
+        return self.run_id
+
+    def push_results(self, run_id, results, batch_id=None):
+        """Stores results or fails"""
+        self.pushes.append((batch_id, list(results)))
+        if self.fail_pushes:
+            self.fail_pushes -= 1
+            return False
+        self.batches.append(list(results))
+        return run_id
+
+    def finish_run(self, run_id, title=None):  # pylint: disable=unused-argument
+        """Stores closed run"""
+        self.finished.append(run_id)
+        return True
+
+
+def get_random_result() -> dict:
+    """
+    Returns random result record
+
+    :return: dict with result
+    """
+    return {"automation_id": fake.word(), "time": "0.1", "status": 1, "comment": ""}
+
+
+def test_live_reporter_no_reporter():
+    """Init LiveResultsReporter without reporter should raise ValueError"""
+    with pytest.raises(ValueError):
+        LiveResultsReporter(reporter=None)
+
+
+def test_live_reporter_flush_by_size():
+    """Results are flushed when batch size is reached"""
+    reporter = FakeResultsReporter()
+    live_reporter = LiveResultsReporter(reporter=reporter, flush_interval=60, batch_size=3)
+    live_reporter.start()
+
+    for _ in range(3):
+        live_reporter.add_result(get_random_result())
+    for _ in range(100):
+        if reporter.batches:
+            break
+        time.sleep(0.01)
+
+    assert len(reporter.batches) == 1
+    assert len(reporter.batches[0]) == 3
+    live_reporter.stop()
+
+
+def test_live_reporter_flush_by_time():
+    """Results are flushed by timer"""
+    reporter = FakeResultsReporter()
+    live_reporter = LiveResultsReporter(reporter=reporter, flush_interval=0.05, batch_size=100)
+    live_reporter.start()
+
+    live_reporter.add_result(get_random_result())
+    time.sleep(0.3)
+
+    assert len(reporter.batches) == 1
+    live_reporter.stop()
+
+
+def test_live_reporter_stop():
+    """Rest of results is flushed and run is closed on stop"""
+    reporter = FakeResultsReporter(fail_pushes=1)
+    live_reporter = LiveResultsReporter(reporter=reporter, flush_interval=60, batch_size=100)
+    assert live_reporter.start() == reporter.run_id
+    results = [get_random_result() for _ in range(5)]
+
+    for result in results:
+        live_reporter.add_result(result)
+    assert live_reporter.flush() is False
+
+    assert live_reporter.stop() is True
+    assert reporter.batches == [results]
+    assert reporter.finished == [reporter.run_id]
+
+
+def test_live_reporter_retries_failed_batch_unchanged():
+    """Failed batch is pushed again as is with the same batch id, new results are sent in next batch"""
+    reporter = FakeResultsReporter(fail_pushes=1)
+    live_reporter = LiveResultsReporter(reporter=reporter, flush_interval=60, batch_size=100)
+    live_reporter.start()
+    first = [get_random_result() for _ in range(3)]
+    second = [get_random_result() for _ in range(2)]
+
+    for result in first:
+        live_reporter.add_result(result)
+    assert live_reporter.flush() is False
+    for result in second:
+        live_reporter.add_result(result)
+
+    assert live_reporter.stop() is True
+    assert reporter.pushes == [(1, first), (1, first), (2, second)]
+    assert reporter.batches == [first, second]
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Tests for results_reporter module, the TestRailResultsReporter class"""
+
+import json
+from itertools import count
+from types import SimpleNamespace
+
+import pytest
+from faker import Faker
+from testrail_api import StatusCodeError
+
+from testrail_api_reporter.engines import results_reporter  # pylint: disable=import-error,no-name-in-module
+
+fake = Faker()
+
+
+def get_page(key, items):
+    """
+    Returns single-page TestRail response
+
+    :param key: key of items, i.e. 'cases'
+    :param items: list of items
+    :return: dict with response
+    """
+    return {"offset": 0, "limit": 250, "size": len(items), "_links": {"next": None}, key: items}
+
+
+class FakeTestRailAPI:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Replacement of TestRailAPI, keeps cases and added results in memory, fails requests on demand"""
+
+    def __init__(self):
+        self.ids = count(1000)
+        self.case_list = [{"id": next(self.ids), "custom_automation_id": f"test_{index}"} for index in range(10)]
+        self.uploaded = []
+        self.run_ids = []  # ids of added runs
+        self.failures = {}  # name of request -> list of errors, raised by next calls
+        self.projects = SimpleNamespace(get_project=self.__failing("get_project", lambda project_id: {}))
+        self.suites = SimpleNamespace(get_suite=lambda suite_id: {"id": suite_id})
+        self.sections = SimpleNamespace(
+            get_sections=lambda **kwargs: get_page("sections", [{"id": 1, "name": "pytest", "parent_id": None}]),
+            get_section=lambda section_id: {"id": section_id},
+        )
+        self.cases = SimpleNamespace(get_cases=lambda **kwargs: get_page("cases", self.case_list))
+        self.runs = SimpleNamespace(
+            add_run=self.__add_run,
+            update_run=lambda run_id, **kwargs: {"id": run_id},
+            get_run=lambda run_id: {"id": run_id},
+            close_run=lambda run_id: {"id": run_id},
+        )
+        self.results = SimpleNamespace(
+            add_results_for_cases=self.__failing(
+                "add_results_for_cases", lambda run_id, results: self.uploaded.extend(results)
+            )
+        )
+
+    def __add_run(self, case_ids=None, **kwargs):  # pylint: disable=unused-argument
+        """
+        Adds run, unknown cases are rejected
+
+        :param case_ids: list of case ids
+        :return: dict with run
+        """
+        if set(case_ids or []) - {case["id"] for case in self.case_list}:
+            raise StatusCodeError(400, "Bad Request", "", b"")
+        self.run_ids.append(next(self.ids))
+        return {"id": self.run_ids[-1]}
+
+    def __failing(self, name, func):
+        """
+        Wraps request, which raises errors from self.failures[name] first
+
+        :param name: name of request, string
+        :param func: function to call
+        :return: wrapped function
+        """
+
+        def wrapper(*args, **kwargs):
+            if self.failures.get(name):
+                raise self.failures[name].pop(0)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+
+@pytest.fixture
+def api(monkeypatch, reporter_caches):  # pylint: disable=unused-argument
+    """
+    Fixture to replace TestRail API of reporter with fake one
+
+    :return: FakeTestRailAPI object
+    :rtype: FakeTestRailAPI
+    """
+    fake_api = FakeTestRailAPI()
+    monkeypatch.setattr(results_reporter, "create_api", lambda *args, **kwargs: fake_api)
+    return fake_api
+
+
+def get_reporter(**kwargs):
+    """
+    Returns TestRailResultsReporter with fake TestRail API, see api fixture
+
+    :return: TestRailResultsReporter object
+    """
+    kwargs.setdefault("xml_report", None)
+    return results_reporter.TestRailResultsReporter(
+        url="https://testrail.local", email=fake.email(), password=fake.password(), project_id=1, **kwargs
+    )
+
+
+def get_results(number):
+    """
+    Returns results of existing test cases
+
+    :param number: number of results
+    :return: list of dicts with results
+    """
+    return [{"automation_id": f"test_{index}", "time": "1.0", "status": 1, "comment": ""} for index in range(number)]
+
+
+def test_push_results_skips_added_chunks_of_batch(api):  # pylint: disable=redefined-outer-name
+    """Failed batch is pushed again, only its chunks, which weren't added, are sent"""
+    reporter = get_reporter(chunk_size=2, max_workers=1)
+    api.failures["add_results_for_cases"] = [StatusCodeError(400, "Bad Request", "", b"")]
+    run_id = reporter.start_run(title=fake.word())
+    results = get_results(5)
+
+    # chunks are [0, 1], [2, 3], [4], the first one fails
+    assert reporter.push_results(run_id=run_id, results=results, batch_id=1) is False
+    assert len(api.uploaded) == 3
+    assert reporter.push_results(run_id=run_id, results=results, batch_id=1) == run_id
+    assert sorted(item["case_id"] for item in api.uploaded) == [case["id"] for case in api.case_list[:5]]
+
+
+def test_push_results_without_batch_id(api):  # pylint: disable=redefined-outer-name
+    """Without batch id whole batch is sent again"""
+    reporter = get_reporter(chunk_size=2, max_workers=1)
+    api.failures["add_results_for_cases"] = [StatusCodeError(400, "Bad Request", "", b"")]
+    run_id = reporter.start_run(title=fake.word())
+
+    assert reporter.push_results(run_id=run_id, results=get_results(3)) is False
+    assert reporter.push_results(run_id=run_id, results=get_results(3)) == run_id
+    assert len(api.uploaded) == 1 + 3
+
+
+def test_validation_is_repeated_after_failure(api):  # pylint: disable=redefined-outer-name
+    """Transient error during validation doesn't disable reporter, successful validation is reused"""
+    reporter = get_reporter()
+    api.failures["get_project"] = [StatusCodeError(400, "Bad Request", "", b"")]
+
+    assert reporter.start_run(title=fake.word()) is None
+    run_id = reporter.start_run(title=fake.word())
+    assert run_id
+    api.failures["get_project"] = [StatusCodeError(400, "Bad Request", "", b"")]
+    assert reporter.push_results(run_id=run_id, results=get_results(1)) == run_id
+
+
+@pytest.mark.parametrize("timestamp", ['timestamp="2022-09-01T20:25:51.123456"', ""])
+@pytest.mark.parametrize("restarted", [False, True])
+def test_send_results_resumes_upload(api, tmp_path, timestamp, restarted):  # pylint: disable=redefined-outer-name
+    """Retried upload with default title is resumed in the same test run, only missed chunks are sent"""
+    for case in api.case_list:
+        case["custom_automation_id"] = f"tests.{case['custom_automation_id']}"
+    xml_report = tmp_path / "junit-report.xml"
+    testcases = "".join(f'<testcase classname="tests" name="test_{index}" time="1.0"/>' for index in range(5))
+    xml_report.write_text(f"<testsuites><testsuite {timestamp}>{testcases}</testsuite></testsuites>", "utf-8")
+    checkpoint = tmp_path / "checkpoint.json"
+    settings = {"xml_report": str(xml_report), "upload_checkpoint": str(checkpoint), "chunk_size": 2, "max_workers": 1}
+    api.failures["add_results_for_cases"] = [StatusCodeError(400, "Bad Request", "", b"")]
+
+    reporter = get_reporter(**settings)
+    assert reporter.send_results() is False
+    # retry may be done by new process, i.e. restarted CI job
+    reporter = get_reporter(**settings) if restarted else reporter
+    assert reporter.send_results() == api.run_ids[0]
+    assert len(api.run_ids) == 1
+    assert sorted(item["case_id"] for item in api.uploaded) == [case["id"] for case in api.case_list[:5]]
+    assert json.loads(checkpoint.read_text("utf-8")) == {}
+
+
+def test_send_results_drops_case_cache_with_deleted_case(api, tmp_path):  # pylint: disable=redefined-outer-name
+    """Deleted case isn't returned by incremental refresh, so cache is refreshed fully after rejected run"""
+    for case in api.case_list:
+        case["custom_automation_id"] = f"tests.{case['custom_automation_id']}"
+    xml_report = tmp_path / "junit-report.xml"
+    xml_report.write_text('<testsuite><testcase classname="tests" name="test_0" time="1.0"/></testsuite>', "utf-8")
+    settings = {"xml_report": str(xml_report), "case_cache": str(tmp_path / "cache.db")}
+    assert get_reporter(**settings).send_results() == api.run_ids[0]
+    deleted_id = api.case_list[0]["id"]
+    # case is deleted and created again with the same automation_id
+    api.case_list[0] = {"id": next(api.ids), "custom_automation_id": "tests.test_0"}
+
+    assert get_reporter(**settings).send_results() == api.run_ids[1]
+    assert [item["case_id"] for item in api.uploaded] == [deleted_id, api.case_list[0]["id"]]
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Tests for pytest_plugin module"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from testrail_api_reporter.plugins.pytest_plugin import (  # pylint: disable=import-error,no-name-in-module
+    get_automation_id,
+    get_result,
+)
+
+
+@pytest.mark.parametrize(
+    "nodeid, automation_id",
+    [
+        ("tests/test_file.py::TestClass::test_name", "tests.test_file.TestClass.test_name"),
+        ("tests/test_file.py::test_name[a/b::c]", "tests.test_file.test_name[a/b::c]"),
+        ("test_file.py::test_name", "test_file.test_name"),
+    ],
+)
+def test_get_automation_id(nodeid, automation_id):
+    """Node id is converted to the same automation_id as junitxml report has"""
+    assert get_automation_id(nodeid) == automation_id
+
+
+@pytest.mark.parametrize(
+    "outcome, xfail, status",
+    [("passed", False, 1), ("failed", False, 5), ("skipped", False, 7), ("skipped", True, 5)],
+)
+def test_get_result_status(outcome, xfail, status):
+    """Outcome of test is converted to TestRail status"""
+    report = SimpleNamespace(
+        nodeid="tests/test_file.py::test_name",
+        duration=0.5,
+        passed=outcome == "passed",
+        failed=outcome == "failed",
+        skipped=outcome == "skipped",
+        longreprtext="assert False",
+    )
+    if xfail:
+        report.wasxfail = "reason"
+
+    result = get_result(report)
+
+    assert result["status"] == status
+    assert result["time"] == "0.500"
+    assert result["comment"] == ("assert False" if outcome == "failed" else "")
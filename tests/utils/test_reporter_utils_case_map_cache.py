@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Tests for the case_map_cache module, class 'CaseMapCache'"""
+
+from os import remove
+from random import randint
+
+import pytest
+from faker import Faker
+
+from testrail_api_reporter.utils.case_map_cache import CaseMapCache  # pylint: disable=import-error,no-name-in-module
+
+fake = Faker()
+
+
+@pytest.fixture
+def cache_file():
+    """
+    Fixture to return filename for cache database
+
+    :return: filename
+    :rtype: str (generator)
+    """
+    test_file = f"not_existing_{fake.file_name(extension='db')}"
+    yield test_file
+    try:
+        remove(test_file)
+    except FileNotFoundError:
+        pass
+
+
+def test_case_map_cache_empty(cache_file):  # pylint: disable=redefined-outer-name
+    """Nothing is cached for new project"""
+    cache = CaseMapCache(filename=cache_file)
+
+    assert cache.get_state(project_id=randint(1, 100)) is None
+    assert cache.get_cases(project_id=randint(1, 100)) == []
+
+
+def test_case_map_cache_full_update(cache_file):  # pylint: disable=redefined-outer-name
+    """Full update replaces cached cases"""
+    cache = CaseMapCache(filename=cache_file)
+    cache.update(project_id=1, suite_id=2, cases=[{"id": 1, "custom_automation_id": "a"}], timestamp=100, full=True)
+    cache.update(project_id=1, suite_id=2, cases=[{"id": 2, "custom_automation_id": "b"}], timestamp=200, full=True)
+
+    assert cache.get_cases(project_id=1, suite_id=2) == [{"id": 2, "custom_automation_id": "b"}]
+    assert cache.get_state(project_id=1, suite_id=2) == (200, 200)
+
+
+def test_case_map_cache_incremental_update(cache_file):  # pylint: disable=redefined-outer-name
+    """Incremental update merges changed cases and drops cases with cleared automation_id"""
+    cache = CaseMapCache(filename=cache_file)
+    cache.update(
+        project_id=1,
+        cases=[{"id": 1, "custom_automation_id": "a"}, {"id": 2, "custom_automation_id": "b"}],
+        timestamp=100,
+        full=True,
+    )
+    cache.update(
+        project_id=1,
+        cases=[{"id": 1, "custom_automation_id": None}, {"id": 3, "custom_automation_id": "b"}],
+        timestamp=200,
+    )
+
+    assert sorted(cache.get_cases(project_id=1), key=lambda case: case["id"]) == [
+        {"id": 2, "custom_automation_id": "b"},
+        {"id": 3, "custom_automation_id": "b"},
+    ]
+    assert cache.get_state(project_id=1) == (200, 100)
+
+
+def test_case_map_cache_clear(cache_file):  # pylint: disable=redefined-outer-name
+    """Cleared project/suite is refreshed from scratch, other suites are kept"""
+    cache = CaseMapCache(filename=cache_file)
+    for suite_id in (1, 2):
+        cache.update(
+            project_id=1, suite_id=suite_id, cases=[{"id": suite_id, "custom_automation_id": "a"}], timestamp=100
+        )
+
+    cache.clear(project_id=1, suite_id=1)
+
+    assert cache.get_state(project_id=1, suite_id=1) is None
+    assert cache.get_cases(project_id=1, suite_id=1) == []
+    assert cache.get_cases(project_id=1, suite_id=2) == [{"id": 2, "custom_automation_id": "a"}]
+
+
+def test_case_map_cache_no_filename():
+    """No filename is provided for cache"""
+    with pytest.raises(ValueError):
+        CaseMapCache(filename=None)
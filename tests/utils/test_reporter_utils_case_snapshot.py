@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Tests for the case_snapshot module"""
+
+import time
+from shutil import rmtree
+
+import pytest
+from faker import Faker
+
+from testrail_api_reporter.utils.case_snapshot import (  # pylint: disable=import-error,no-name-in-module
+    CaseSnapshotStore,
+    CaseTable,
+)
+
+fake = Faker()
+
+CASES = [
+    {"id": 1, "section_id": 10, "priority_id": 4, "custom_automation_type": 1, "custom_tags": ["ui"]},
+    {"id": 2, "section_id": 10, "priority_id": 3, "custom_automation_type": None, "custom_tags": []},
+    {"id": 3, "section_id": 11, "priority_id": 4, "custom_automation_type": 1, "custom_tags": ["ui"]},
+    {"id": 4, "section_id": 12, "priority_id": 1, "custom_automation_type": 2, "custom_tags": None},
+]
+FIELDS = ["section_id", "priority_id", "custom_automation_type", "custom_tags"]
+
+
+@pytest.fixture
+def snapshot_path():
+    """
+    Fixture to provide directory for snapshots
+
+    :return: path
+    :rtype: str (generator)
+    """
+    path = f"not_existing_{fake.word()}_snapshots"
+    yield path
+    rmtree(path, ignore_errors=True)
+
+
+def test_case_table_from_cases():
+    """Fields are integer-coded, masks and counts are calculated by values"""
+    table = CaseTable.from_cases(iter(CASES), fields=FIELDS)
+
+    assert len(table) == 4
+    assert table.get_ids().tolist() == [1, 2, 3, 4]
+    assert table.get_codes("priority_id").tolist() == [0, 1, 0, 2]
+    assert table.get_values("custom_tags") == [["ui"], [], None]
+    assert table.isin("section_id", [10, 12, 404]).tolist() == [True, True, False, True]
+    assert table.count("priority_id") == {4: 2, 3: 1, 1: 1}
+    assert table.count("custom_automation_type", mask=table.isin("priority_id", [4])) == {1: 2, None: 0, 2: 0}
+
+
+def test_case_table_count_list_values():
+    """Multi-select fields are counted by tuples of values"""
+    table = CaseTable.from_cases(CASES, fields=FIELDS)
+
+    assert table.count("custom_tags") == {("ui",): 2, (): 1, None: 1}
+    assert CaseTable.from_cases([{"id": 1, "custom_platforms": [1, 2]}], ["custom_platforms"]).count(
+        "custom_platforms"
+    ) == {(1, 2): 1}
+
+
+def test_case_table_empty():
+    """Empty table is built from no cases"""
+    table = CaseTable.from_cases([], fields=FIELDS)
+
+    assert len(table) == 0
+    assert table.count("priority_id") == {}
+    assert table.isin("priority_id", [4]).tolist() == []
+
+
+def test_case_table_crosstab():
+    """Cases are counted by all combinations of values of fields"""
+    table = CaseTable.from_cases(CASES, fields=FIELDS)
+
+    assert table.crosstab(["priority_id", "custom_automation_type"]) == {(4, 1): 2, (3, None): 1, (1, 2): 1}
+    assert table.crosstab(["custom_tags"], mask=table.isin("section_id", [10, 11])) == {(("ui",),): 2, ((),): 1}
+    assert table.crosstab([]) == {(): 4}
+    assert table.crosstab(["priority_id"], mask=table.isin("priority_id", [2])) == {}
+
+
+def test_case_table_update_and_retain():
+    """Changed cases are replaced, new are appended, deleted are removed"""
+    table = CaseTable.from_cases(CASES, fields=FIELDS, meta={"updated_on": int(time.time()) - 60})
+    delta = [
+        {"id": 2, "section_id": 13, "priority_id": 4, "custom_automation_type": 1, "custom_tags": []},
+        {"id": 5, "section_id": 10, "priority_id": 2, "custom_automation_type": 1, "custom_tags": []},
+        {"id": 5, "section_id": 10, "priority_id": 4, "custom_automation_type": 1, "custom_tags": []},
+    ]
+
+    assert table.update(delta) == 2
+    assert table.update([]) == 0
+    assert table.get_ids().tolist() == [1, 3, 4, 2, 5]
+    assert table.count("priority_id") == {4: 4, 3: 0, 1: 1, 2: 0}
+    assert table.isin("section_id", [13]).tolist() == [False, False, False, True, False]
+    assert table.retain([1, 2, 5]) == 2
+    assert table.get_ids().tolist() == [1, 2, 5]
+    assert table.count("custom_automation_type") == {1: 3, None: 0, 2: 0}
+    assert 60 <= table.get_age() < 120
+
+
+def test_case_snapshot_store(snapshot_path):  # pylint: disable=redefined-outer-name
+    """Snapshot is saved and loaded back until it's outdated or removed"""
+    store = CaseSnapshotStore(path=snapshot_path)
+    table = CaseTable.from_cases(CASES, fields=FIELDS, meta={"project_id": 1, "updated_on": int(time.time())})
+
+    assert store.load(project_id=1) is None
+    store.save(table, project_id=1)
+    loaded = store.load(project_id=1)
+    assert loaded.get_fields() == set(FIELDS)
+    assert loaded.get_ids().tolist() == [1, 2, 3, 4]
+    assert loaded.count("custom_automation_type") == table.count("custom_automation_type")
+    assert loaded.meta == table.meta
+    assert store.load(project_id=1, suite_id=2) is None
+
+    table.meta["updated_on"] = int(time.time()) - 7200
+    store.save(table, project_id=1)
+    assert store.load(project_id=1) is None
+    assert CaseSnapshotStore(path=snapshot_path, ttl=None).load(project_id=1) is not None
+
+    store.remove(project_id=1)
+    assert store.load(project_id=1) is None
+
+
+def test_case_snapshot_store_no_path():
+    """No path is provided for store"""
+    with pytest.raises(ValueError):
+        CaseSnapshotStore(path=None)
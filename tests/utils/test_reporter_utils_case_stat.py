@@ -107,3 +107,37 @@ def test_case_stat_not_applicable_not_a_number(case_stat):
     """Negative case for not applicable - incorrect type"""
     with pytest.raises(TypeError):
         case_stat.set_not_applicable("not a number")
+
+
+def test_case_stat_slots(case_stat):
+    """CaseStat has no per-instance dict"""
+    with pytest.raises(AttributeError):
+        case_stat.unknown = 1  # type: ignore
+
+
+def test_case_stat_add(case_stat):
+    """Numbers are incremented at once"""
+    case_stat.add(total=10, automated=5, not_automated=3, not_applicable=2).add(total=1, not_automated=1)
+
+    assert (case_stat.total, case_stat.automated, case_stat.not_automated, case_stat.not_applicable) == (11, 5, 4, 2)
+    with pytest.raises(ValueError):
+        case_stat.add(automated=-6)
+    assert case_stat.get_automated() == 5, "Numbers are changed after failed increment"
+
+
+def test_case_stat_merge():
+    """Statistics are merged associatively, name is taken from the left operand"""
+    first, second, third = CaseStat("first"), CaseStat("second"), CaseStat("third")
+    first.add(total=3, automated=1, not_automated=1, not_applicable=1)
+    second.add(total=2, automated=2)
+    third.add(total=1, not_automated=1)
+
+    left = (first + second) + third
+    right = first + (second + third)
+    assert left.get_name() == right.get_name() == "first"
+    assert (left.total, left.automated, left.not_automated, left.not_applicable) == (6, 3, 2, 1)
+    assert (right.total, right.automated, right.not_automated, right.not_applicable) == (6, 3, 2, 1)
+    assert first.get_total() == 3, "Operands are changed by addition"
+    assert sum([second, third], CaseStat("sum")).get_total() == 3
+    assert first.merge(second) is first
+    assert first.get_total() == 5
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 """Tests for the csv_parser module, 'load_history' function"""
 
-from datetime import datetime
+from datetime import date, datetime
 
+import numpy as np
 import pytest
 from faker import Faker
 
@@ -25,13 +26,23 @@ def test_load_history_data(csv_file, random_stat):
 
     data = parser.load_history_data()
 
-    assert data == [
-        [datetime(int(year), int(month), int(day_of_month))],
-        [str(total)],
-        [str(automated)],
-        [str(not_automated)],
-        [str(not_applicable)],
-    ]
+    assert data[0].dtype == np.dtype("datetime64[D]")
+    assert data[0].tolist() == [date(int(year), int(month), int(day_of_month))]
+    assert [column.tolist() for column in data[1:]] == [[total], [automated], [not_automated], [not_applicable]]
+    assert all(column.dtype == np.int64 for column in data[1:])
+
+
+def test_load_history_data_long_history(csv_file):
+    """Dates are converted in vectorized form for every row"""
+    parser = CSVParser(filename=csv_file)
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write("2020,02,28,1,1,0,0\n2020,02,29,2,1,1,0\n2020,03,01,3,1,1,1\n2021,12,31,4,2,2,0\n")
+
+    data = parser.load_history_data()
+
+    assert data[0].tolist() == [date(2020, 2, 28), date(2020, 2, 29), date(2020, 3, 1), date(2021, 12, 31)]
+    assert int(data[1].max()) == 4
+    assert (data[2] * 100 // data[1]).tolist() == [100, 50, 33, 50]
 
 
 def test_load_history_data_no_filename():
@@ -48,3 +59,16 @@ def test_load_history_data_file_not_found():
 
     with pytest.raises(ValueError):
         parser.load_history_data()
+
+
+@pytest.mark.parametrize("torn_row", ["2022,09,02,1", "2022,09,02,1,1,0,0,18:0", "2022,09,02,1,1,0,0,18:00:00"])
+def test_load_history_data_torn_last_row(csv_file, torn_row):
+    """Malformed rows and last row without newline, which may be partially written by parallel job, are skipped"""
+    parser = CSVParser(filename=csv_file)
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write(f"2022,09,01,1,1,0,0,09:00:00\n2022,09,01,x,1,0,0,12:00:00\n{torn_row}")
+
+    data = parser.load_history_data()
+
+    assert data[0].tolist() == [datetime(2022, 9, 1, 9)]
+    assert [column.tolist() for column in data[1:]] == [[1], [1], [0], [0]]
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 """Tests for the csv_parser module'"""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import numpy as np
 import pytest
 from faker import Faker
 
+from testrail_api_reporter.utils import csv_parser  # pylint: disable=import-error,no-name-in-module
 from testrail_api_reporter.utils.csv_parser import CSVParser  # pylint: disable=import-error,no-name-in-module
 
 fake = Faker()
@@ -58,3 +61,115 @@ def test_save_history_data_already_stored(csv_file, case_stat_random):
     with open(csv_file, "r", encoding="utf-8") as readable_file:
         data = readable_file.read()
         assert data.count("\n") == 1
+
+
+def test_save_history_data_appends_to_long_history(csv_file, case_stat_random):
+    """Only last row of long history is checked, new row is appended"""
+    parser = CSVParser(filename=csv_file)
+    history = "2020,01,01,1,1,0,0\n" * 10000
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write(history + "2020,01,02,1,1,0,0")
+
+    parser.save_history_data(report=case_stat_random)
+    parser.save_history_data(report=case_stat_random)
+
+    with open(csv_file, "r", encoding="utf-8") as readable_file:
+        data = readable_file.read()
+        assert data.startswith(history + "2020,01,02,1,1,0,0\n")
+        assert data.count("\n") == 10002
+        assert data.endswith(f"{case_stat_random.get_not_applicable()}\n")
+
+
+def test_save_history_data_after_torn_row(csv_file, case_stat_random):
+    """Partially written last row is skipped, new row is appended on the next line"""
+    parser = CSVParser(filename=csv_file)
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write("2020,01,01,1,1,0,0\r\n2022")
+
+    parser.save_history_data(report=case_stat_random)
+
+    assert parser.load_history_data()[1].tolist() == [1, case_stat_random.get_total()]
+
+
+def test_save_history_data_intraday(csv_file, case_stat_random):
+    """Intraday snapshots are saved with time of day, daily save is skipped after them"""
+    parser = CSVParser(filename=csv_file)
+
+    parser.save_history_data(report=case_stat_random, intraday=True)
+    parser.save_history_data(report=case_stat_random)
+
+    with open(csv_file, "r", encoding="utf-8") as readable_file:
+        rows = readable_file.read().splitlines()
+    assert len(rows) == 1
+    assert rows[0].startswith(datetime.today().strftime("%Y,%m,%d,"))
+    assert len(rows[0].split(",")) == 8
+    assert parser.load_history_data()[0].dtype == np.dtype("datetime64[s]")
+
+
+def test_save_history_data_intraday_midnight(csv_file, case_stat_random, monkeypatch):
+    """Intraday snapshot taken at midnight is saved with time of day"""
+
+    class Midnight(datetime):
+        """Replacement of datetime, it's always midnight"""
+
+        @classmethod
+        def today(cls):
+            return cls(2022, 9, 1)
+
+    monkeypatch.setattr(csv_parser, "datetime", Midnight)
+    parser = CSVParser(filename=csv_file)
+
+    parser.save_history_data(report=case_stat_random, intraday=True)
+
+    with open(csv_file, "r", encoding="utf-8") as readable_file:
+        assert readable_file.read().splitlines()[0].endswith(",00:00:00")
+    assert parser.load_history_data()[0].tolist() == [datetime(2022, 9, 1)]
+    assert parser.load_history_data()[0].dtype == np.dtype("datetime64[s]")
+
+
+def test_compact_history_data(csv_file):
+    """Old snapshots are rolled up to daily and weekly ones, recent snapshots are kept"""
+    parser = CSVParser(filename=csv_file)
+    history = (
+        "2021,01,04,1,1,0,0\n2021,01,06,2,1,1,0\n2021,01,11,3,1,1,1\n"
+        "2022,09,01,4,2,2,0,09:00:00\n2022,09,01,5,2,2,1,18:00:00\n"
+        "2022,09,09,6,3,3,0,00:00:00\n2022,09,09,7,3,3,1,18:00:00\n"
+    )
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write(history)
+
+    assert parser.compact_history_data(now=datetime(2022, 9, 10)) == 2
+    assert parser.compact_history_data(now=datetime(2022, 9, 10)) == 0
+
+    with open(csv_file, "r", encoding="utf-8") as readable_file:
+        assert readable_file.read().splitlines() == [
+            "2021,01,06,2,1,1,0",
+            "2021,01,11,3,1,1,1",
+            "2022,09,01,5,2,2,1,18:00:00",
+            "2022,09,09,6,3,3,0,00:00:00",
+            "2022,09,09,7,3,3,1,18:00:00",
+        ]
+
+
+def test_save_history_data_parallel(csv_file, case_stat_random):
+    """Parallel jobs store only one row per day, rows appended during compaction are not lost"""
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write("2020,01,01,1,1,0,0\n" * 1000)
+
+    def save(index):
+        parser = CSVParser(filename=csv_file)
+        if index % 4:
+            parser.save_history_data(report=case_stat_random, intraday=index % 2 == 0)
+        else:
+            parser.compact_history_data()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(save, range(32)))
+
+    with open(csv_file, "r", encoding="utf-8") as readable_file:
+        rows = readable_file.read().splitlines()
+    assert rows[0] == "2020,01,01,1,1,0,0"
+    today = datetime.today().strftime("%Y,%m,%d,")
+    assert all(row.startswith(today) for row in rows[1:])
+    assert 1 <= len(rows) - 1 <= 16
+    assert len(set(rows)) == len(rows)
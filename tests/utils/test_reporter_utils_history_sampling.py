@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Tests for the history_sampling module"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from testrail_api_reporter.utils.history_sampling import (  # pylint: disable=import-error,no-name-in-module
+    compact_history,
+    downsample_history,
+    rollup_history,
+)
+
+
+def get_history(points):
+    """
+    Returns daily history with spike of total every 50 days
+
+    :param points: number of days
+    :return: history in format of CSVParser.load_history_data()
+    """
+    totals = np.arange(points) + (np.arange(points) % 50 == 25) * 1000
+    return [np.datetime64("2020-01-01") + np.arange(points), totals, totals // 2, totals - totals // 2, totals * 0]
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_history(method):
+    """Number of points is reduced, first and last points and spikes are kept"""
+    history = get_history(3000)
+
+    sampled = downsample_history(history, max_points=200, method=method)
+
+    assert 100 < len(sampled[0]) <= 200
+    assert all(len(column) == len(sampled[0]) for column in sampled)
+    assert sampled[0][0] == history[0][0] and sampled[0][-1] == history[0][-1]
+    assert np.all(np.diff(sampled[0].astype(np.int64)) > 0)
+    spikes = history[0][np.arange(3000) % 50 == 25]
+    assert np.isin(spikes, sampled[0]).all()
+
+
+def test_downsample_history_short():
+    """Short history and history without target are returned as is"""
+    history = get_history(10)
+
+    assert downsample_history(history, max_points=10) is history
+    assert downsample_history(history) is history
+    with pytest.raises(ValueError):
+        downsample_history(history, max_points=5, method="average")
+    with pytest.raises(ValueError):
+        downsample_history(history, max_points=3)
+
+
+def test_rollup_history():
+    """Last snapshot of every period is kept at the first day of period"""
+    history = [
+        [datetime(2022, 8, 31), datetime(2022, 9, 1), datetime(2022, 9, 4), datetime(2022, 9, 5)],
+        [1, 2, 3, 4],
+        [1, 1, 2, 2],
+        [0, 1, 1, 2],
+        [0, 0, 0, 0],
+    ]
+
+    weekly = rollup_history(history, period="week")
+    assert weekly[0].tolist() == [date(2022, 8, 29), date(2022, 9, 5)]
+    assert [column.tolist() for column in weekly[1:]] == [[3, 4], [2, 2], [1, 2], [0, 0]]
+    monthly = rollup_history(history, period="month")
+    assert monthly[0].tolist() == [date(2022, 8, 1), date(2022, 9, 1)]
+    assert monthly[1].tolist() == [1, 4]
+    assert rollup_history(history) is history
+    with pytest.raises(ValueError):
+        rollup_history(history, period="year")
+
+
+def test_compact_history():
+    """Raw snapshots are kept for recent days, daily ones for last year, weekly ones for older history"""
+    timestamps = np.datetime64("2021-01-01T12:00:00") + np.arange(0, 700 * 24, 6) * np.timedelta64(1, "h")
+    history = [timestamps, *(np.arange(len(timestamps)) for _ in range(4))]
+    now = timestamps[-1].item()
+
+    compacted = compact_history(history, now=now)
+
+    dates = compacted[0].astype("datetime64[D]")
+    assert (compacted[0] > timestamps[-1] - np.timedelta64(7, "D")).sum() == 7 * 4
+    # days and weeks crossing retention boundaries may keep snapshots of both sides until next compaction
+    raw_start = (timestamps[-1] - np.timedelta64(7, "D")).astype("datetime64[D]")
+    daily_start = (timestamps[-1] - np.timedelta64(365, "D")).astype("datetime64[D]")
+    daily = (dates > daily_start) & (dates < raw_start)
+    assert len(np.unique(dates[daily])) == daily.sum() == 357
+    assert np.all(np.diff(dates[dates < daily_start - 7].astype(np.int64)) == 7)
+    assert compacted[1][-1] == history[1][-1]
+    assert [column.tolist() for column in compact_history(compacted, now=now)] == [
+        column.tolist() for column in compacted
+    ]
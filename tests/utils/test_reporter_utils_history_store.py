@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Tests for the history_store module"""
+
+from datetime import date, datetime
+from os import remove
+
+import pytest
+from faker import Faker
+
+from testrail_api_reporter.utils.case_stat import CaseStat  # pylint: disable=import-error,no-name-in-module
+from testrail_api_reporter.utils.history_store import (  # pylint: disable=import-error,no-name-in-module
+    CSVHistoryStore,
+    HistoryStore,
+    SQLiteHistoryStore,
+    get_series_name,
+)
+
+fake = Faker()
+
+
+@pytest.fixture
+def history_db():
+    """
+    Fixture to provide filename of history database
+
+    :return: filename
+    :rtype: str (generator)
+    """
+    filename = f"not_existing_{fake.file_name(extension='db')}"
+    yield filename
+    try:
+        remove(filename)
+    except FileNotFoundError:
+        pass
+
+
+def get_stat(total):
+    """
+    Returns CaseStat with given total
+
+    :param total: total number of cases
+    :return: CaseStat object
+    """
+    return CaseStat(fake.word()).add(total=total, automated=1, not_automated=total - 1)
+
+
+def test_get_series_name():
+    """Series is named like CSV file of history"""
+    assert get_series_name("current_automation", "Desktop Chrome") == "current_automation_Desktop_Chrome"
+
+
+def test_sqlite_history_store_range(history_db):  # pylint: disable=redefined-outer-name
+    """Reports are saved by series and date, window is selected by range query"""
+    store = SQLiteHistoryStore(filename=history_db)
+    for day in range(1, 6):
+        store.save_many({"series_a": get_stat(day), "series_b": get_stat(day * 10)}, timestamp=f"2022-09-0{day}")
+    store.save("series_a", get_stat(100), timestamp="2022-09-05")
+
+    history = store.load("series_a", start=datetime(2022, 9, 2), end="2022-09-05")
+    assert history[0].tolist() == [date(2022, 9, day) for day in range(2, 6)]
+    assert [column.tolist() for column in history[1:]] == [[2, 3, 4, 5], [1, 1, 1, 1], [1, 2, 3, 4], [0, 0, 0, 0]]
+    assert store.load("series_b")[1].tolist() == [10, 20, 30, 40, 50]
+    assert [column.tolist() for column in store.load("series_b", start="2023-01-01")] == [[], [], [], [], []]
+    with pytest.raises(ValueError):
+        store.load("not_existing_series")
+
+
+def test_sqlite_history_store_import_csv(history_db, csv_file):  # pylint: disable=redefined-outer-name
+    """History is imported from CSV files once"""
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write("2022,09,01,10,5,4,1\n2022,09,02,12,6,5,1\n")
+    store = SQLiteHistoryStore(filename=history_db)
+
+    assert store.import_csv([csv_file]) == 2
+    assert store.import_csv([csv_file]) == 0
+    history = store.load(csv_file[:-4])
+    assert history[0].tolist() == [date(2022, 9, 1), date(2022, 9, 2)]
+    assert [column.tolist() for column in history[1:]] == [[10, 12], [5, 6], [4, 5], [1, 1]]
+
+
+def test_csv_history_store(csv_file):
+    """History is stored in CSV file of series and filtered by window"""
+    store = CSVHistoryStore()
+    series = csv_file[:-4]
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        writable_file.write("2022,09,01,10,5,4,1\n2022,09,02,12,6,5,1\n")
+
+    store.save(series, get_stat(3))
+
+    assert store.load(series)[1].tolist() == [10, 12, 3]
+    history = store.load(series, start="2022-09-02", end="2022-09-30")
+    assert [column.tolist() for column in history] == [[date(2022, 9, 2)], [12], [6], [5], [1]]
+    assert [column.tolist() for column in store.load(series, end="2000-01-01")] == [[], [], [], [], []]
+    with pytest.raises(ValueError):
+        store.save(series, get_stat(4), timestamp="2022-09-03")
+
+
+def test_history_store_compact(history_db, csv_file):  # pylint: disable=redefined-outer-name
+    """History older than a year is kept weekly in both stores"""
+    store = SQLiteHistoryStore(filename=history_db)
+    with open(csv_file, "w", encoding="utf-8") as writable_file:
+        for day in range(1, 15):
+            writable_file.write(f"2021,06,{day:02},{day},1,{day - 1},0\n")
+    store.import_csv([csv_file])
+    series = csv_file[:-4]
+
+    assert store.compact(series, now=datetime(2022, 9, 1)) == 11
+    assert store.load(series)[0].tolist() == [date(2021, 6, 6), date(2021, 6, 13), date(2021, 6, 14)]
+    assert CSVHistoryStore().compact(series, now=datetime(2022, 9, 1)) == 11
+    assert CSVHistoryStore().load(series)[1].tolist() == [6, 13, 14]
+    assert store.compact("not_existing_series") == 0
+
+
+def test_sqlite_history_store_no_filename():
+    """No filename is provided for history store"""
+    with pytest.raises(ValueError):
+        SQLiteHistoryStore(filename=None)
+
+
+def test_history_store_is_abstract():
+    """Base class of history storages can't be used directly"""
+    with pytest.raises(TypeError):
+        HistoryStore()  # pylint: disable=abstract-class-instantiated
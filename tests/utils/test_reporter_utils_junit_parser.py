@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Tests for the junit_parser module"""
+
+from os import remove
+
+import pytest
+from faker import Faker
+
+from testrail_api_reporter.utils.junit_parser import (  # pylint: disable=import-error,no-name-in-module
+    JUnitParser,
+    get_report_files,
+    merge_results,
+    parse_reports,
+)
+
+fake = Faker()
+
+JUNIT_REPORT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="pytest" errors="0" failures="1" skipped="2" tests="4" time="1.0"
+             timestamp="2022-09-01T20:25:51.123456" hostname="localhost">
+    <testcase classname="tests.test_file.TestClass" name="test_passed" time="0.100">
+      <system-out>{output}</system-out>
+    </testcase>
+    <testcase classname="tests.test_file.TestClass" name="test_failed" time="0.200">
+      <failure message="assert False">traceback</failure>
+      <system-err>{output}</system-err>
+    </testcase>
+    <testcase classname="tests.test_file.TestClass" name="test_skipped" time="0.000">
+      <skipped type="pytest.skip" message="skipped">reason</skipped>
+    </testcase>
+    <testcase classname="tests.test_file.TestClass" name="test_xfail" time="0.000">
+      <skipped type="pytest.xfail" message="xfail">reason</skipped>
+    </testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+@pytest.fixture
+def junit_report():
+    """
+    Fixture to create JUnit report with big system-out bodies
+
+    :return: filename
+    :rtype: str (generator)
+    """
+    test_file = f"not_existing_{fake.file_name(extension='xml')}"
+    with open(test_file, "w", encoding="utf-8") as file:
+        file.write(JUNIT_REPORT.format(output="x" * 100000))
+    yield test_file
+    try:
+        remove(test_file)
+    except FileNotFoundError:
+        pass
+
+
+def test_junit_parser_results(junit_report):  # pylint: disable=redefined-outer-name
+    """Check records and statuses parsed from report"""
+    parser = JUnitParser(filename=junit_report, chunk_size=1024)
+
+    results = list(parser.iter_results())
+
+    assert [item["automation_id"] for item in results] == [
+        "tests.test_file.TestClass.test_passed",
+        "tests.test_file.TestClass.test_failed",
+        "tests.test_file.TestClass.test_skipped",
+        "tests.test_file.TestClass.test_xfail",
+    ]
+    assert [item["status"] for item in results] == [1, 5, 7, 5]
+    assert results[0]["time"] == "0.100"
+    assert results[1]["comment"] == "assert False : traceback"
+    assert parser.get_timestamp() == "2022-09-01T20:25:51"
+
+
+def test_junit_parser_skips_output(junit_report):  # pylint: disable=redefined-outer-name
+    """Bodies of system-out/system-err are not stored by default"""
+    results = list(JUnitParser(filename=junit_report).iter_results())
+
+    assert all("system_out" not in item and "system_err" not in item for item in results)
+
+
+def test_junit_parser_include_output(junit_report):  # pylint: disable=redefined-outer-name
+    """Bodies of system-out/system-err are stored on demand"""
+    results = list(JUnitParser(filename=junit_report, include_output=True).iter_results())
+
+    assert results[0]["system_out"] == "x" * 100000
+    assert results[1]["system_err"] == "x" * 100000
+
+
+def test_junit_parser_no_filename():
+    """No filename is provided for parser"""
+    with pytest.raises(ValueError):
+        list(JUnitParser().iter_results())
+
+
+def test_get_report_files(tmp_path):
+    """Reports are found by filename, glob pattern or list"""
+    reports = [str(tmp_path / f"report_{index}.xml") for index in range(2)]
+    for report in reports:
+        with open(report, "w", encoding="utf-8") as file:
+            file.write(JUNIT_REPORT.format(output=""))
+
+    assert get_report_files(reports[0]) == [reports[0]]
+    assert get_report_files(str(tmp_path / "*.xml")) == reports
+    assert get_report_files([reports[1], reports[1]]) == [reports[1], reports[1]]
+    assert get_report_files(None) == []
+
+
+def test_merge_results():
+    """Duplicated results are merged, the worst status wins"""
+    first = [{"automation_id": "a", "status": 1}, {"automation_id": "b", "status": 5}]
+    second = [
+        {"automation_id": "a", "status": 7},
+        {"automation_id": "b", "status": 1},
+        {"automation_id": "c", "status": 1},
+    ]
+
+    assert merge_results([first, second]) == [
+        {"automation_id": "a", "status": 7},
+        {"automation_id": "b", "status": 5},
+        {"automation_id": "c", "status": 1},
+    ]
+
+
+def test_parse_reports(junit_report):  # pylint: disable=redefined-outer-name
+    """Several reports are parsed in parallel and merged"""
+    results, timestamp = parse_reports([junit_report, junit_report], max_workers=2)
+
+    assert len(results) == 4
+    assert timestamp == "2022-09-01T20:25:51"
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Tests for the paginator module"""
+
+from random import randint
+
+import pytest
+from testrail_api import StatusCodeError
+
+from testrail_api_reporter.utils.paginator import (  # pylint: disable=import-error,no-name-in-module
+    get_all_pages,
+    iter_pages,
+)
+
+
+def fake_endpoint(items, limit=250):
+    """
+    Returns function which emulates paginated TestRail endpoint
+
+    :param items: list of all items
+    :param limit: page size
+    :return: function, accepts offset, returns response
+    """
+    requested = []
+
+    def fetch(offset):
+        requested.append(offset)
+        page = items[offset : offset + limit]
+        has_next = offset + limit < len(items)
+        return {
+            "offset": offset,
+            "limit": limit,
+            "size": len(page),
+            "_links": {"next": f"/api/v2/get_cases/1&limit={limit}&offset={offset + limit}" if has_next else None},
+            "cases": page,
+        }
+
+    fetch.requested = requested  # type: ignore
+    return fetch
+
+
+@pytest.mark.parametrize("total", [0, 1, 249, 250, 251, 1000, 1234])
+def test_get_all_pages_in_order(total):
+    """All items are collected in original order"""
+    items = list(range(total))
+
+    assert get_all_pages(fake_endpoint(items), key="cases", max_workers=randint(1, 8)) == items
+
+
+def test_iter_pages_stops_after_last_page():
+    """Pages after the last one are not yielded"""
+    fetch = fake_endpoint(list(range(1000)), limit=100)
+
+    pages = list(iter_pages(fetch, key="cases", max_workers=3))
+
+    assert len(pages) == 10
+    assert fetch.requested[0] == 0  # type: ignore
+    assert sorted(set(fetch.requested))[:10] == list(range(0, 1000, 100))  # type: ignore
+
+
+def test_get_all_pages_raises_on_error():
+    """Errors are raised"""
+
+    def broken_fetch(offset):
+        raise StatusCodeError(400, "Bad Request", "", str(offset).encode())
+
+    with pytest.raises(StatusCodeError):
+        get_all_pages(broken_fetch, key="cases")
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Tests for the request_scheduler module"""
+
+import time
+
+import pytest
+import requests
+from requests.exceptions import ReadTimeout
+
+from testrail_api_reporter.utils.request_scheduler import (  # pylint: disable=import-error,no-name-in-module
+    RequestScheduler,
+    ScheduledSession,
+)
+
+
+def make_response(status_code, headers=None):
+    """
+    Returns response object with given status
+
+    :param status_code: HTTP status code
+    :param headers: dict with headers, optional
+    :return: response object
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_scheduler_rate_limit():
+    """Requests above burst are spread according to rate"""
+    scheduler = RequestScheduler(rate=50, burst=1)
+
+    started = time.monotonic()
+    for _ in range(6):
+        scheduler.acquire()
+
+    assert time.monotonic() - started >= 0.09
+
+
+def test_scheduler_retry_after_delay():
+    """Retry-After header has priority over backoff"""
+    scheduler = RequestScheduler(backoff_base=100)
+
+    assert scheduler.get_delay(attempt=3, retry_after="2") == 2.0
+    assert scheduler.get_delay(attempt=3, retry_after="Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_scheduler_backoff_jitter():
+    """Backoff delay grows exponentially and is limited"""
+    scheduler = RequestScheduler(backoff_base=1, backoff_max=5)
+
+    assert all(0 <= scheduler.get_delay(attempt=1) <= 2 for _ in range(100))
+    assert all(0 <= scheduler.get_delay(attempt=10) <= 5 for _ in range(100))
+
+
+def test_scheduled_session_honors_retry_after(monkeypatch):
+    """Throttled request is repeated after delay from Retry-After header"""
+    responses = [make_response(200), make_response(429, {"Retry-After": "0.05"})]
+    monkeypatch.setattr(requests.Session, "request", lambda *args, **kwargs: responses.pop())
+    session = ScheduledSession(RequestScheduler(retries=2))
+
+    started = time.monotonic()
+    response = session.request("POST", "https://testrail.local/index.php?/api/v2/add_result/1")
+
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.05
+
+
+def test_scheduled_session_does_not_repeat_post_on_server_error(monkeypatch):
+    """Non-idempotent request isn't repeated when server may have processed it"""
+    responses = [make_response(200), make_response(504)]
+    monkeypatch.setattr(requests.Session, "request", lambda *args, **kwargs: responses.pop())
+    session = ScheduledSession(RequestScheduler(retries=2, backoff_base=0.001))
+
+    assert session.request("POST", "https://testrail.local/index.php?/api/v2/add_case/1").status_code == 504
+    assert session.request("GET", "https://testrail.local/index.php?/api/v2/get_case/1").status_code == 200
+
+
+def test_scheduled_session_does_not_repeat_post_on_timeout(monkeypatch):
+    """Timed out non-idempotent request may be processed by server, so only idempotent one is repeated"""
+    calls = []
+
+    def request(*args, **kwargs):  # pylint: disable=unused-argument
+        calls.append(args[1])
+        if len(calls) in (1, 2):
+            raise ReadTimeout()
+        return make_response(200)
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    session = ScheduledSession(RequestScheduler(retries=2, backoff_base=0.001))
+
+    with pytest.raises(ReadTimeout):
+        session.request("POST", "https://testrail.local/index.php?/api/v2/add_results_for_cases/1")
+    assert session.request("GET", "https://testrail.local/index.php?/api/v2/get_case/1").status_code == 200
+    assert calls == ["POST", "GET", "GET"]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Tests for the reporter_utils module, function 'run_concurrently'"""
+
+from random import randint
+
+from testrail_api_reporter.utils.reporter_utils import (  # pylint: disable=import-error,no-name-in-module
+    run_concurrently,
+)
+
+
+def test_run_concurrently_results():
+    """Results are collected per item"""
+    items = list(range(randint(1, 100)))
+
+    results, errors = run_concurrently(lambda item: item * 2, items, max_workers=randint(1, 8))
+
+    assert results == {item: item * 2 for item in items}
+    assert errors == {}
+
+
+def test_run_concurrently_errors():
+    """Errors are collected per item and don't abort other items"""
+
+    def func(item):
+        if item % 2:
+            raise ValueError(item)
+        return item
+
+    results, errors = run_concurrently(func, range(10))
+
+    assert results == {item: item for item in range(0, 10, 2)}
+    assert sorted(errors) == list(range(1, 10, 2))
+    assert all(isinstance(error, ValueError) for error in errors.values())
+
+
+def test_run_concurrently_empty():
+    """Nothing to do for empty list"""
+    assert run_concurrently(lambda item: item, []) == ({}, {})
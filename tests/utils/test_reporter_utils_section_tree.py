@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Tests for the section_tree module"""
+
+from concurrent.futures import ThreadPoolExecutor
+from random import shuffle
+
+from testrail_api_reporter.utils.section_tree import (  # pylint: disable=import-error,no-name-in-module
+    SectionTree,
+    drop_section_tree,
+    get_section_tree,
+)
+
+SECTIONS = [
+    {"id": 1, "parent_id": None, "name": "UI"},
+    {"id": 2, "parent_id": 1, "name": "Login"},
+    {"id": 3, "parent_id": 2, "name": "pytest"},
+    {"id": 4, "parent_id": 1, "name": "Profile"},
+    {"id": 5, "parent_id": None, "name": "API"},
+    {"id": 6, "parent_id": 5, "name": "pytest"},
+    {"id": 7, "parent_id": None, "name": "pytest"},
+]
+
+
+def test_section_tree_descendants():
+    """Descendants and depths don't depend on order of sections"""
+    sections = list(SECTIONS)
+    shuffle(sections)
+    tree = SectionTree(list(reversed(sections)))
+
+    assert tree.get_descendants(1) == {1, 2, 3, 4}
+    assert tree.get_descendants(2) == {2, 3}
+    assert tree.get_subtree([2, 5]) == {2, 3, 5, 6}
+    assert [tree.get_depth(section_id) for section_id in range(1, 8)] == [0, 1, 2, 1, 0, 1, 0]
+    assert sorted(tree.get_children(None)) == [1, 5, 7]
+    assert len(tree) == 7
+
+
+def test_section_tree_find_and_add():
+    """Section is found by name, top level is preferred, added sections are indexed"""
+    tree = SectionTree(SECTIONS)
+
+    assert tree.find("pytest") == 7
+    assert tree.find("not existing") is None
+    tree.add({"id": 8, "parent_id": 4, "name": "Avatar"})
+    assert tree.get_depth(8) == 2
+    assert tree.get_descendants(1) == {1, 2, 3, 4, 8}
+
+
+def test_get_section_tree_cached():
+    """Tree is built once per key until it's dropped"""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return SECTIONS
+
+    key = ("https://testrail.example.com", 1, None)
+    first = get_section_tree(key, fetch)
+    assert get_section_tree(key, fetch) is first
+    drop_section_tree(key)
+    assert get_section_tree(key, fetch) is not first
+    assert len(calls) == 2
+    drop_section_tree(key)
+
+
+def test_section_tree_concurrent_add():
+    """Sections are added while other threads read subtrees"""
+    tree = SectionTree(SECTIONS)
+
+    def add_or_read(index):
+        if index % 2:
+            tree.add({"id": 100 + index, "parent_id": 1 + index % 7, "name": f"section {index}"})
+        return len(tree.get_subtree([1, 5, 7]))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        sizes = list(executor.map(add_or_read, range(2000)))
+
+    assert min(sizes) >= 6
+    assert len(tree) == 7 + 1000
+    assert tree.get_subtree([1, 5, 7]) == set(range(1, 8)) | {100 + index for index in range(1, 2000, 2)}
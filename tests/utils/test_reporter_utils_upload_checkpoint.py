@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Tests for the upload_checkpoint module, class 'UploadCheckpoint'"""
+
+from os import remove
+from random import randint
+
+import pytest
+from faker import Faker
+
+from testrail_api_reporter.utils.upload_checkpoint import (  # pylint: disable=import-error,no-name-in-module
+    UploadCheckpoint,
+)
+
+fake = Faker()
+
+
+@pytest.fixture
+def checkpoint_file():
+    """
+    Fixture to return filename for checkpoint
+
+    :return: filename
+    :rtype: str (generator)
+    """
+    test_file = f"not_existing_{fake.file_name(extension='json')}"
+    yield test_file
+    try:
+        remove(test_file)
+    except FileNotFoundError:
+        pass
+
+
+def test_upload_checkpoint_resume(checkpoint_file):  # pylint: disable=redefined-outer-name
+    """Uploaded chunks are restored by new checkpoint object"""
+    title = fake.sentence()
+    run_id = randint(1, 10000)
+    chunk = [{"case_id": randint(1, 10000), "status_id": 1}]
+    key = UploadCheckpoint.get_chunk_key(chunk)
+    checkpoint = UploadCheckpoint(filename=checkpoint_file)
+    checkpoint.start(title=title, run_id=run_id)
+    checkpoint.mark_done(title=title, chunk_key=key)
+
+    restored = UploadCheckpoint(filename=checkpoint_file)
+
+    assert restored.get_run_id(title=title) == run_id
+    assert restored.is_done(title=title, chunk_key=key) is True
+    assert restored.is_done(title=title, chunk_key=UploadCheckpoint.get_chunk_key([])) is False
+
+
+def test_upload_checkpoint_new_run(checkpoint_file):  # pylint: disable=redefined-outer-name
+    """Uploaded chunks are reset when upload is started for another run"""
+    title = fake.sentence()
+    key = UploadCheckpoint.get_chunk_key([])
+    checkpoint = UploadCheckpoint(filename=checkpoint_file)
+    checkpoint.start(title=title, run_id=1)
+    checkpoint.mark_done(title=title, chunk_key=key)
+
+    checkpoint.start(title=title, run_id=2)
+
+    assert checkpoint.is_done(title=title, chunk_key=key) is False
+
+
+def test_upload_checkpoint_finish(checkpoint_file):  # pylint: disable=redefined-outer-name
+    """Completed upload is removed from checkpoint"""
+    title = fake.sentence()
+    checkpoint = UploadCheckpoint(filename=checkpoint_file)
+    checkpoint.start(title=title, run_id=randint(1, 10000))
+
+    checkpoint.finish(title=title)
+
+    assert UploadCheckpoint(filename=checkpoint_file).get_run_id(title=title) is None
+
+
+def test_upload_checkpoint_no_filename():
+    """No filename is provided for checkpoint"""
+    with pytest.raises(ValueError):
+        UploadCheckpoint(filename=None)